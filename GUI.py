@@ -11,9 +11,7 @@ if len(sys.argv) > 1 and sys.argv[1] == "--run-module":
 
 # Force PyInstaller to bundle auxiliary modules
 if getattr(sys, 'frozen', False):
-    import magnifier.upper_window_magnifier
-    import magnifier.full_window_magnifier
-    import magnifier.hover_magnifier
+    import magnifier.magnifier_engine
     import reader.select_reader
     import reader.hover_reader
     import reader.full_reader
@@ -211,9 +209,9 @@ class AccessibilityApp(QWidget):
         full_btn = self.zoom_options.itemAt(1).widget()
         hover_btn = self.zoom_options.itemAt(2).widget()
 
-        upper_btn.clicked.connect(lambda: self.launch_magnifier("magnifier/upper_window_magnifier.py"))
-        full_btn.clicked.connect(lambda: self.launch_magnifier("magnifier/full_window_magnifier.py"))
-        hover_btn.clicked.connect(lambda: self.launch_magnifier("magnifier/hover_magnifier.py"))
+        upper_btn.clicked.connect(lambda: self.launch_magnifier("docked"))
+        full_btn.clicked.connect(lambda: self.launch_magnifier("fullscreen"))
+        hover_btn.clicked.connect(lambda: self.launch_magnifier("hover"))
 
     def restoreZoomButton(self):
         if self.magnifier_process and self.magnifier_process.poll() is None:
@@ -240,23 +238,17 @@ class AccessibilityApp(QWidget):
         for i in range(self.zoom_options.count()):
             self.zoom_options.itemAt(i).widget().setVisible(False)
 
-    def launch_magnifier(self, script_path):
+    def launch_magnifier(self, mode):
+        # One magnifier process serves every mode: a running one just switches
+        # (milliseconds) instead of being restarted (seconds of re-imports)
         if self.magnifier_process and self.magnifier_process.poll() is None:
-            try:
-                if self.magnifier_process.stdin:
-                    self.magnifier_process.stdin.write("exit\n")
-                    self.magnifier_process.stdin.flush()
-                self.magnifier_process.wait(timeout=1)
-            except subprocess.TimeoutExpired:
-                self.magnifier_process.terminate()
-            except Exception:
-                pass
+            self.send_zoom_command(f"mode {mode}")
+            return
 
         if getattr(sys, 'frozen', False):
-            module_name = script_path.replace('/', '.').replace('\\', '.').replace('.py', '')
-            cmd = [sys.executable, "--run-module", module_name]
+            cmd = [sys.executable, "--run-module", "magnifier.magnifier_engine", "--mode", mode]
         else:
-            cmd = [sys.executable, script_path]
+            cmd = [sys.executable, "magnifier/magnifier_engine.py", "--mode", mode]
 
         self.magnifier_process = subprocess.Popen(
             cmd,
@@ -448,20 +440,20 @@ class AccessibilityApp(QWidget):
     def apply_startup_settings(self):
         mag = self.settings_manager.get("startup_magnifier")
         if mag == "Hover":
-            self.launch_magnifier("magnifier/hover_magnifier.py")
+            self.launch_magnifier("hover")
         elif mag == "Fullscreen":
-            self.launch_magnifier("magnifier/full_window_magnifier.py")
+            self.launch_magnifier("fullscreen")
         elif mag == "Window":
-            self.launch_magnifier("magnifier/upper_window_magnifier.py")
+            self.launch_magnifier("docked")
 
     def start_default_magnifier(self):
         mag = self.settings_manager.get("startup_magnifier")
         if mag == "Window":
-            self.launch_magnifier("magnifier/upper_window_magnifier.py")
+            self.launch_magnifier("docked")
         elif mag == "Hover":
-            self.launch_magnifier("magnifier/hover_magnifier.py")
+            self.launch_magnifier("hover")
         else:
-            self.launch_magnifier("magnifier/full_window_magnifier.py")
+            self.launch_magnifier("fullscreen")
 
     def stop_all(self):
         if self.magnifier_process and self.magnifier_process.poll() is None:
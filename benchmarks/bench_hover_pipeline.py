@@ -0,0 +1,88 @@
+"""
+Compares the original hover-lens frame path against FramePipeline.
+
+Runs headless (QT_QPA_PLATFORM=offscreen is set automatically) on synthetic
+BGRA captures and reports mean frame time and peak transient memory per frame.
+
+    python benchmarks/bench_hover_pipeline.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import cv2
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QImage, QPixmap
+
+from magnifier.frame_pipeline import FramePipeline
+
+TARGET = (300, 200)
+ZOOMS = (2.0, 4.0, 8.0)
+FRAMES = 300
+
+
+def legacy_frame(raw, width, height, target, invert):
+    """The pre-FramePipeline hover path, kept verbatim for comparison."""
+    target_w, target_h = target
+    frame = np.array(np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4))
+    frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+    if invert:
+        frame = cv2.bitwise_not(frame)
+    magnified = cv2.resize(frame, (target_w, target_h), interpolation=cv2.INTER_LINEAR)
+    cv2.rectangle(magnified, (0, 0), (target_w - 1, target_h - 1), (0, 255, 0), 2)
+    magnified = cv2.cvtColor(magnified, cv2.COLOR_BGR2RGB)
+    h, w, _ = magnified.shape
+    return QPixmap.fromImage(QImage(magnified.data, w, h, 3 * w, QImage.Format_RGB888))
+
+
+def pipeline_frame(pipeline, raw, width, height, target, invert):
+    return QPixmap.fromImage(pipeline.process(raw, width, height, target, invert))
+
+
+def measure(render, captures):
+    # Warm up so persistent buffers exist before measuring
+    for raw in captures[:5]:
+        render(raw)
+
+    start = time.perf_counter()
+    for raw in captures:
+        render(raw)
+    frame_ms = (time.perf_counter() - start) * 1000 / len(captures)
+
+    peaks = []
+    tracemalloc.start()
+    for raw in captures[:50]:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        render(raw)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return frame_ms, sum(peaks) / len(peaks)
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    rng = np.random.default_rng(0)
+    pipeline = FramePipeline()
+
+    print(f"{'zoom':>5} {'invert':>7} | {'legacy ms':>9} {'legacy KiB':>10} | {'pipeline ms':>11} {'pipeline KiB':>12}")
+    for zoom in ZOOMS:
+        width, height = int(TARGET[0] / zoom), int(TARGET[1] / zoom)
+        for invert in (False, True):
+            # Fresh bytearrays mimic mss handing back a new ScreenShot.raw each grab
+            captures = [bytearray(rng.integers(0, 256, width * height * 4, dtype=np.uint8).tobytes())
+                        for _ in range(FRAMES)]
+            legacy = measure(lambda raw: legacy_frame(raw, width, height, TARGET, invert), captures)
+            fast = measure(lambda raw: pipeline_frame(pipeline, raw, width, height, TARGET, invert), captures)
+            print(f"{zoom:>5} {str(invert):>7} | {legacy[0]:>9.3f} {legacy[1] / 1024:>10.1f} | "
+                  f"{fast[0]:>11.3f} {fast[1] / 1024:>12.1f}")
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""
+Headless magnifier benchmark suite.
+
+Drives the hover, docked and full-window frame pipelines against a
+synthetic desktop (capture.synthetic) and synthetic cursor paths,
+with Qt on the offscreen platform, so it runs on a Linux box without a
+display. For every scenario it reports frames/sec, per-stage latency
+percentiles and transient memory per frame, and saves everything to a
+JSON baseline that later runs can be compared against. The capture-based
+modes are run once per quality tier (SettingsManager.QUALITY_TIERS) so
+the cost of each interpolation mode is published alongside; the "text"
+tier also reports its sharpen stage and how many frames fell back to
+plain linear scaling under the sharpening budget. Both presentation paths
+are run as well: "resize" (cv2 scales, the full-size frame becomes a
+pixmap) and "painter" (only the filtered capture is wrapped and QPainter
+scales it while painting, for the tiers Qt can draw). In both, the present
+stage includes painting the view into a window-sized surface. The
+lens_moves mode presents hover-lens frames only and counts how many window
+moves per second (at 60 fps) survive move coalescing on each cursor path.
+
+    python benchmarks/run_benchmarks.py                       # run + save baseline
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json --save new.json
+    python benchmarks/run_benchmarks.py --modes hover --frames 100
+    python benchmarks/run_benchmarks.py --modes docked --qualities fast sharp
+    python benchmarks/run_benchmarks.py --modes hover --presents painter
+    python benchmarks/run_benchmarks.py --modes lens_moves
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import cv2
+import numpy as np
+from PyQt5.QtWidgets import QApplication, QLabel
+from PyQt5.QtGui import QPixmap, QImage
+
+from settings.settings import SettingsManager
+from capture.synthetic import SyntheticCapture, cursor_path
+from magnifier.frame_pipeline import FramePipeline
+from magnifier.change_detector import TileChangeDetector
+from magnifier.crop_panner import CropPanner
+from magnifier.frame_stats import FrameStats
+from magnifier.viewport import centered_region
+from magnifier.magnification import FakeMagnification, FullscreenView
+from magnifier.window_mover import WindowMover
+from magnifier.painter_view import PainterFrameView
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+FRAME_BUDGET = 1 / 60
+
+SCENARIOS = {
+    "hover": {"zooms": (2.0, 4.0, 8.0), "outputs": ((300, 200), (450, 300)), "paths": ("reading", "still"),
+              "qualities": tuple(SettingsManager.QUALITY_TIERS), "presents": SettingsManager.PRESENT_PATHS},
+    "docked": {"zooms": (2.0, 4.0, 8.0), "outputs": ((960, 540), (1920, 1080)), "paths": ("reading", "still"),
+               "qualities": tuple(SettingsManager.QUALITY_TIERS), "presents": SettingsManager.PRESENT_PATHS},
+    # The OS does the scaling in full-window mode, so there is no quality tier to pick
+    "fullscreen": {"zooms": (1.5, 2.0, 4.0), "outputs": ((1920, 1080),), "paths": ("reading", "jumps"),
+                   "qualities": ("balanced",)},
+    "lens_moves": {"zooms": (2.0,), "outputs": ((300, 200),), "paths": ("reading", "tremor", "still", "jumps"),
+                   "qualities": ("balanced",)},
+}
+
+
+class CaptureScenario:
+    """One frame of the hover/docked magnifier: viewport, capture, detect, process, present."""
+
+    def __init__(self, mode, output, zoom, quality, present="resize"):
+        self.target = output
+        self.capture = SyntheticCapture()
+        self.stats = FrameStats(window=100000)
+        self.pipeline = FramePipeline(border_thickness=2 if mode == "hover" else 0, stats=self.stats,
+                                      interpolation=SettingsManager.QUALITY_TIERS[quality])
+        self.detector = TileChangeDetector()
+        # The hover lens pans inside an oversized capture, like ScreenMagnifier does by default
+        self.panner = CropPanner() if mode == "hover" else None
+        self.frames = 0
+        self.grabs = 0
+        self.pixels = 0
+        self.present = present
+        self.view = PainterFrameView() if present == "painter" else QLabel()
+        self.view.resize(*output)
+        # Stands in for the window's backing store the view paints into
+        self.surface = QImage(*output, QImage.Format_RGB32)
+        self.capture_size = (int(output[0] / zoom), int(output[1] / zoom))
+        self.bounds = (0, 0, self.capture.width, self.capture.height)
+
+    def frame(self, mx, my):
+        frame_start = time.perf_counter()
+        region = centered_region(mx, my, *self.capture_size, self.bounds)
+        self.stats.record("cursor", frame_start)
+
+        self.frames += 1
+        started = time.perf_counter()
+        if self.panner is not None:
+            # Simulated 60 fps clock: the benchmark runs faster than real time, and the
+            # panner's periodic staleness checks must show up in the grab counts
+            frame = self.panner.frame_for(self.capture, region, self.bounds, now=self.frames * FRAME_BUDGET)
+        else:
+            shot = self.capture.grab(region)
+            self.grabs += 1
+            self.pixels += region["width"] * region["height"]
+            frame = self.pipeline.wrap(shot.raw, shot.width, shot.height)
+        self.stats.record("capture", started)
+
+        started = time.perf_counter()
+        dirty = self.detector.compare(frame, (region["left"], region["top"], region["width"], region["height"]))
+        self.stats.record("detect", started)
+
+        if dirty is not None:
+            smooth = None
+            if self.present == "painter":
+                smooth = self.pipeline.painter_scaling((frame.shape[1], frame.shape[0]), self.target)
+            if smooth is None:
+                output = self.pipeline.render_region(frame, self.target, dirty)
+                started = time.perf_counter()
+                self.view.setPixmap(QPixmap.fromImage(self.pipeline.to_qimage(output)))
+            else:
+                output = self.pipeline.render_source(frame)
+                started = time.perf_counter()
+                self.view.set_frame(output, smooth)
+            self.view.render(self.surface)
+            self.stats.record("present", started)
+
+        self.stats.frame_done(frame_start, FRAME_BUDGET)
+
+    def extra(self):
+        grabs = self.panner.grabs if self.panner is not None else self.grabs
+        pixels = self.panner.pixels if self.panner is not None else self.pixels
+        extra = {
+            "change_detection": self.detector.stats(),
+            "grabs_per_frame": round(grabs / self.frames, 4) if self.frames else 0.0,
+            "grab_pixels_per_frame": round(pixels / self.frames, 1) if self.frames else 0.0
+        }
+        if self.panner is not None:
+            extra["crop_panning"] = self.panner.stats()
+        if self.pipeline.interpolation == "sharp_text":
+            extra["sharp_text"] = self.pipeline.sharpener.stats()
+        return extra
+
+
+class FullscreenScenario:
+    """One cursor event of the full-window magnifier against the fake OS backend."""
+
+    def __init__(self, mode, output, zoom, quality, present="resize"):
+        self.backend = FakeMagnification(*output, notify=False)
+        self.view = FullscreenView(self.backend)
+        self.scale = zoom
+        self.stats = FrameStats(window=100000)
+
+    def frame(self, mx, my):
+        frame_start = time.perf_counter()
+        self.stats.record("cursor", frame_start)
+
+        started = time.perf_counter()
+        self.view.update(self.scale, mx, my)
+        self.stats.record("present", started)
+        self.stats.frame_done(frame_start, FRAME_BUDGET)
+
+    def extra(self):
+        return {"transform_calls": len(self.backend.transforms()), **self.view.stats()}
+
+
+class LensMoveScenario:
+    """Presenting one hover-lens frame: coalesced window move plus the pixmap update."""
+
+    def __init__(self, mode, output, zoom, quality, present="resize"):
+        self.mover = WindowMover(SettingsManager.DEFAULTS["hover_move_threshold"])
+        self.window = QLabel()
+        self.window.resize(*output)
+        self.window.show()
+        self.pixmap = QPixmap(*output)
+        self.stats = FrameStats(window=100000)
+        self.frames = 0
+
+    def frame(self, mx, my):
+        frame_start = time.perf_counter()
+        self.frames += 1
+        width, height = self.pixmap.width(), self.pixmap.height()
+        position = self.mover.update(mx - width // 2, my - height // 2)
+        self.stats.record("cursor", frame_start)
+
+        started = time.perf_counter()
+        if position is not None:
+            self.window.move(*position)
+        self.window.setPixmap(self.pixmap)
+        self.stats.record("present", started)
+        self.stats.frame_done(frame_start, FRAME_BUDGET)
+
+    def extra(self):
+        return {
+            **self.mover.stats(),
+            # The uncoalesced lens moved on every frame, i.e. 60 moves/s
+            "moves_per_sec": round(self.mover.moves / self.frames / FRAME_BUDGET, 1) if self.frames else 0.0
+        }
+
+
+SCENARIO_TYPES = {"fullscreen": FullscreenScenario, "lens_moves": LensMoveScenario}
+
+
+def run_scenario(mode, output, zoom, path, frames, quality="balanced", present="resize"):
+    scenario_cls = SCENARIO_TYPES.get(mode, CaptureScenario)
+    positions = list(cursor_path(path, frames, 1920, 1080))
+
+    # Warm-up run so persistent buffers and caches exist before measuring
+    warm = scenario_cls(mode, output, zoom, quality, present)
+    for mx, my in positions[:10]:
+        warm.frame(mx, my)
+
+    scenario = scenario_cls(mode, output, zoom, quality, present)
+    start = time.perf_counter()
+    for mx, my in positions:
+        scenario.frame(mx, my)
+    elapsed = time.perf_counter() - start
+
+    # Transient memory per frame, measured separately so tracing doesn't skew timings
+    peaks = []
+    tracemalloc.start()
+    for mx, my in positions[:30]:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        warm.frame(mx, my)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+
+    snapshot = scenario.stats.snapshot()
+    return {
+        "mode": mode,
+        "output": list(output),
+        "zoom": zoom,
+        "path": path,
+        "quality": quality,
+        "present": present,
+        "frames": frames,
+        "fps": round(frames / elapsed, 1),
+        "frame_ms": snapshot["frame_ms"],
+        "stages_ms": snapshot["stages_ms"],
+        "late": snapshot["late"],
+        "alloc_kib_per_frame": round(sum(peaks) / len(peaks) / 1024, 2),
+        **scenario.extra()
+    }
+
+
+def scenario_key(result):
+    return (result["mode"], tuple(result["output"]), result["zoom"], result["path"],
+            result.get("quality", "balanced"), result.get("present", "resize"))
+
+
+def print_results(results, baseline=None):
+    previous = {scenario_key(r): r for r in (baseline or {}).get("results", [])}
+    print(f"{'mode':<10} {'output':>9} {'zoom':>5} {'path':<8} {'quality':<8} {'present':<7} {'fps':>9} {'p50 ms':>7} {'p99 ms':>7} {'KiB/f':>7} {'grab/f':>6} {'mv/s':>5}"
+          + ("  vs baseline" if baseline else ""))
+    for r in results:
+        line = (f"{r['mode']:<10} {'x'.join(map(str, r['output'])):>9} {r['zoom']:>5} {r['path']:<8} {r.get('quality', 'balanced'):<8} "
+                f"{r.get('present', 'resize'):<7} "
+                f"{r['fps']:>9.1f} {r['frame_ms']['p50']:>7.3f} {r['frame_ms']['p99']:>7.3f} "
+                f"{r['alloc_kib_per_frame']:>7.1f} {r.get('grabs_per_frame', 0):>6.2f} {r.get('moves_per_sec', 0):>5.1f}")
+        old = previous.get(scenario_key(r))
+        if old:
+            line += f"  {(r['fps'] / old['fps'] - 1) * 100:+.1f}% fps"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless magnifier benchmarks")
+    parser.add_argument("--frames", type=int, default=300, help="frames per scenario")
+    parser.add_argument("--modes", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--qualities", nargs="+", choices=list(SettingsManager.QUALITY_TIERS),
+                        help="quality tiers to run (default: every tier the mode supports)")
+    parser.add_argument("--presents", nargs="+", choices=list(SettingsManager.PRESENT_PATHS),
+                        help="presentation paths to run (default: every path the mode supports)")
+    parser.add_argument("--save", default=DEFAULT_BASELINE, help="where to write the JSON results")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    results = []
+    for mode in args.modes:
+        config = SCENARIOS[mode]
+        for output in config["outputs"]:
+            for zoom in config["zooms"]:
+                for path in config["paths"]:
+                    for quality in config["qualities"]:
+                        if args.qualities and quality not in args.qualities and len(config["qualities"]) > 1:
+                            continue
+                        presents = config.get("presents", ("resize",))
+                        for present in presents:
+                            if args.presents and present not in args.presents and len(presents) > 1:
+                                continue
+                            # Tiers Qt can't draw fall back to the resize path; don't run them twice
+                            if present == "painter" and SettingsManager.QUALITY_TIERS[quality] not in ("nearest", "linear"):
+                                continue
+                            results.append(run_scenario(mode, output, zoom, path, args.frames, quality, present))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "opencv": cv2.__version__,
+            "qt_platform": app.platformName(),
+            "frames": args.frames
+        },
+        "results": results
+    }
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"Saved {len(results)} results to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
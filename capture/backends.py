@@ -0,0 +1,409 @@
+# capture/backends.py
+
+import ctypes
+import ctypes.util
+import os
+import sys
+import time
+import numpy as np
+
+
+class CaptureUnavailable(RuntimeError):
+    """Raised when a capture backend can't run on this machine."""
+
+
+# -------------------------
+# CAPTURED FRAME
+# -------------------------
+class CapturedFrame:
+    """
+    A grabbed screen region: raw BGRA bytes plus where it came from.
+
+    Has the same raw/left/top/width/height shape as mss.ScreenShot, so code
+    written against mss keeps working. `raw` is writable and may be reused
+    by the backend on the next grab.
+    """
+
+    __slots__ = ("raw", "left", "top", "width", "height")
+
+    def __init__(self, raw, left, top, width, height):
+        self.raw = raw
+        self.left, self.top = left, top
+        self.width, self.height = width, height
+
+    @property
+    def size(self):
+        return self.width, self.height
+
+    def array(self):
+        """Views the frame as an (h, w, 4) BGRA array without copying."""
+        return np.frombuffer(self.raw, dtype=np.uint8).reshape(self.height, self.width, 4)
+
+
+# -------------------------
+# BACKEND INTERFACE
+# -------------------------
+class CaptureBackend:
+    """
+    Common interface for screen capture.
+
+    grab() accepts an mss-style {"left", "top", "width", "height"} dict or a
+    (left, top, right, bottom) tuple and returns a CapturedFrame. monitors
+    follows mss: index 0 is the whole virtual desktop, 1.. are the monitors.
+    Backends hold OS resources tied to the creating thread, so create them
+    on the thread that grabs.
+    """
+
+    name = None
+
+    def grab(self, region):
+        raise NotImplementedError
+
+    @property
+    def monitors(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @staticmethod
+    def normalise(region):
+        """Returns (left, top, width, height) for a dict or (l, t, r, b) tuple."""
+        if isinstance(region, dict):
+            return int(region["left"]), int(region["top"]), int(region["width"]), int(region["height"])
+        left, top, right, bottom = region
+        return int(left), int(top), int(right - left), int(bottom - top)
+
+
+class MssCapture(CaptureBackend):
+    """Cross-platform capture through mss (GDI BitBlt on Windows, XGetImage on Linux)."""
+
+    name = "mss"
+
+    def __init__(self):
+        try:
+            import mss
+        except ImportError as e:
+            raise CaptureUnavailable(f"mss not installed: {e}")
+        self._sct = mss.mss()
+
+    @property
+    def monitors(self):
+        return self._sct.monitors
+
+    def grab(self, region):
+        left, top, width, height = self.normalise(region)
+        shot = self._sct.grab({"left": left, "top": top, "width": width, "height": height})
+        return CapturedFrame(shot.raw, left, top, shot.width, shot.height)
+
+    def close(self):
+        self._sct.close()
+
+
+class PyAutoGuiCapture(CaptureBackend):
+    """Fallback capture through pyautogui/PIL; slowest, but works wherever pyautogui does."""
+
+    name = "pyautogui"
+
+    def __init__(self):
+        try:
+            import pyautogui
+        except Exception as e:
+            raise CaptureUnavailable(f"pyautogui unavailable: {e}")
+        self._pyautogui = pyautogui
+
+    @property
+    def monitors(self):
+        width, height = self._pyautogui.size()
+        screen = {"left": 0, "top": 0, "width": width, "height": height}
+        return [screen, dict(screen)]
+
+    def grab(self, region):
+        left, top, width, height = self.normalise(region)
+        rgb = np.asarray(self._pyautogui.screenshot(region=(left, top, width, height)))
+        height, width = rgb.shape[:2]
+
+        raw = bytearray(width * height * 4)
+        bgra = np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4)
+        bgra[..., :3] = rgb[..., 2::-1]
+        bgra[..., 3] = 255
+        return CapturedFrame(raw, left, top, width, height)
+
+
+# -------------------------
+# X11 MIT-SHM BACKEND
+# -------------------------
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong),
+        ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p),
+        ("readOnly", ctypes.c_int)
+    ]
+
+
+class _XImage(ctypes.Structure):
+    # Leading fields of Xlib's XImage; only these are read or written
+    _fields_ = [
+        ("width", ctypes.c_int), ("height", ctypes.c_int),
+        ("xoffset", ctypes.c_int), ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int), ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int), ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int), ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+        ("red_mask", ctypes.c_ulong), ("green_mask", ctypes.c_ulong), ("blue_mask", ctypes.c_ulong),
+        ("obdata", ctypes.c_void_p)
+    ]
+
+
+_X_ERROR_HANDLER = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+
+
+class XShmCapture(CaptureBackend):
+    """
+    X11 capture through the MIT-SHM extension.
+
+    The X server copies pixels straight into a shared-memory segment that is
+    kept across grabs (only re-created when the region size changes), and the
+    returned frame is a view of that segment: no socket transfer and no
+    per-grab allocation. The frame is only valid until the next grab.
+    """
+
+    name = "xshm"
+
+    ZPIXMAP = 2
+    IPC_PRIVATE = 0
+    IPC_CREAT = 0o1000
+    IPC_RMID = 0
+    ALL_PLANES = ctypes.c_ulong(-1).value
+
+    _error_handler = None
+    _last_error = 0
+
+    def __init__(self):
+        if not sys.platform.startswith("linux") or not os.environ.get("DISPLAY"):
+            raise CaptureUnavailable("MIT-SHM capture needs an X11 display")
+
+        x11_path = ctypes.util.find_library("X11")
+        xext_path = ctypes.util.find_library("Xext")
+        if not x11_path or not xext_path:
+            raise CaptureUnavailable("libX11/libXext not found")
+        self._x11 = ctypes.CDLL(x11_path)
+        self._xext = ctypes.CDLL(xext_path)
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._declare_functions()
+
+        self._display = self._x11.XOpenDisplay(None)
+        if not self._display:
+            raise CaptureUnavailable("Could not open X display")
+        if not self._xext.XShmQueryExtension(self._display):
+            self._x11.XCloseDisplay(self._display)
+            raise CaptureUnavailable("X server has no MIT-SHM extension")
+
+        # Xlib's default error handler exits the process; record errors instead
+        if XShmCapture._error_handler is None:
+            XShmCapture._error_handler = _X_ERROR_HANDLER(XShmCapture._on_x_error)
+            self._x11.XSetErrorHandler(XShmCapture._error_handler)
+
+        screen = self._x11.XDefaultScreen(self._display)
+        self._root = self._x11.XRootWindow(self._display, screen)
+        self._visual = self._x11.XDefaultVisual(self._display, screen)
+        self._depth = self._x11.XDefaultDepth(self._display, screen)
+        self._screen_w = self._x11.XDisplayWidth(self._display, screen)
+        self._screen_h = self._x11.XDisplayHeight(self._display, screen)
+
+        self._image = None
+        self._shminfo = None
+        self._buffer = None
+
+    @staticmethod
+    def _on_x_error(display, event):
+        XShmCapture._last_error += 1
+        return 0
+
+    def _declare_functions(self):
+        x11, xext, libc = self._x11, self._xext, self._libc
+        vp, ulong, c_int, c_uint = ctypes.c_void_p, ctypes.c_ulong, ctypes.c_int, ctypes.c_uint
+        image_p = ctypes.POINTER(_XImage)
+        shminfo_p = ctypes.POINTER(_XShmSegmentInfo)
+
+        x11.XOpenDisplay.argtypes, x11.XOpenDisplay.restype = [ctypes.c_char_p], vp
+        x11.XCloseDisplay.argtypes = [vp]
+        x11.XDefaultScreen.argtypes, x11.XDefaultScreen.restype = [vp], c_int
+        x11.XRootWindow.argtypes, x11.XRootWindow.restype = [vp, c_int], ulong
+        x11.XDefaultVisual.argtypes, x11.XDefaultVisual.restype = [vp, c_int], vp
+        x11.XDefaultDepth.argtypes, x11.XDefaultDepth.restype = [vp, c_int], c_int
+        x11.XDisplayWidth.argtypes, x11.XDisplayWidth.restype = [vp, c_int], c_int
+        x11.XDisplayHeight.argtypes, x11.XDisplayHeight.restype = [vp, c_int], c_int
+        x11.XSync.argtypes = [vp, c_int]
+        x11.XFree.argtypes = [vp]
+        x11.XSetErrorHandler.argtypes, x11.XSetErrorHandler.restype = [_X_ERROR_HANDLER], vp
+
+        xext.XShmQueryExtension.argtypes, xext.XShmQueryExtension.restype = [vp], c_int
+        xext.XShmCreateImage.argtypes = [vp, vp, c_uint, c_int, vp, shminfo_p, c_uint, c_uint]
+        xext.XShmCreateImage.restype = image_p
+        xext.XShmAttach.argtypes, xext.XShmAttach.restype = [vp, shminfo_p], c_int
+        xext.XShmDetach.argtypes, xext.XShmDetach.restype = [vp, shminfo_p], c_int
+        xext.XShmGetImage.argtypes = [vp, ulong, image_p, c_int, c_int, ulong]
+        xext.XShmGetImage.restype = c_int
+
+        libc.shmget.argtypes, libc.shmget.restype = [c_int, ctypes.c_size_t, c_int], c_int
+        libc.shmat.argtypes, libc.shmat.restype = [c_int, vp, c_int], vp
+        libc.shmdt.argtypes, libc.shmdt.restype = [vp], c_int
+        libc.shmctl.argtypes, libc.shmctl.restype = [c_int, c_int, vp], c_int
+
+    @property
+    def monitors(self):
+        screen = {"left": 0, "top": 0, "width": self._screen_w, "height": self._screen_h}
+        return [screen, dict(screen)]
+
+    def _ensure_segment(self, width, height):
+        """(Re)creates the shared image only when the requested size changes."""
+        image = self._image
+        if image is not None and image.contents.width == width and image.contents.height == height:
+            return
+        self._release_segment()
+
+        shminfo = _XShmSegmentInfo()
+        image = self._xext.XShmCreateImage(self._display, self._visual, self._depth, self.ZPIXMAP,
+                                           None, ctypes.byref(shminfo), width, height)
+        if not image:
+            raise CaptureUnavailable("XShmCreateImage failed")
+        if image.contents.bits_per_pixel != 32:
+            self._x11.XFree(image)
+            raise CaptureUnavailable("MIT-SHM capture needs a 32 bpp visual")
+
+        size = image.contents.bytes_per_line * height
+        shminfo.shmid = self._libc.shmget(self.IPC_PRIVATE, size, self.IPC_CREAT | 0o600)
+        if shminfo.shmid < 0:
+            self._x11.XFree(image)
+            raise CaptureUnavailable(f"shmget failed (errno {ctypes.get_errno()})")
+        shminfo.shmaddr = self._libc.shmat(shminfo.shmid, None, 0)
+        shminfo.readOnly = 0
+        image.contents.data = shminfo.shmaddr
+
+        self._xext.XShmAttach(self._display, ctypes.byref(shminfo))
+        self._x11.XSync(self._display, 0)
+        # Marked for removal now; the kernel frees it once both sides detach
+        self._libc.shmctl(shminfo.shmid, self.IPC_RMID, None)
+
+        self._image, self._shminfo = image, shminfo
+        self._buffer = (ctypes.c_ubyte * size).from_address(shminfo.shmaddr)
+
+    def _release_segment(self):
+        if self._image is None:
+            return
+        self._xext.XShmDetach(self._display, ctypes.byref(self._shminfo))
+        self._x11.XSync(self._display, 0)
+        self._libc.shmdt(self._shminfo.shmaddr)
+        self._image.contents.data = None
+        self._x11.XFree(self._image)
+        self._image = self._shminfo = self._buffer = None
+
+    def grab(self, region):
+        left, top, width, height = self.normalise(region)
+        self._ensure_segment(width, height)
+
+        errors = XShmCapture._last_error
+        ok = self._xext.XShmGetImage(self._display, self._root, self._image, left, top, self.ALL_PLANES)
+        if not ok or XShmCapture._last_error != errors:
+            raise ValueError(f"XShmGetImage failed for region {(left, top, width, height)}")
+        return CapturedFrame(self._buffer, left, top, width, height)
+
+    def close(self):
+        if self._display:
+            self._release_segment()
+            self._x11.XCloseDisplay(self._display)
+            self._display = None
+
+
+# -------------------------
+# BACKEND SELECTION
+# -------------------------
+BACKENDS = {
+    "xshm": XShmCapture,
+    "mss": MssCapture,
+    "pyautogui": PyAutoGuiCapture
+}
+
+# Candidates tried by "auto", fastest first where all are available
+AUTO_ORDER = ("xshm", "mss", "pyautogui")
+
+_auto_choice = None
+
+
+def measure_backend(backend, grabs=5, size=(300, 200)):
+    """Average seconds per grab of a small region in the middle of the primary monitor."""
+    monitor = backend.monitors[1]
+    width, height = min(size[0], monitor["width"]), min(size[1], monitor["height"])
+    region = {
+        "left": monitor["left"] + (monitor["width"] - width) // 2,
+        "top": monitor["top"] + (monitor["height"] - height) // 2,
+        "width": width,
+        "height": height
+    }
+    backend.grab(region)  # warm-up (segment/DC allocation)
+    start = time.perf_counter()
+    for _ in range(grabs):
+        backend.grab(region)
+    return (time.perf_counter() - start) / grabs
+
+
+def backend_class(name):
+    if name == "synthetic":
+        # Imported lazily: the synthetic source pulls in OpenCV for its desktop drawing
+        from capture.synthetic import SyntheticCapture
+        return SyntheticCapture
+    return BACKENDS[name]
+
+
+def create_capture_backend(name="auto"):
+    """
+    Returns a ready capture backend.
+
+    A named backend ("xshm", "mss", "pyautogui", "synthetic") is used when it
+    is available; "auto", or a named backend that fails, picks among the
+    available candidates by measured grab speed. The measured choice is
+    cached for the rest of the process.
+    """
+    global _auto_choice
+
+    if name and name != "auto":
+        try:
+            return backend_class(name)()
+        except (CaptureUnavailable, KeyError) as e:
+            print(f"Capture backend '{name}' unavailable ({e}); choosing automatically")
+
+    if _auto_choice is not None:
+        try:
+            return BACKENDS[_auto_choice]()
+        except CaptureUnavailable:
+            _auto_choice = None
+
+    timings = []
+    for candidate in AUTO_ORDER:
+        try:
+            backend = BACKENDS[candidate]()
+        except CaptureUnavailable:
+            continue
+        try:
+            timings.append((measure_backend(backend), candidate, backend))
+        except Exception as e:
+            print(f"Capture backend '{candidate}' failed its speed check: {e}")
+            backend.close()
+
+    if not timings:
+        raise CaptureUnavailable("No screen capture backend is available")
+
+    timings.sort(key=lambda t: t[0])
+    _, _auto_choice, best = timings[0]
+    for _, _, other in timings[1:]:
+        other.close()
+    return best
@@ -0,0 +1,118 @@
+# capture/synthetic.py
+
+import cv2
+import numpy as np
+
+from capture.backends import CaptureBackend, CapturedFrame
+
+
+WORDS = ("the", "magnifier", "reads", "document", "window", "settings", "zoom",
+         "accessibility", "screen", "text", "menu", "file", "edit", "view", "help")
+
+
+class SyntheticCapture(CaptureBackend):
+    """
+    Capture backend for tests and benchmarks that serves regions of a
+    generated desktop instead of the real screen.
+
+    The desktop has a task bar, window chrome and paragraphs of text, so
+    resizing and filtering behave like they do on real documents. A small
+    "clock" area changes every `animate_every` grabs to exercise change
+    detection; set it to 0 for a fully static screen.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, width=1920, height=1080, seed=0, animate_every=30):
+        self.width, self.height = width, height
+        self.animate_every = animate_every
+        self.grabs = 0
+        self._monitors = [
+            {"left": 0, "top": 0, "width": width, "height": height},
+            {"left": 0, "top": 0, "width": width, "height": height}
+        ]
+        self.desktop = self.generate_desktop(width, height, seed)
+        self._clock = (width - 140, height - 36, 120, 24)
+
+    @staticmethod
+    def generate_desktop(width, height, seed=0):
+        """Draws a deterministic BGRA desktop with UI chrome and text."""
+        rng = np.random.default_rng(seed)
+        desktop = np.empty((height, width, 4), dtype=np.uint8)
+        desktop[...] = (160, 120, 60, 255)
+
+        # Task bar
+        cv2.rectangle(desktop, (0, height - 48), (width, height), (40, 40, 40, 255), -1)
+
+        # A few document windows with title bars and text
+        for _ in range(4):
+            x = int(rng.integers(0, max(1, width - 700)))
+            y = int(rng.integers(0, max(1, height - 548)))
+            w, h = int(rng.integers(500, 700)), int(rng.integers(350, 500))
+            cv2.rectangle(desktop, (x, y), (x + w, y + h), (250, 250, 250, 255), -1)
+            cv2.rectangle(desktop, (x, y), (x + w, y + 28), (120, 80, 30, 255), -1)
+            cv2.putText(desktop, "Document - Optivox", (x + 8, y + 20),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255, 255), 1, cv2.LINE_AA)
+            for line_y in range(y + 52, y + h - 10, 22):
+                words = " ".join(rng.choice(WORDS, size=8))
+                cv2.putText(desktop, words, (x + 12, line_y), cv2.FONT_HERSHEY_SIMPLEX,
+                            0.5, (20, 20, 20, 255), 1, cv2.LINE_AA)
+        return desktop
+
+    @property
+    def monitors(self):
+        return self._monitors
+
+    def _animate(self):
+        x, y, w, h = self._clock
+        tick = self.grabs // self.animate_every
+        cv2.rectangle(self.desktop, (x, y), (x + w, y + h), (40, 40, 40, 255), -1)
+        cv2.putText(self.desktop, f"12:{tick % 60:02d}", (x + 20, y + 18),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255, 255), 1, cv2.LINE_AA)
+
+    def grab(self, monitor):
+        """Returns a fresh copy of the requested region, like mss does."""
+        self.grabs += 1
+        if self.animate_every and self.grabs % self.animate_every == 0:
+            self._animate()
+
+        left, top, width, height = self.normalise(monitor)
+
+        raw = bytearray(width * height * 4)
+        np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4)[...] = \
+            self.desktop[top:top + height, left:left + width]
+        return CapturedFrame(raw, left, top, width, height)
+
+
+def cursor_path(kind, frames, width=1920, height=1080, seed=0):
+    """
+    Yields synthetic cursor positions.
+
+    reading: left-to-right sweeps along text lines with small hand tremor
+    still:   a parked cursor (static document reading)
+    tremor:  a resting hand: the cursor wobbles by a pixel or two around one spot
+    jumps:   large random jumps between UI elements
+    """
+    rng = np.random.default_rng(seed)
+    if kind == "still":
+        for _ in range(frames):
+            yield width // 2, height // 2
+    elif kind == "reading":
+        x, y = 200, 150
+        for _ in range(frames):
+            x += 4
+            if x > width - 200:
+                x, y = 200, y + 22
+                if y > height - 150:
+                    y = 150
+            yield x + int(rng.integers(-1, 2)), y + int(rng.integers(-1, 2))
+    elif kind == "tremor":
+        for _ in range(frames):
+            yield width // 2 + int(rng.integers(-2, 3)), height // 2 + int(rng.integers(-2, 3))
+    elif kind == "jumps":
+        for i in range(frames):
+            if i % 20 == 0:
+                pos = int(rng.integers(0, width)), int(rng.integers(0, height))
+            yield pos
+    else:
+        raise ValueError(f"Unknown cursor path: {kind}")
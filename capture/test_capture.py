@@ -0,0 +1,65 @@
+import time
+import pytest
+from capture import backends as capture_module
+from capture.backends import CaptureBackend, CaptureUnavailable, CapturedFrame, XShmCapture, create_capture_backend
+from capture.synthetic import SyntheticCapture
+
+
+class FakeBackend(CaptureBackend):
+    delay = 0.0
+
+    @property
+    def monitors(self):
+        screen = {"left": 0, "top": 0, "width": 640, "height": 480}
+        return [screen, screen]
+
+    def grab(self, region):
+        time.sleep(self.delay)
+        left, top, width, height = self.normalise(region)
+        return CapturedFrame(bytearray(width * height * 4), left, top, width, height)
+
+class SlowBackend(FakeBackend):
+    delay = 0.002
+
+class FastBackend(FakeBackend):
+    delay = 0.0
+
+class MissingBackend(FakeBackend):
+    def __init__(self):
+        raise CaptureUnavailable("not here")
+
+@pytest.fixture
+def fake_backends(monkeypatch):
+    monkeypatch.setattr(capture_module, "_auto_choice", None)
+    monkeypatch.setattr(capture_module, "AUTO_ORDER", ("missing", "slow", "fast"))
+    monkeypatch.setattr(capture_module, "BACKENDS",
+                        {"missing": MissingBackend, "slow": SlowBackend, "fast": FastBackend})
+
+def test_normalise_accepts_dicts_and_tuples():
+    assert CaptureBackend.normalise({"left": 1, "top": 2, "width": 3, "height": 4}) == (1, 2, 3, 4)
+    assert CaptureBackend.normalise((10, 20, 110, 70)) == (10, 20, 100, 50)
+
+def test_named_synthetic_backend():
+    with create_capture_backend("synthetic") as capture:
+        frame = capture.grab({"left": 0, "top": 0, "width": 32, "height": 16})
+        assert frame.array().shape == (16, 32, 4)
+
+def test_auto_picks_fastest_available_backend(fake_backends):
+    backend = create_capture_backend("auto")
+    assert isinstance(backend, FastBackend)
+    assert capture_module._auto_choice == "fast"
+
+def test_unavailable_named_backend_falls_back(fake_backends):
+    assert isinstance(create_capture_backend("missing"), FastBackend)
+
+def test_no_backend_available(monkeypatch):
+    monkeypatch.setattr(capture_module, "_auto_choice", None)
+    monkeypatch.setattr(capture_module, "BACKENDS", {"missing": MissingBackend})
+    monkeypatch.setattr(capture_module, "AUTO_ORDER", ("missing",))
+    with pytest.raises(CaptureUnavailable):
+        create_capture_backend("auto")
+
+def test_xshm_needs_a_display(monkeypatch):
+    monkeypatch.delenv("DISPLAY", raising=False)
+    with pytest.raises(CaptureUnavailable):
+        XShmCapture()
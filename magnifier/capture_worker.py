@@ -0,0 +1,188 @@
+import threading
+import time
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from magnifier.frame_scheduler import FramePacer
+
+
+class FrameSlot:
+    """One slot of the triple buffer: a BGRA image plus the view it belongs to."""
+
+    def __init__(self):
+        self.image = None
+        self.image_seq = 0   # bumps whenever the pixels differ from the previous frame
+        self.pos = None      # cursor position the frame was produced for
+        self.timestamp = 0.0
+        self.lenses = {}     # extra (pinned) lens id -> (image, image_seq)
+        self.smooth = None   # None: output-sized image; else a capture QPainter scales (smoothly or not)
+
+    def store(self, image, image_seq, pos, smooth=None):
+        if self.image is None or self.image.shape != image.shape:
+            self.image = np.empty_like(image)
+        np.copyto(self.image, image)
+        self.image_seq = image_seq
+        self.pos = pos
+        self.smooth = smooth
+        self.timestamp = time.monotonic()
+
+    def store_lenses(self, lenses):
+        """Copies the images of extra lenses, given as {lens id: (image, image_seq)}."""
+        for lens_id in [key for key in self.lenses if key not in lenses]:
+            del self.lenses[lens_id]
+        for lens_id, (image, image_seq) in lenses.items():
+            current = self.lenses.get(lens_id)
+            if current is not None and current[1] == image_seq:
+                continue
+            buffer = current[0] if current is not None and current[0].shape == image.shape else np.empty_like(image)
+            np.copyto(buffer, image)
+            self.lenses[lens_id] = (buffer, image_seq)
+
+
+class TripleBuffer:
+    """
+    Three-slot ring between the capture thread and the GUI thread.
+
+    The producer always writes into its own back slot and publishes it as
+    the newest ready frame; the consumer takes the newest ready frame and
+    holds it as the front slot while presenting. If the producer publishes
+    again before the consumer picked the previous frame up, that stale frame
+    is dropped, so the GUI never falls behind capture.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        slots = [FrameSlot() for _ in range(3)]
+        self._back, self._ready, self._front = slots[0], slots[1], slots[2]
+        self._has_ready = False
+
+        self.published = 0
+        self.dropped = 0
+
+    def back(self):
+        """Slot the producer may write into (only ever touched by the producer)."""
+        return self._back
+
+    def publish(self):
+        """Makes the back slot the newest ready frame."""
+        with self._lock:
+            if self._has_ready:
+                self.dropped += 1
+            self._back, self._ready = self._ready, self._back
+            self._has_ready = True
+            self.published += 1
+
+    def take(self):
+        """Returns the newest finished frame, or None if nothing new was published."""
+        with self._lock:
+            if not self._has_ready:
+                return None
+            self._front, self._ready = self._ready, self._front
+            self._has_ready = False
+            return self._front
+
+
+def idle_render(capture, slot):
+    """Render callback for a worker with nothing to show; the pacer drops it to the idle rate."""
+    return False
+
+
+class CaptureWorker(QThread):
+    """
+    Runs capture and processing off the GUI thread.
+
+    `render(capture, slot)` is called once per frame with a capture object
+    created inside this thread; it fills the back slot and returns True when
+    there is something new to present. Published frames are announced with
+    frame_ready (delivered queued to the GUI thread), where the consumer takes
+    only the newest one. Pacing follows the shared FramePacer idle policy.
+    Exceptions from the capture factory or the render callback are logged
+    and the frame is retried with a new capture object at the idle rate.
+    """
+    frame_ready = pyqtSignal()
+
+    def __init__(self, render, capture_factory, target_fps=60, idle_fps=10, parent=None):
+        super().__init__(parent)
+        self.render = render
+        self.capture_factory = capture_factory
+        self.pacer = FramePacer(target_fps, idle_fps)
+        self.frames = TripleBuffer()
+        self.running = False
+        self._wake_event = threading.Event()
+        self._render_lock = threading.Lock()
+        self.errors = 0
+        self._last_error = None
+
+    def run(self):
+        # Capture backends (GDI device contexts, X11 connections) must belong to the thread using them
+        capture = None
+        try:
+            while self.running:
+                start = time.monotonic()
+                published = False
+                try:
+                    if capture is None:
+                        capture = self.capture_factory()
+                    with self._render_lock:
+                        published = self.render(capture, self.frames.back())
+                        if published:
+                            self.frames.publish()
+                            self.frame_ready.emit()
+                except Exception as e:
+                    # Every mode shares this thread: a failed grab (secure desktop, lock
+                    # screen, display change) must not end it. Retry with a fresh backend
+                    self._report_error(e)
+                    capture = self._close(capture)
+                    self._wake_event.wait(self.pacer.idle_interval / 1000)
+                self.pacer.report(published)
+
+                # Sleep for the rest of the frame interval; wake() cuts it short
+                remaining = self.pacer.interval / 1000 - (time.monotonic() - start)
+                if remaining > 0:
+                    self._wake_event.wait(remaining)
+                self._wake_event.clear()
+        finally:
+            self._close(capture)
+
+    def _report_error(self, error):
+        """Prints a capture/render failure once, not once per frame while it persists."""
+        self.errors += 1
+        message = f"{type(error).__name__}: {error}"
+        if message != self._last_error:
+            self._last_error = message
+            print("Capture thread error:", message)
+
+    @staticmethod
+    def _close(capture):
+        close = getattr(capture, "close", None)
+        if close:
+            try:
+                close()
+            except Exception as e:
+                print("Could not close the capture backend:", e)
+        return None
+
+    def start(self):
+        self.running = True
+        super().start()
+
+    def set_render(self, render):
+        """
+        Swaps the per-frame callback (e.g. on a magnifier mode switch) between
+        two frames, never during one, and drops the frame the previous
+        callback left unpresented.
+        """
+        with self._render_lock:
+            self.render = render
+            self.frames.take()
+        self.wake()
+
+    def wake(self):
+        """Returns to the full frame rate and starts the next frame right away."""
+        self.pacer.wake()
+        self._wake_event.set()
+
+    def stop(self):
+        self.running = False
+        self._wake_event.set()
+        self.wait()
@@ -0,0 +1,82 @@
+import numpy as np
+
+
+class TileChangeDetector:
+    """
+    Compares each captured frame with the previous one, tile by tile, so the
+    magnifiers can skip the resize/convert/present stages when nothing on
+    screen changed and redraw only the dirty part when the change is partial.
+
+    Frames are compared as 32-bit pixels into a preallocated mask, which is
+    then OR-reduced into a grid of tiles; the bounding box of the dirty tiles
+    is what gets re-rendered. Hit rates are kept for the stats output.
+    """
+
+    def __init__(self, tile_size=16):
+        self.tile_size = tile_size
+        self._previous = None
+        self._mask = None
+        self._key = None
+
+        self.frames = 0
+        self.unchanged = 0
+        self.partial = 0
+
+    def reset(self):
+        """Forgets the previous frame so the next one is treated as all-new."""
+        self._previous = None
+        self._key = None
+
+    def compare(self, frame, key=None):
+        """
+        Checks a BGRA frame against the previous one.
+
+        `key` identifies everything besides the pixels that affects the output
+        (capture rectangle, target size, filters); a different key is a full change.
+        Returns None when nothing changed, otherwise the dirty (x0, y0, x1, y1)
+        rectangle in frame coordinates.
+        """
+        self.frames += 1
+        height, width = frame.shape[:2]
+
+        if self._previous is None or key != self._key or self._previous.shape != frame.shape:
+            self._key = key
+            self._previous = frame.copy()
+            self._mask = np.empty((height, width), dtype=bool)
+            return (0, 0, width, height)
+
+        current = frame.view(np.uint32).reshape(height, width)
+        previous = self._previous.view(np.uint32).reshape(height, width)
+        np.not_equal(current, previous, out=self._mask)
+
+        if not self._mask.any():
+            self.unchanged += 1
+            return None
+
+        tile = self.tile_size
+        tiles = np.logical_or.reduceat(self._mask, np.arange(0, height, tile), axis=0)
+        tiles = np.logical_or.reduceat(tiles, np.arange(0, width, tile), axis=1)
+        rows = np.flatnonzero(tiles.any(axis=1))
+        cols = np.flatnonzero(tiles.any(axis=0))
+
+        x0, x1 = cols[0] * tile, min(width, (cols[-1] + 1) * tile)
+        y0, y1 = rows[0] * tile, min(height, (rows[-1] + 1) * tile)
+
+        np.copyto(self._previous, frame)
+        if (x1 - x0) * (y1 - y0) < width * height:
+            self.partial += 1
+        return (int(x0), int(y0), int(x1), int(y1))
+
+    @property
+    def hit_rate(self):
+        """Fraction of frames that were skipped because nothing changed."""
+        return self.unchanged / self.frames if self.frames else 0.0
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "unchanged": self.unchanged,
+            "partial": self.partial,
+            "hit_rate": round(self.hit_rate, 4),
+            "partial_rate": round(self.partial / self.frames, 4) if self.frames else 0.0
+        }
@@ -0,0 +1,208 @@
+"""
+Colour filters for the magnifiers.
+
+Every filter is described as a chain of stages in RGB - either a 3x4 affine
+colour matrix or a nonlinear per-channel curve - and compiled once into
+the fewest possible in-place passes over a BGRA frame:
+
+  * consecutive matrices are multiplied into one,
+  * matrices that don't mix channels (invert, brightness) become lookup
+    tables, and consecutive tables are composed into one 256-entry LUT.
+
+So "deutan correction + invert" is a single cv2.transform and
+"invert + gamma" a single cv2.LUT. Compiled filters are cached, so asking
+for the same settings every frame costs a dictionary lookup.
+
+The capture-based magnifiers apply the result to the small pre-scale
+capture; the full-window magnifier hands matrix filters to the OS as a
+colour effect (color_effect()).
+"""
+import functools
+import cv2
+import numpy as np
+
+# Rec. 601 luma weights in RGB order
+LUMA = np.array([0.299, 0.587, 0.114])
+
+# Dichromat simulation matrices (Machado, Oliveira & Fernandes 2009, severity 1.0), RGB
+SIMULATION = {
+    "protan": np.array([[0.152286, 1.052583, -0.204868],
+                        [0.114503, 0.786281, 0.099216],
+                        [-0.003882, -0.048116, 1.051998]]),
+    "deutan": np.array([[0.367322, 0.860646, -0.227968],
+                        [0.280085, 0.672501, 0.047413],
+                        [-0.011820, 0.042940, 0.968881]]),
+    "tritan": np.array([[1.255528, -0.076749, -0.178779],
+                        [-0.078411, 0.930809, 0.147602],
+                        [0.004733, 0.691367, 0.303900]]),
+}
+
+# Daltonisation: where the lost colour information is shifted to
+ERROR_SHIFT = {
+    "protan": np.array([[0, 0, 0], [0.7, 1, 0], [0.7, 0, 1]]),
+    "deutan": np.array([[0, 0, 0], [0.7, 1, 0], [0.7, 0, 1]]),
+    "tritan": np.array([[1, 0, 0.7], [0, 1, 0.7], [0, 0, 0]]),
+}
+
+
+def _affine(matrix, offset=(0, 0, 0)):
+    stage = np.zeros((3, 4))
+    stage[:, :3] = matrix
+    stage[:, 3] = offset
+    return ("matrix", stage)
+
+
+def _correction(kind):
+    simulated = SIMULATION[kind]
+    return np.eye(3) + ERROR_SHIFT[kind] @ (np.eye(3) - simulated)
+
+
+INVERT = _affine(-np.eye(3), (255, 255, 255))
+
+FILTERS = {
+    "none": (),
+    "invert": (INVERT,),
+    "grayscale": (_affine(np.tile(LUMA, (3, 1))),),
+    # Dark text on light pages becomes yellow on black
+    "yellow_on_black": (_affine([-LUMA, -LUMA, (0, 0, 0)], (255, 255, 0)),),
+    "protan_simulation": (_affine(SIMULATION["protan"]),),
+    "deutan_simulation": (_affine(SIMULATION["deutan"]),),
+    "tritan_simulation": (_affine(SIMULATION["tritan"]),),
+    "protan_correction": (_affine(_correction("protan")),),
+    "deutan_correction": (_affine(_correction("deutan")),),
+    "tritan_correction": (_affine(_correction("tritan")),),
+}
+
+
+def _gamma(gamma):
+    curve = 255 * (np.arange(256) / 255) ** (1 / gamma)
+    return ("lut", np.tile(curve, (3, 1)))
+
+
+def _as_table(stage):
+    """Turns a channel-independent matrix into per-channel tables; None if it mixes channels."""
+    kind, data = stage
+    if kind == "lut":
+        return data
+    if np.count_nonzero(data[:, :3] - np.diag(np.diag(data[:, :3]))):
+        return None
+    x = np.arange(256)
+    return np.stack([np.clip(data[c, c] * x + data[c, 3], 0, 255) for c in range(3)])
+
+
+def _merge(stages):
+    """Merges neighbouring stages of the same kind (matrix products, composed tables)."""
+    merged = []
+    for stage in stages:
+        previous = merged[-1] if merged else None
+        if previous is None or previous[0] != stage[0]:
+            merged.append(stage)
+        elif stage[0] == "lut":
+            index = np.clip(np.rint(previous[1]), 0, 255).astype(int)
+            merged[-1] = ("lut", np.stack([stage[1][c][index[c]] for c in range(3)]))
+        else:
+            first, second = previous[1], stage[1]
+            matrix = second[:, :3] @ first[:, :3]
+            offset = second[:, :3] @ first[:, 3] + second[:, 3]
+            merged[-1] = ("matrix", np.column_stack([matrix, offset]))
+    return merged
+
+
+def _fuse(stages, tables=True):
+    """
+    Reduces a stage chain to the fewest passes; with `tables`, matrices that
+    end up channel-independent are turned into LUTs and merged again.
+    """
+    fused = _merge(stages)
+    if tables:
+        fused = _merge([stage if _as_table(stage) is None else ("lut", _as_table(stage)) for stage in fused])
+    return fused
+
+
+class ColorFilter:
+    """A compiled filter chain; apply() runs it in place on a BGRA frame."""
+
+    def __init__(self, name, stages):
+        self.name = name
+        self.stages = list(stages)
+        self._passes = []
+        for kind, data in _fuse(self.stages):
+            if kind == "lut":
+                lut = np.full((256, 1, 4), 255, dtype=np.uint8)
+                # RGB tables -> BGR channels; alpha is forced opaque later anyway
+                lut[:, 0, :3] = np.clip(np.rint(data[::-1].T), 0, 255)
+                if np.array_equal(lut[:, 0, :3], np.tile(np.arange(256), (3, 1)).T):
+                    continue    # e.g. invert + invert
+                if np.array_equal(lut[:, 0, :3], np.tile(255 - np.arange(256), (3, 1)).T):
+                    self._passes.append(("invert", None))
+                else:
+                    self._passes.append(("lut", lut))
+            else:
+                # RGB affine -> BGRA 4x5 matrix (rows/columns reversed, alpha kept at 255)
+                matrix = np.zeros((4, 5), dtype=np.float32)
+                matrix[:3, :3] = data[::-1, 2::-1]
+                matrix[:3, 4] = data[::-1, 3]
+                matrix[3, 4] = 255
+                self._passes.append(("matrix", matrix))
+
+    @property
+    def passes(self):
+        return len(self._passes)
+
+    def apply(self, frame):
+        for kind, data in self._passes:
+            if kind == "invert":
+                cv2.bitwise_not(frame, dst=frame)
+            elif kind == "lut":
+                cv2.LUT(frame, data, dst=frame)
+            else:
+                cv2.transform(frame, data, dst=frame)
+        return frame
+
+    def color_effect(self):
+        """
+        The filter as a 5x5 MAGCOLOREFFECT matrix (row-vector RGBA convention,
+        0..1 range) for the Windows magnification API, or None if the chain
+        contains a nonlinear curve (gamma) the OS can't express.
+        """
+        fused = _fuse(self.stages, tables=False)
+        if any(kind == "lut" for kind, _ in fused):
+            return None
+        effect = np.eye(5, dtype=np.float32)
+        for _, data in fused:
+            effect[:3, :3] = data[:, :3].T
+            effect[4, :3] = data[:, 3] / 255
+        return effect
+
+    def __repr__(self):
+        return f"ColorFilter({self.name!r}, passes={self.passes})"
+
+
+@functools.lru_cache(maxsize=32)
+def compile_filter(name="none", invert=False, gamma=1.0):
+    """
+    Returns the cached ColorFilter for a named filter, optionally followed by
+    inversion and a gamma curve. Unknown names fall back to no filter.
+    """
+    if name not in FILTERS:
+        print(f"Unknown colour filter {name!r}, using none")
+        name = "none"
+    stages = list(FILTERS[name])
+    if invert:
+        stages.append(INVERT)
+    if gamma and gamma != 1.0:
+        stages.append(_gamma(gamma))
+    return ColorFilter(name, stages)
+
+
+def filter_from_settings(settings, curves=True):
+    """
+    The ColorFilter for the current magnifier_filter / invert_magnifier /
+    magnifier_gamma settings; `curves=False` leaves out the gamma curve for
+    callers that can only apply colour matrices.
+    """
+    return compile_filter(
+        settings.get("magnifier_filter") or "none",
+        bool(settings.get("invert_magnifier")),
+        float(settings.get("magnifier_gamma") or 1.0) if curves else 1.0
+    )
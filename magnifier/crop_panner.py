@@ -0,0 +1,119 @@
+import time
+import numpy as np
+
+from magnifier.viewport import centered_region
+
+
+class CropPanner:
+    """
+    Oversized capture with crop-panning for the hover lens.
+
+    Instead of grabbing a fresh lens-sized region every frame, one region
+    `padding` times larger than the lens is captured and small cursor
+    movements are served by cropping inside it. A recapture only happens when
+    the lens would leave the padded area (or comes within `margin` pixels of
+    its edge) or when the lens size changes.
+
+    Every `refresh` seconds the view itself is grabbed live and compared
+    with the snapshot, which is what lets the change detector notice
+    on-screen updates. Only if the pixels differ is the padded region
+    grabbed again, so a static screen costs one lens-sized grab per refresh
+    rather than a `padding`-squared larger one.
+
+    Crops are copied into a persistent buffer so the frame pipeline can
+    filter them in place without touching the padded snapshot.
+    """
+
+    def __init__(self, padding=3.0, margin=4, refresh=0.1):
+        self.padding = max(1.0, float(padding))
+        self.margin = margin
+        self.refresh = refresh
+
+        self._frame = None      # padded snapshot as an (h, w, 4) array
+        self._region = None     # padded snapshot's screen rectangle
+        self._captured_at = 0.0
+        self._crop = None
+
+        self.frames = 0
+        self.grabs = 0
+        self.checks = 0
+        self.pixels = 0
+
+    def invalidate(self):
+        """Forces a recapture on the next frame (e.g. after a zoom change)."""
+        self._region = None
+
+    def _contains(self, view, bounds):
+        """True when `view` lies inside the padded snapshot, `margin` pixels clear of its edges."""
+        padded = self._region
+        if padded is None:
+            return False
+        bound_left, bound_top, bound_w, bound_h = bounds
+        margin = self.margin
+
+        # Edges that sit on the screen boundary can't be panned past, so they need no margin
+        left = padded["left"] + (margin if padded["left"] > bound_left else 0)
+        top = padded["top"] + (margin if padded["top"] > bound_top else 0)
+        right = padded["left"] + padded["width"]
+        right -= margin if right < bound_left + bound_w else 0
+        bottom = padded["top"] + padded["height"]
+        bottom -= margin if bottom < bound_top + bound_h else 0
+
+        return (view["left"] >= left and view["top"] >= top
+                and view["left"] + view["width"] <= right
+                and view["top"] + view["height"] <= bottom)
+
+    def _crop_view(self, view):
+        x0 = view["left"] - self._region["left"]
+        y0 = view["top"] - self._region["top"]
+        return self._frame[y0:y0 + view["height"], x0:x0 + view["width"]]
+
+    def frame_for(self, capture, view, bounds, now=None):
+        """
+        Returns the lens-sized BGRA frame for the `view` rectangle, grabbing a
+        new padded region only when needed.
+        """
+        self.frames += 1
+        now = time.monotonic() if now is None else now
+        contained = self._contains(view, bounds)
+        if contained and now - self._captured_at >= self.refresh:
+            # Cheap staleness check: only the part the user is looking at
+            self._captured_at = now
+            self.checks += 1
+            self.grabs += 1
+            self.pixels += view["width"] * view["height"]
+            live = capture.grab(view).array()
+            contained = np.array_equal(live, self._crop_view(view))
+
+        if not contained:
+            padded_w = int(view["width"] * self.padding)
+            padded_h = int(view["height"] * self.padding)
+            cx = view["left"] + view["width"] // 2
+            cy = view["top"] + view["height"] // 2
+            region = centered_region(cx, cy, padded_w, padded_h, bounds)
+
+            pixels = capture.grab(region).array()
+            # Own the pixels: some backends reuse their buffer on the next grab
+            if self._frame is None or self._frame.shape != pixels.shape:
+                self._frame = np.empty_like(pixels)
+            np.copyto(self._frame, pixels)
+            self._region = region
+            self._captured_at = now
+            self.grabs += 1
+            self.pixels += region["width"] * region["height"]
+
+        crop = self._crop_view(view)
+
+        if self._crop is None or self._crop.shape != crop.shape:
+            self._crop = np.empty_like(crop)
+        np.copyto(self._crop, crop)
+        return self._crop
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "grabs": self.grabs,
+            "checks": self.checks,
+            "grabs_per_frame": round(self.grabs / self.frames, 4) if self.frames else 0.0,
+            "pixels_per_frame": round(self.pixels / self.frames, 1) if self.frames else 0.0
+        }
@@ -0,0 +1,123 @@
+import math
+import time
+
+
+def system_cursor_position():
+    """
+    The OS cursor position. pyautogui is imported on first use, so the
+    magnifiers load (and take an injected cursor source) where it is missing.
+    """
+    import pyautogui
+    return pyautogui.position()
+
+
+class OneEuroFilter:
+    """
+    One-Euro low-pass filter (Casiez, Roussel & Vogel 2012) for one coordinate.
+
+    The cutoff frequency rises with speed: slow movements (hand tremor) are
+    smoothed hard, fast movements follow with little lag. `min_cutoff` (Hz)
+    sets the jitter reduction at rest, `beta` how quickly lag shrinks with
+    speed (per pixel/second).
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.007, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.velocity = 0.0
+        self._t = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, x, t):
+        if self.value is None or t <= self._t:
+            if self.value is None:
+                self.value = float(x)
+            self._t = t
+            return self.value
+
+        dt = t - self._t
+        self._t = t
+        velocity = (x - self.value) / dt
+        a_d = self._alpha(self.d_cutoff, dt)
+        self.velocity += a_d * (velocity - self.velocity)
+
+        cutoff = self.min_cutoff + self.beta * abs(self.velocity)
+        self.value += self._alpha(cutoff, dt) * (x - self.value)
+        return self.value
+
+
+class CursorSmoother:
+    """
+    Smoothing stage between the cursor source and the viewport maths.
+
+    Raw positions go through a One-Euro filter per axis, are pushed forward
+    by `prediction` seconds along the filtered velocity (capped at
+    `max_prediction` pixels) to hide capture latency, and are held still
+    while the cursor stays within `dead_zone` pixels of the last output -
+    so tremor and 1-pixel wobble produce no new frame at all.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.007, dead_zone=1.5, prediction=0.016, max_prediction=40,
+                 enabled=True):
+        self.x = OneEuroFilter(min_cutoff, beta)
+        self.y = OneEuroFilter(min_cutoff, beta)
+        self.dead_zone = dead_zone
+        self.prediction = prediction
+        self.max_prediction = max_prediction
+        self.enabled = enabled
+        self.output = None
+        self._raw = None
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(
+            min_cutoff=settings.get("cursor_min_cutoff"),
+            beta=settings.get("cursor_beta"),
+            dead_zone=settings.get("cursor_dead_zone"),
+            prediction=settings.get("cursor_prediction_ms") / 1000,
+            enabled=settings.get("cursor_smoothing")
+        )
+
+    def reset(self):
+        self.x.reset()
+        self.y.reset()
+        self.output = None
+
+    @property
+    def settled(self):
+        """True once the output has caught up with the raw cursor (within the dead zone)."""
+        if self.output is None or self._raw is None:
+            return True
+        return math.hypot(self._raw[0] - self.output[0], self._raw[1] - self.output[1]) <= self.dead_zone
+
+    def update(self, mx, my, t=None):
+        """Returns the smoothed, predicted integer cursor position."""
+        self._raw = (mx, my)
+        if not self.enabled:
+            self.output = (mx, my)
+            return self.output
+
+        t = time.monotonic() if t is None else t
+        sx, sy = self.x(mx, t), self.y(my, t)
+
+        # Lead along the filtered velocity, but never by more than max_prediction
+        lead_x, lead_y = self.x.velocity * self.prediction, self.y.velocity * self.prediction
+        lead = math.hypot(lead_x, lead_y)
+        if lead > self.max_prediction:
+            lead_x, lead_y = lead_x * self.max_prediction / lead, lead_y * self.max_prediction / lead
+        candidate = (int(round(sx + lead_x)), int(round(sy + lead_y)))
+
+        if self.output is not None and \
+                math.hypot(candidate[0] - self.output[0], candidate[1] - self.output[1]) < self.dead_zone:
+            return self.output
+        self.output = candidate
+        return self.output
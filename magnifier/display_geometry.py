@@ -0,0 +1,170 @@
+"""
+Cached virtual-desktop layout for the magnifiers.
+
+Asking the OS for the screen size every frame is a system call on the hot
+path, and a single primary-screen size is wrong as soon as a second monitor
+is attached. DisplayGeometry reads every monitor's rectangle and DPI from
+Qt once, keeps them in an immutable ScreenLayout and rebuilds it only when
+Qt reports a screen being added, removed or changing geometry/DPI.
+
+ScreenLayout itself is plain Python, so the clamping maths can be used by
+the capture thread, the benchmarks and the tests without a Qt application.
+
+Coordinates: with high-DPI scaling Qt reports each screen's origin in
+native pixels but its size in logical (device-independent) pixels. The
+cursor, the capture backends and the magnification API all work in
+physical pixels, so ScreenLayout answers lookups in physical space and
+to_logical() converts back for placing Qt windows.
+"""
+from collections import namedtuple
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class Monitor(namedtuple("Monitor", "left top width height dpi pixel_ratio")):
+    """Qt screen geometry (logical size) plus the screen's DPI and device pixel ratio."""
+
+    __slots__ = ()
+
+    @property
+    def physical(self):
+        """(left, top, width, height) in physical pixels."""
+        return (self.left, self.top,
+                int(round(self.width * self.pixel_ratio)), int(round(self.height * self.pixel_ratio)))
+
+    def physical_size(self, logical_size):
+        """Physical pixels covered by a logical (width, height) on this monitor."""
+        return tuple(int(round(v * self.pixel_ratio)) for v in logical_size)
+
+    def to_logical(self, x, y):
+        return (self.left + int(round((x - self.left) / self.pixel_ratio)),
+                self.top + int(round((y - self.top) / self.pixel_ratio)))
+
+
+class ScreenLayout:
+    """An immutable snapshot of all monitors; monitors[0] is the primary one."""
+
+    def __init__(self, monitors):
+        if not monitors:
+            monitors = [Monitor(0, 0, 1920, 1080, 96.0, 1.0)]
+        self.monitors = tuple(monitors)
+
+        rects = [m.physical for m in self.monitors]
+        left = min(r[0] for r in rects)
+        top = min(r[1] for r in rects)
+        right = max(r[0] + r[2] for r in rects)
+        bottom = max(r[1] + r[3] for r in rects)
+        self.virtual_bounds = (left, top, right - left, bottom - top)
+
+    @property
+    def primary(self):
+        return self.monitors[0]
+
+    def monitor_at(self, x, y):
+        """
+        The monitor containing the physical point (x, y), or the nearest one
+        for points in the gaps between monitors.
+        """
+        def distance(m):
+            left, top, width, height = m.physical
+            dx = max(left - x, 0, x - (left + width - 1))
+            dy = max(top - y, 0, y - (top + height - 1))
+            return dx * dx + dy * dy
+        return min(self.monitors, key=distance)
+
+    def bounds_at(self, x, y):
+        """Physical (left, top, width, height) of the monitor under (x, y), for centered_region clamping."""
+        return self.monitor_at(x, y).physical
+
+    def clamp(self, x, y):
+        """Moves a physical point onto the nearest monitor."""
+        left, top, width, height = self.bounds_at(x, y)
+        return (min(max(x, left), left + width - 1), min(max(y, top), top + height - 1))
+
+    def to_logical(self, x, y):
+        """Converts a physical point (cursor, capture) to Qt's logical coordinates."""
+        return self.monitor_at(x, y).to_logical(x, y)
+
+    def __eq__(self, other):
+        return isinstance(other, ScreenLayout) and self.monitors == other.monitors
+
+    def __repr__(self):
+        return f"ScreenLayout({list(self.monitors)})"
+
+
+class DisplayGeometry(QObject):
+    """
+    Keeps `layout` in sync with Qt's screens. Must be created on the GUI
+    thread; readers on other threads just take the current `layout`, which
+    is replaced as a whole (never mutated) when the displays change.
+    """
+
+    changed = pyqtSignal()
+
+    def __init__(self, app=None, parent=None):
+        super().__init__(parent)
+        from PyQt5.QtGui import QGuiApplication
+
+        self.app = app or QGuiApplication.instance()
+        self.refreshes = 0
+        self._screens = []
+        self.layout = None
+
+        self.app.screenAdded.connect(self._on_screens_changed)
+        self.app.screenRemoved.connect(self._on_screens_changed)
+        self.app.primaryScreenChanged.connect(self._on_screens_changed)
+        self._on_screens_changed()
+
+    def _on_screens_changed(self, *_):
+        # Reconnect per-screen notifications, since the set of screens may have changed
+        for screen in self._screens:
+            try:
+                screen.geometryChanged.disconnect(self.refresh)
+                screen.logicalDotsPerInchChanged.disconnect(self.refresh)
+            except (TypeError, RuntimeError):
+                pass    # screen already gone
+        self._screens = list(self.app.screens())
+        for screen in self._screens:
+            screen.geometryChanged.connect(self.refresh)
+            screen.logicalDotsPerInchChanged.connect(self.refresh)
+        self.refresh()
+
+    def refresh(self, *_):
+        """Re-reads every screen; emits `changed` only if the layout is different."""
+        primary = self.app.primaryScreen()
+        screens = sorted(self.app.screens(), key=lambda screen: screen is not primary)
+        monitors = []
+        for screen in screens:
+            rect = screen.geometry()
+            monitors.append(Monitor(rect.x(), rect.y(), rect.width(), rect.height(),
+                                    screen.logicalDotsPerInch(), screen.devicePixelRatio()))
+
+        layout = ScreenLayout(monitors)
+        self.refreshes += 1
+        if layout != self.layout:
+            self.layout = layout
+            self.changed.emit()
+
+    def bounds_at(self, x, y):
+        return self.layout.bounds_at(x, y)
+
+    def monitor_at(self, x, y):
+        return self.layout.monitor_at(x, y)
+
+    def stats(self):
+        return {"monitors": len(self.layout.monitors), "layout_refreshes": self.refreshes}
+
+
+def enable_high_dpi():
+    """
+    Opts the process into per-monitor high-DPI scaling with fractional
+    (125%/150%) pixel ratios. Must run before the QApplication is created.
+    """
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtGui import QGuiApplication
+
+    QGuiApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
+    QGuiApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
+    # Qt >= 5.14; older versions round the ratio to whole numbers
+    if hasattr(QGuiApplication, "setHighDpiScaleFactorRoundingPolicy"):
+        QGuiApplication.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
@@ -0,0 +1,357 @@
+import math
+import time
+import cv2
+import numpy as np
+from PyQt5.QtGui import QImage, QPixmap
+
+from magnifier.lens_shapes import lens_mask
+from magnifier.text_sharpen import TextSharpener
+
+
+class FramePipeline:
+    """
+    Turns raw BGRA screen captures into display-ready QImages without
+    allocating new arrays every frame.
+
+    Capture backends hand back BGRA bytes, which on little-endian machines is exactly the
+    memory layout of QImage.Format_RGB32, so no colour conversion is needed:
+    the capture is wrapped in place, filtered on the small pre-scale frame,
+    resized straight into a persistent destination buffer and the border is
+    drawn into that same buffer.
+
+    `interpolation` is one of INTERPOLATIONS (see SettingsManager.QUALITY_TIERS).
+    Linear scaling switches to plain pixel replication at integer and
+    half-integer zooms from REPLICATE_FROM up, where blending neighbours
+    costs time without any visible gain. "sharp_text" always scales linearly
+    and then sharpens glyph edges (magnifier.text_sharpen) into a separate
+    buffer, within the sharpener's per-frame budget.
+
+    `color_filter` is an optional compiled ColorFilter (magnifier.color_filters)
+    run on the pre-scale frame right after the invert step.
+
+    `shape` is one of lens_shapes.SHAPES. Any shape but "rectangle" replaces
+    the drawn border with a cached, antialiased lens mask composited into a
+    separate buffer, which is premultiplied BGRA (see to_qimage(alpha=True)).
+
+    If a FrameStats is attached, the filter, convert and resize stages are timed
+    (sharpening is part of resize and is also timed on its own).
+    """
+
+    MAX_BUFFERS = 8
+    INTERPOLATIONS = {"nearest": cv2.INTER_NEAREST, "linear": cv2.INTER_LINEAR, "cubic": cv2.INTER_CUBIC,
+                      "sharp_text": cv2.INTER_LINEAR}
+    REPLICATE_FROM = 4.0
+
+    def __init__(self, border_color=(0, 255, 0, 255), border_thickness=2, stats=None, interpolation="linear",
+                 color_filter=None, shape="rectangle"):
+        self.border_color = border_color
+        self.border_thickness = border_thickness
+        self.stats = stats
+        self.interpolation = interpolation
+        self.color_filter = color_filter
+        self.shape = shape
+        # Target size -> composited output for shaped lenses
+        self._shaped = {}
+        # Target size -> sharpened output, and the unsharpened buffer it is in sync with
+        self.sharpener = TextSharpener()
+        self._sharpened = {}
+        self._sharpened_from = {}
+        # (capture size, target size) -> preallocated BGRA output buffer
+        self._buffers = {}
+        # (capture size, target size) -> nearest-neighbour source indices per output row/column
+        self._nearest_maps = {}
+
+    def buffer_for(self, capture_size, target_size):
+        """Returns the persistent output buffer for a capture/target size pair."""
+        key = (tuple(capture_size), tuple(target_size))
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            if len(self._buffers) >= self.MAX_BUFFERS:
+                # Drop the oldest entry so zoom scrubbing can't grow memory forever
+                self._buffers.pop(next(iter(self._buffers)))
+            target_w, target_h = target_size
+            buffer = np.empty((target_h, target_w, 4), dtype=np.uint8)
+            self._buffers[key] = buffer
+        return buffer
+
+    def interpolation_for(self, capture_size, target_size):
+        """Returns the cv2 interpolation flag for scaling a capture to the target size."""
+        flag = self.INTERPOLATIONS.get(self.interpolation, cv2.INTER_LINEAR)
+        if flag != cv2.INTER_LINEAR or self.interpolation == "sharp_text":
+            return flag
+
+        # Captures are int(target / zoom) wide, so allow up to one source pixel of slack
+        width, height = capture_size
+        target_w, target_h = target_size
+        zoom = round(min(target_w / width, target_h / height) * 2) / 2
+        if (zoom >= self.REPLICATE_FROM
+                and abs(target_w - zoom * width) < zoom and abs(target_h - zoom * height) < zoom):
+            return cv2.INTER_NEAREST
+        return flag
+
+    def painter_scaling(self, capture_size, target_size):
+        """
+        For the painter presentation path (magnifier.painter_view): whether
+        QPainter should scale this capture smoothly, or None when the frame
+        needs the cv2 path (cubic and sharp-text scaling and lens shapes are
+        output-space work Qt can't reproduce).
+        """
+        if self.interpolation not in ("nearest", "linear") or self.shape != "rectangle":
+            return None
+        return self.interpolation_for(capture_size, target_size) != cv2.INTER_NEAREST
+
+    def _nearest_map(self, capture_size, target_size):
+        """Source column/row for every output pixel, matching cv2.resize(INTER_NEAREST)."""
+        key = (tuple(capture_size), tuple(target_size))
+        maps = self._nearest_maps.get(key)
+        if maps is None:
+            if len(self._nearest_maps) >= self.MAX_BUFFERS:
+                self._nearest_maps.pop(next(iter(self._nearest_maps)))
+            (width, height), (target_w, target_h) = capture_size, target_size
+            xs = np.minimum(np.floor(np.arange(target_w) * (width / target_w)).astype(np.intp), width - 1)
+            ys = np.minimum(np.floor(np.arange(target_h) * (height / target_h)).astype(np.intp), height - 1)
+            maps = self._nearest_maps[key] = (xs, ys)
+        return maps
+
+    @staticmethod
+    def wrap(raw, width, height):
+        """Views a raw BGRA byte buffer as an (h, w, 4) array without copying."""
+        return np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4)
+
+    def prepare(self, frame, invert=False):
+        """Applies the pre-scale filters to a (possibly partial) BGRA frame."""
+        if not frame.flags.writeable:
+            frame = frame.copy()
+
+        # Work on the small capture: far fewer pixels than the magnified output
+        started = time.perf_counter()
+        if invert:
+            cv2.bitwise_not(frame, dst=frame)
+        if self.color_filter is not None:
+            self.color_filter.apply(frame)
+        if self.stats:
+            self.stats.record("filter", started)
+            started = time.perf_counter()
+
+        # RGB32 expects an opaque alpha byte; captures may leave it at 0
+        frame[..., 3] = 255
+        if self.stats:
+            self.stats.record("convert", started)
+        return frame
+
+    def _finish(self, output):
+        """
+        Draws the border, or composites the lens mask for shaped lenses. The
+        mask goes into its own buffer: `output` must stay unmasked because
+        partial renders only rewrite its dirty part.
+        """
+        target_h, target_w = output.shape[:2]
+        if self.shape != "rectangle":
+            mask = lens_mask(self.shape, (target_w, target_h), self.border_thickness, tuple(self.border_color))
+            shaped = self._shaped.get((target_w, target_h))
+            if shaped is None:
+                if len(self._shaped) >= self.MAX_BUFFERS:
+                    self._shaped.pop(next(iter(self._shaped)))
+                shaped = self._shaped[(target_w, target_h)] = np.empty_like(output)
+            return mask.composite(output, shaped)
+
+        if self.border_thickness:
+            cv2.rectangle(output, (0, 0), (target_w - 1, target_h - 1),
+                          self.border_color, self.border_thickness)
+        return output
+
+    def _sharpen(self, output, capture_size, rect=None):
+        """
+        Sharp-text tier: sharpens the re-rendered `rect` of `output` into a
+        separate buffer (`output` must stay unsharpened, partial renders read
+        around their dirty part). Frames over the sharpener's budget keep the
+        plain linear result.
+        """
+        if self.interpolation != "sharp_text":
+            return output
+        target_h, target_w = output.shape[:2]
+        key = (target_w, target_h)
+        if self._sharpened_from.get(key) is not output:
+            rect = None
+        x0, y0, x1, y1 = rect or (0, 0, target_w, target_h)
+        if not self.sharpener.admit((x1 - x0) * (y1 - y0)):
+            # The sharpened buffer misses this frame; the next sharpened one redoes it all
+            self._sharpened_from.pop(key, None)
+            return output
+
+        sharpened = self._sharpened.get(key)
+        if sharpened is None:
+            if len(self._sharpened) >= self.MAX_BUFFERS:
+                evicted = next(iter(self._sharpened))
+                self._sharpened.pop(evicted)
+                self._sharpened_from.pop(evicted, None)
+            sharpened = self._sharpened[key] = np.empty_like(output)
+        started = time.perf_counter()
+        self.sharpener.sharpen(output, sharpened, target_w / capture_size[0], rect)
+        self._sharpened_from[key] = output
+        if self.stats:
+            self.stats.record("sharpen", started)
+        return sharpened
+
+    def sharpen_image(self, image, scale):
+        """Sharpened copy of a whole upscaled image (cached zoom levels), regardless of budget."""
+        if self.interpolation != "sharp_text":
+            return image
+        return self.sharpener.sharpen(image, np.empty_like(image), scale)
+
+    def render(self, frame, target_size, invert=False):
+        """Filters and scales a BGRA frame into the reused buffer and returns it."""
+        height, width = frame.shape[:2]
+        output = self.buffer_for((width, height), target_size)
+
+        frame = self.prepare(frame, invert)
+        started = time.perf_counter()
+        cv2.resize(frame, tuple(target_size), dst=output,
+                   interpolation=self.interpolation_for((width, height), target_size))
+
+        output = self._sharpen(output, (width, height))
+        output = self._finish(output)
+        if self.stats:
+            self.stats.record("resize", started)
+        return output
+
+    def render_source(self, frame, invert=False):
+        """
+        Painter path: filters a copy of the frame into a reused capture-sized
+        buffer and leaves the scaling to QPainter (see painter_scaling).
+        """
+        height, width = frame.shape[:2]
+        output = self.buffer_for((width, height), (width, height))
+        np.copyto(output, frame)
+        return self.prepare(output, invert)
+
+    def render_region(self, frame, target_size, rect, invert=False):
+        """
+        Re-renders only the part of the output covered by a dirty source
+        rectangle (x0, y0, x1, y1), leaving the rest of the reused buffer as is.
+        """
+        height, width = frame.shape[:2]
+        target_w, target_h = target_size
+        x0, y0, x1, y1 = rect
+        if (x1 - x0) * (y1 - y0) * 2 > width * height:
+            # Mostly dirty: a plain full resize is cheaper than the ROI warp
+            return self.render(frame, target_size, invert)
+
+        output = self.buffer_for((width, height), target_size)
+        interpolation = self.interpolation_for((width, height), target_size)
+        if not frame.flags.writeable:
+            frame = frame.copy()
+
+        if interpolation == cv2.INTER_NEAREST:
+            # Each output pixel copies exactly one source pixel: update the
+            # output rows/columns that map into the dirty rectangle
+            self.prepare(frame[y0:y1, x0:x1], invert)
+            xs, ys = self._nearest_map((width, height), target_size)
+            ox0, ox1 = np.searchsorted(xs, x0), np.searchsorted(xs, x1)
+            oy0, oy1 = np.searchsorted(ys, y0), np.searchsorted(ys, y1)
+            started = time.perf_counter()
+            output[oy0:oy1, ox0:ox1] = frame[ys[oy0:oy1, None], xs[None, ox0:ox1]]
+
+            output = self._finish(output)
+            if self.stats:
+                self.stats.record("resize", started)
+            return output
+
+        # Linear interpolation reads one neighbouring source pixel on each side, cubic two;
+        # filter a wider source border so every pixel the taps touch is prepared
+        reach = 2 if interpolation == cv2.INTER_CUBIC else 1
+        sx0, sy0 = max(0, x0 - 2 * reach), max(0, y0 - 2 * reach)
+        sx1, sy1 = min(width, x1 + 2 * reach), min(height, y1 + 2 * reach)
+        self.prepare(frame[sy0:sy1, sx0:sx1], invert)
+
+        scale_x, scale_y = target_w / width, target_h / height
+        ox0, oy0 = max(0, int((x0 - reach) * scale_x)), max(0, int((y0 - reach) * scale_y))
+        ox1 = min(target_w, int(math.ceil((x1 + reach) * scale_x)))
+        oy1 = min(target_h, int(math.ceil((y1 + reach) * scale_y)))
+
+        # Same pixel-centre mapping cv2.resize uses, shifted to the output ROI
+        transform = np.float32([
+            [scale_x, 0, 0.5 * scale_x - 0.5 - ox0],
+            [0, scale_y, 0.5 * scale_y - 0.5 - oy0]
+        ])
+        started = time.perf_counter()
+        cv2.warpAffine(frame, transform, (ox1 - ox0, oy1 - oy0), dst=output[oy0:oy1, ox0:ox1],
+                       flags=interpolation, borderMode=cv2.BORDER_REPLICATE)
+
+        output = self._sharpen(output, (width, height), (ox0, oy0, ox1, oy1))
+        output = self._finish(output)
+        if self.stats:
+            self.stats.record("resize", started)
+        return output
+
+    def render_zoomed(self, frame, target_size, scale, center):
+        """
+        Scales an already prepared frame by `scale` around `center` (frame
+        coordinates) into the reused buffer, keeping the view inside the frame.
+        Used for zoom transitions, where the scale changes every frame.
+        """
+        height, width = frame.shape[:2]
+        target_w, target_h = target_size
+        output = self.buffer_for((width, height), target_size)
+
+        cx, cy = center
+        half_w, half_h = target_w / (2 * scale), target_h / (2 * scale)
+        cx = min(max(cx, half_w), width - half_w) if width > 2 * half_w else width / 2
+        cy = min(max(cy, half_h), height - half_h) if height > 2 * half_h else height / 2
+
+        # The view is centred on the middle of the cursor pixel, like centered_region
+        transform = np.float32([
+            [scale, 0, target_w / 2 - scale * cx - 0.5],
+            [0, scale, target_h / 2 - scale * cy - 0.5]
+        ])
+        started = time.perf_counter()
+        cv2.warpAffine(frame, transform, (target_w, target_h), dst=output,
+                       flags=self.INTERPOLATIONS.get(self.interpolation, cv2.INTER_LINEAR),
+                       borderMode=cv2.BORDER_REPLICATE)
+
+        output = self._finish(output)
+        if self.stats:
+            self.stats.record("resize", started)
+        return output
+
+    def render_crop(self, image, target_size, offset):
+        """
+        Copies a target-sized window of an already scaled image (a zoom
+        pyramid level) into the reused buffer - a blit instead of a resize.
+        """
+        height, width = image.shape[:2]
+        target_w, target_h = target_size
+        output = self.buffer_for((width, height), target_size)
+        x, y = offset
+        started = time.perf_counter()
+        np.copyto(output, image[y:y + target_h, x:x + target_w])
+
+        output = self._finish(output)
+        if self.stats:
+            self.stats.record("resize", started)
+        return output
+
+    @staticmethod
+    def to_qimage(buffer, alpha=False):
+        """
+        Wraps a BGRA buffer as a QImage sharing its memory (no copy); `alpha`
+        for premultiplied shaped-lens output.
+        """
+        height, width = buffer.shape[:2]
+        image_format = QImage.Format_ARGB32_Premultiplied if alpha else QImage.Format_RGB32
+        return QImage(buffer.data, width, height, buffer.strides[0], image_format)
+
+    @classmethod
+    def to_pixmap(cls, buffer, pixel_ratio=1.0, alpha=False):
+        """
+        QPixmap for a physical-pixel buffer, tagged with the screen's device
+        pixel ratio so Qt draws it 1:1 instead of scaling it a second time.
+        """
+        pixmap = QPixmap.fromImage(cls.to_qimage(buffer, alpha))
+        pixmap.setDevicePixelRatio(pixel_ratio)
+        return pixmap
+
+    def process(self, raw, width, height, target_size, invert=False):
+        """Full pipeline: raw captured bytes in, QImage over a persistent buffer out."""
+        frame = self.wrap(raw, width, height)
+        return self.to_qimage(self.render(frame, target_size, invert))
@@ -0,0 +1,118 @@
+import time
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+class FramePacer:
+    """
+    Decides how often a magnifier should produce frames: the target rate
+    while the view is changing, a low idle rate once the cursor and the
+    captured pixels have stayed the same for `idle_delay` seconds.
+
+    Shared by the GUI-thread AdaptiveFrameScheduler and the background
+    CaptureWorker so both follow the same idle policy.
+    """
+
+    def __init__(self, target_fps=60, idle_fps=10, idle_delay=0.5):
+        self.idle_delay = idle_delay
+        self.idle = False
+        self._last_change = time.monotonic()
+        self.set_rates(target_fps, idle_fps)
+
+    def set_rates(self, target_fps, idle_fps):
+        """Updates the active and idle frame rates (frames per second)."""
+        target_fps = max(1, float(target_fps))
+        idle_fps = max(0.5, min(float(idle_fps), target_fps))
+        self.target_interval = int(1000 / target_fps)
+        self.idle_interval = int(1000 / idle_fps)
+
+    @property
+    def interval(self):
+        """Current frame interval in milliseconds."""
+        return self.idle_interval if self.idle else self.target_interval
+
+    def wake(self):
+        """Back to the full rate. Returns True if the pacer was idle."""
+        self._last_change = time.monotonic()
+        was_idle = self.idle
+        self.idle = False
+        return was_idle
+
+    def report(self, changed):
+        """Feeds the outcome of one frame back in. Returns True if the interval changed."""
+        now = time.monotonic()
+        if changed:
+            self._last_change = now
+            if self.idle:
+                self.idle = False
+                return True
+        elif not self.idle and now - self._last_change >= self.idle_delay:
+            self.idle = True
+            return True
+        return False
+
+
+class AdaptiveFrameScheduler(QObject):
+    """
+    Drives a magnifier's frame callback from a QTimer paced by a FramePacer.
+
+    The callback returns True when something changed this frame (cursor moved,
+    zoom changed, source pixels differ). Any change, or an explicit wake(),
+    switches back to the full rate straight away. wake() is safe to call from
+    the stdin listener and hotkey threads.
+    """
+    wake_signal = pyqtSignal()
+
+    def __init__(self, callback, target_fps=60, idle_fps=10, idle_delay=0.5, parent=None):
+        super().__init__(parent)
+        self.callback = callback
+        self.pacer = FramePacer(target_fps, idle_fps, idle_delay)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._tick)
+        self.wake_signal.connect(self._wake)
+
+    @property
+    def idle(self):
+        return self.pacer.idle
+
+    @property
+    def target_interval(self):
+        return self.pacer.target_interval
+
+    @property
+    def idle_interval(self):
+        return self.pacer.idle_interval
+
+    @property
+    def interval(self):
+        return self.timer.interval()
+
+    def set_rates(self, target_fps, idle_fps):
+        """Updates the active and idle frame rates (frames per second)."""
+        self.pacer.set_rates(target_fps, idle_fps)
+        if self.timer.isActive():
+            self.timer.setInterval(self.pacer.interval)
+
+    def start(self):
+        self.pacer.wake()
+        self.timer.start(self.pacer.interval)
+
+    def stop(self):
+        self.timer.stop()
+
+    def wake(self):
+        """Returns to the full frame rate immediately (e.g. after a zoom command)."""
+        # Queued onto the GUI thread when called from a worker thread
+        self.wake_signal.emit()
+
+    def _wake(self):
+        if self.pacer.wake() and self.timer.isActive():
+            self.timer.start(self.pacer.interval)
+
+    def report(self, changed):
+        """Feeds the outcome of one frame back into the rate decision."""
+        if self.pacer.report(changed):
+            self.timer.setInterval(self.pacer.interval)
+
+    def _tick(self):
+        self.report(bool(self.callback()))
@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import deque
+
+
+class FrameStats:
+    """
+    Always-on, low-overhead per-stage frame timing.
+
+    Each stage keeps a rolling window of its most recent durations; the
+    percentiles are only computed when someone asks for a snapshot (the
+    `stats` control command), so the per-frame cost is a perf_counter()
+    call and a deque append.
+    """
+
+    STAGES = ("cursor", "capture", "detect", "convert", "filter", "resize", "present")
+
+    def __init__(self, window=600):
+        self._lock = threading.Lock()
+        self._samples = {stage: deque(maxlen=window) for stage in self.STAGES}
+        self._frame_times = deque(maxlen=window)
+        self.frames = 0
+        self.late = 0
+
+    def record(self, stage, started):
+        """Records the time since `started` (a perf_counter() value) for a stage."""
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self._frame_times.maxlen)
+            samples.append(elapsed)
+        return elapsed
+
+    def frame_done(self, started, budget=None):
+        """Records a whole frame; frames over `budget` seconds count as late."""
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._frame_times.append(elapsed)
+            self.frames += 1
+            if budget is not None and elapsed > budget:
+                self.late += 1
+        return elapsed
+
+    @staticmethod
+    def percentiles(samples):
+        """Returns p50/p95/p99 (in milliseconds) of a list of durations in seconds."""
+        if not samples:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "count": 0}
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+
+        def pick(q):
+            return round(ordered[min(last, int(q * last + 0.5))] * 1000, 3)
+
+        return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "count": len(ordered)}
+
+    def snapshot(self):
+        """Returns the current statistics as a JSON-serialisable dict."""
+        with self._lock:
+            stages = {name: list(samples) for name, samples in self._samples.items()}
+            frame_times = list(self._frame_times)
+            counts = {"frames": self.frames, "late": self.late}
+
+        return {
+            "stages_ms": {name: self.percentiles(samples) for name, samples in stages.items() if samples},
+            "frame_ms": self.percentiles(frame_times),
+            **counts
+        }
@@ -0,0 +1,88 @@
+import threading
+import time
+import numpy as np
+
+
+class FreezeFrame:
+    """
+    Freeze-frame mode: serves every pan and zoom from one in-memory snapshot.
+
+    While frozen, the whole capture area is grabbed once and each frame is
+    cropped out of that snapshot instead of being captured live, so reading
+    a static page costs almost nothing. Every `check_interval` seconds the
+    visible region is grabbed live and compared against the snapshot; if the
+    screen has changed underneath, the snapshot is retaken.
+
+    toggle() may be called from any thread (hotkeys, stdin); the snapshot
+    itself is taken lazily on the capture thread that owns the backend.
+    """
+
+    def __init__(self, check_interval=1.0):
+        self.check_interval = check_interval
+        self.active = False
+
+        self._lock = threading.Lock()
+        self._frame = None      # full-area snapshot as an (h, w, 4) array
+        self._origin = (0, 0)
+        self._bounds = None
+        self._checked_at = 0.0
+        self._crop = None
+
+        self.snapshots = 0
+        self.refreshes = 0
+
+    def toggle(self):
+        """Freezes or unfreezes; returns the new state."""
+        with self._lock:
+            self.active = not self.active
+            self._frame = None
+            return self.active
+
+    def _snapshot(self, capture, bounds):
+        left, top, width, height = bounds
+        pixels = capture.grab({"left": left, "top": top, "width": width, "height": height}).array()
+        self._frame = np.array(pixels)
+        self._origin = (left, top)
+        self._bounds = tuple(bounds)
+        self._checked_at = time.monotonic()
+        self.snapshots += 1
+
+    def _view(self, view):
+        x0 = view["left"] - self._origin[0]
+        y0 = view["top"] - self._origin[1]
+        return self._frame[y0:y0 + view["height"], x0:x0 + view["width"]]
+
+    def _ensure_snapshot(self, capture, view, bounds):
+        if self._frame is None or tuple(bounds) != self._bounds:
+            # First frame, or the cursor moved onto another monitor
+            self._snapshot(capture, bounds)
+        elif time.monotonic() - self._checked_at >= self.check_interval:
+            # Cheap staleness check: only the part the user is looking at
+            self._checked_at = time.monotonic()
+            live = capture.grab(view).array()
+            if not np.array_equal(live, self._view(view)):
+                self._snapshot(capture, bounds)
+                self.refreshes += 1
+
+    def snapshot(self, capture, view, bounds):
+        """
+        Returns (pixels, origin, version) of the current snapshot, taking or
+        refreshing it first if needed. `version` changes whenever the pixels
+        do; the array must be treated as read-only.
+        """
+        with self._lock:
+            self._ensure_snapshot(capture, view, bounds)
+            return self._frame, self._origin, self.snapshots
+
+    def frame_for(self, capture, view, bounds):
+        """Returns the `view` rectangle of the snapshot as a frame that is safe to filter in place."""
+        with self._lock:
+            self._ensure_snapshot(capture, view, bounds)
+            crop = self._view(view)
+            if self._crop is None or self._crop.shape != crop.shape:
+                self._crop = np.empty_like(crop)
+            np.copyto(self._crop, crop)
+            return self._crop
+
+    def stats(self):
+        return {"active": self.active, "snapshots": self.snapshots, "refreshes": self.refreshes}
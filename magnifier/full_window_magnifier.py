@@ -1,160 +1,193 @@
 import sys
-import ctypes
-from ctypes import c_float, c_int
-import threading
 import time
-import keyboard
 
-from PyQt5.QtWidgets import QApplication, QWidget, QMenu, QAction, QSystemTrayIcon
+from PyQt5.QtWidgets import QApplication, QWidget
 from PyQt5.QtCore import QTimer, Qt, pyqtSignal
-from PyQt5.QtGui import QIcon
 
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from settings.settings import SettingsManager
-
-class POINT(ctypes.Structure):
-    _fields_ = [("x", ctypes.c_long), ("y", ctypes.c_long)]
-
-# Windows API setup for Magnification
-mag = ctypes.windll.Magnification
-user32 = ctypes.windll.user32
+from magnifier.frame_scheduler import AdaptiveFrameScheduler
+from magnifier.frame_stats import FrameStats
+from magnifier.color_filters import filter_from_settings
+from magnifier.magnification import FullscreenView, WindowsMagnification
+from magnifier.display_geometry import DisplayGeometry
+from magnifier.cursor_filter import CursorSmoother
+from magnifier.zoom_transition import ZoomTransition
 
 class FullWindowMagnifier(QWidget):
     """
     A full screen magnifier that uses the native Windows Magnification API.
     It provides 60FPS fluid zooming on the whole desktop natively.
+
+    Updates are driven by cursor-move notifications from the backend (a
+    low-level mouse hook on Windows), coalesced to at most one per frame, and
+    the OS transform is only pushed when scale or offset actually change.
+    Backends without move notifications fall back to an adaptive poll.
+
+    Tray icon, hotkeys and control commands live in MagnifierEngine, which
+    switches to and from this mode with activate()/deactivate().
     """
     exit_signal = pyqtSignal()
+    cursor_moved = pyqtSignal(int, int)
+    refresh_requested = pyqtSignal()
 
-    def __init__(self):
+    def __init__(self, backend=None, settings=None):
         super().__init__()
-        self.settings_manager = SettingsManager()
+        self.settings_manager = settings or SettingsManager()
         self.scale_factor = self.settings_manager.get("default_zoom")
         self.zoom_increment = 0.5 # Fixed step
         self.running = True
+        self.active = True
 
         # Initialize the native Windows magnifier engine
-        if not mag.MagInitialize():
-            print("Failed to initialize Magnification API")
-            sys.exit(1)
-
-        mag.MagSetFullscreenTransform.argtypes = [c_float, c_int, c_int]
-
-        # Get total screen dimensions from Windows API
-        self.screen_w = user32.GetSystemMetrics(0)
-        self.screen_h = user32.GetSystemMetrics(1)
+        self.backend = backend or WindowsMagnification()
+        if not self.backend.initialize():
+            raise RuntimeError("Failed to initialize Magnification API")
+        # Monitor layout is cached and only re-read when Qt reports display changes
+        self.geometry = DisplayGeometry(parent=self)
+        self.view = FullscreenView(self.backend, self.geometry)
 
         # Make the PyQt window invisible but able to intercept global hotkeys if focused
         self.setWindowFlags(self.windowFlags() | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setWindowOpacity(0.0)
 
-        # Timer loops to update the viewport based on mouse position
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_magnifier)
-        # Update every 16ms for ~60 fps
-        self.timer.start(16)
-
-        self.create_context_menu()
-        self.tray_icon = QSystemTrayIcon(self)
-        
-        # Load the tray icon
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        icon_path = os.path.join(base_dir, "Images", "Dark themed Logo.jpeg")
-        self.tray_icon.setIcon(QIcon(icon_path) if os.path.exists(icon_path) else QIcon())
-        self.tray_icon.setContextMenu(self.tray_menu)
-        self.tray_icon.show()
-
-        # Listen for std input commands in the background
-        threading.Thread(target=self.listen_commands, daemon=True).start()
-        
-        # Global Hotkeys (Suppressed to prevent passing to underlying apps like Chrome)
-        keyboard.add_hotkey('ctrl+plus', self.zoom_in, suppress=True)
-        keyboard.add_hotkey('ctrl+=', self.zoom_in, suppress=True)
-        keyboard.add_hotkey('ctrl+add', self.zoom_in, suppress=True)
-        keyboard.add_hotkey('ctrl+-', self.zoom_out, suppress=True)
-        keyboard.add_hotkey('ctrl+subtract', self.zoom_out, suppress=True)
-
-    def create_context_menu(self):
-        """Builds the system tray menu actions."""
-        self.tray_menu = QMenu(self)
-        self.zoom_in_action = QAction("Zoom In (Ctrl+Up / Ctrl++)", self)
-        self.zoom_out_action = QAction("Zoom Out (Ctrl+Down / Ctrl+-)", self)
-        self.reset_action = QAction("Reset View (Esc)", self)
-        self.exit_action = QAction("Exit", self)
-
-        self.zoom_in_action.triggered.connect(self.zoom_in)
-        self.zoom_out_action.triggered.connect(self.zoom_out)
-        self.reset_action.triggered.connect(self.reset_zoom)
-        self.exit_action.triggered.connect(self.emit_exit)
-
-        self.tray_menu.addAction(self.zoom_in_action)
-        self.tray_menu.addAction(self.zoom_out_action)
-        self.tray_menu.addAction(self.reset_action)
-        self.tray_menu.addSeparator()
-        self.tray_menu.addAction(self.exit_action)
-
-    def listen_commands(self):
-        """Listens for standard input commands from external processes."""
-        while self.running:
-            try:
-                command = sys.stdin.readline().strip()
-                if command == "zoom_in":
-                    self.zoom_in()
-                elif command == "zoom_out":
-                    self.zoom_out()
-                elif command == "exit":
-                    self.emit_exit()
-                elif command == "reset":
-                    self.reset_zoom()
-            except Exception:
-                break
+        self.stats = FrameStats()
+        self.smoother = CursorSmoother.from_settings(self.settings_manager)
+        self.zoom = ZoomTransition(self.scale_factor, self.settings_manager.get("zoom_animation_ms") / 1000)
+        self.target_interval = 1000 / self.settings_manager.get("magnifier_target_fps")
+        self._cursor = self.backend.cursor_pos()
+        self._last_update = 0.0
+        self._update_pending = False
+        self.cursor_moved.connect(self.on_cursor_moved)
+        self.refresh_requested.connect(self.schedule_update)
+
+        # Cursor moves (delivered on the GUI thread) schedule the next update;
+        # without move notifications a scheduler polls, slowing to the idle
+        # rate while the cursor and zoom stay put
+        self.scheduler = None
+        self.watching = self.backend.watch_cursor(self.cursor_moved.emit)
+        if not self.watching:
+            self.scheduler = AdaptiveFrameScheduler(
+                self.poll_magnifier,
+                target_fps=self.settings_manager.get("magnifier_target_fps"),
+                idle_fps=self.settings_manager.get("magnifier_idle_fps"),
+                parent=self
+            )
+            self.scheduler.start()
+        self.geometry.changed.connect(self.request_update)
+        self.update_magnifier()
 
-    def get_mouse_pos(self):
-        """Retrieve actual mouse coordinates quickly via ctypes."""
-        pt = POINT()
-        user32.GetCursorPos(ctypes.byref(pt))
-        return pt.x, pt.y
+    def activate(self):
+        """Magnifies the desktop again after deactivate(), at the zoom it was left at."""
+        self.active = True
+        if self.scheduler:
+            self.scheduler.start()
+        elif not self.watching:
+            # The engine activates a mode right after creating it, with the hook already in place
+            self.watching = self.backend.watch_cursor(self.cursor_moved.emit)
+        self._cursor = self.get_mouse_pos()
+        self.view.reset()
+        self.show()
+        self.update_magnifier()
 
-    def update_magnifier(self):
-        """Updates the system-wide magnification viewport."""
-        if self.scale_factor <= 1.0:
-            # When zoom is default, ensure zero offset to eliminate visual glitches
-            mag.MagSetFullscreenTransform(1.0, 0, 0)
-            return
+    def deactivate(self):
+        """Restores the unmagnified desktop; the Magnification API context stays open for a quick return."""
+        self.active = False
+        if self.scheduler:
+            self.scheduler.stop()
+        else:
+            self.backend.unwatch_cursor()
+            self.watching = False
+        self.backend.set_transform(1.0, 0, 0)
+        self.backend.set_color_effect(FullscreenView.IDENTITY_EFFECT)
+        self.view.reset()
+        self.hide()
+
+    def get_mouse_pos(self):
+        """Retrieve actual mouse coordinates quickly from the backend."""
+        return self.backend.cursor_pos()
 
-        mx, my = self.get_mouse_pos()
+    def on_cursor_moved(self, x, y):
+        """Runs on the GUI thread for every cursor-move notification."""
+        self._cursor = (x, y)
+        self.schedule_update()
 
-        
-        view_w = self.screen_w / self.scale_factor
-        view_h = self.screen_h / self.scale_factor
+    def schedule_update(self):
+        """Coalesces move/zoom notifications into at most one update per frame interval."""
+        if self._update_pending:
+            return
+        self._update_pending = True
+        elapsed = (time.perf_counter() - self._last_update) * 1000
+        QTimer.singleShot(max(0, int(self.target_interval - elapsed)), self._run_pending_update)
 
-        # Map current mouse coordinates into a panning offset
-        offset_x = 0
-        if self.screen_w > view_w:
-            offset_x = int((mx / self.screen_w) * (self.screen_w - view_w))
+    def _run_pending_update(self):
+        self._update_pending = False
+        self.update_magnifier()
 
-        offset_y = 0
-        if self.screen_h > view_h:
-            offset_y = int((my / self.screen_h) * (self.screen_h - view_h))
+    def poll_magnifier(self):
+        """Scheduler callback when the backend can't notify about cursor moves."""
+        self._cursor = self.get_mouse_pos()
+        return self.update_magnifier()
 
-        # Apply the Windows OS hardware transform
-        mag.MagSetFullscreenTransform(self.scale_factor, offset_x, offset_y)
+    def update_magnifier(self):
+        """Updates the system-wide magnification viewport. Returns True if the view changed."""
+        if not self.active:
+            return False
+        frame_start = time.perf_counter()
+        self._last_update = frame_start
+        mx, my = self.smoother.update(*self._cursor)
+        self.stats.record("cursor", frame_start)
+
+        # Gamma curves can't be expressed as an OS colour matrix, so they are left out here
+        self.view.set_color_filter(filter_from_settings(self.settings_manager, curves=False))
+
+        # Map the cursor into a panning offset; the OS transform is only pushed on change
+        started = time.perf_counter()
+        changed = self.view.update(self.zoom.follow(self.scale_factor), mx, my)
+        if changed:
+            self.stats.record("present", started)
+            self.stats.frame_done(frame_start, self.target_interval / 1000)
+
+        # No more move events come once the cursor stops, so keep going until the
+        # smoothed view has caught up and any zoom animation has finished
+        if self.scheduler is None and (not self.smoother.settled or self.zoom.active):
+            self.schedule_update()
+        return changed
+
+    def frame_stats(self):
+        """Per-stage timings plus transform push/skip counts for the `stats` command."""
+        stats = self.stats.snapshot()
+        stats["dropped"] = 0
+        stats["idle"] = self.scheduler.idle if self.scheduler else not self._update_pending
+        stats["event_driven"] = self.scheduler is None
+        stats.update(self.view.stats())
+        stats.update(self.geometry.stats())
+        return stats
+
+    def request_update(self):
+        """Thread-safe: hotkeys and stdin commands land here off the GUI thread."""
+        if self.scheduler:
+            self.scheduler.wake()
+        else:
+            self.refresh_requested.emit()
 
     def zoom_in(self):
         """Increase the scale factor, cap at 5x."""
         self.scale_factor = min(self.scale_factor + self.zoom_increment, 5.0)
+        self.request_update()
 
     def zoom_out(self):
         """Decrease the scale factor, lowest is 1.0x (normal screen)."""
         self.scale_factor = max(1.0, self.scale_factor - self.zoom_increment)
+        self.request_update()
 
     def reset_zoom(self):
         """Restores the screen back to normal immediately."""
         self.scale_factor = 1.0
-        self.update_magnifier()
+        self.request_update()
 
     def keyPressEvent(self, event):
         """Handle PyQt window key events if it has focus."""
@@ -170,8 +203,12 @@ class FullWindowMagnifier(QWidget):
 
     def uninitialize_mag(self):
         """Properly clean up the Magnification API context to stop zoom."""
-        mag.MagSetFullscreenTransform(1.0, 0, 0)
-        mag.MagUninitialize()
+        if self.scheduler:
+            self.scheduler.stop()
+        self.backend.set_transform(1.0, 0, 0)
+        self.backend.set_color_effect(FullscreenView.IDENTITY_EFFECT)
+        self.view.reset()
+        self.backend.uninitialize()
 
     def emit_exit(self):
         """Safely exit application and notify."""
@@ -187,8 +224,5 @@ class FullWindowMagnifier(QWidget):
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    magnifier = FullWindowMagnifier()
-    magnifier.show()
-    magnifier.exit_signal.connect(app.quit)
-    sys.exit(app.exec_())
+    from magnifier.magnifier_engine import main
+    sys.exit(main(["--mode", "fullscreen"]))
@@ -1,163 +1,444 @@
 import cv2
 import sys
 import numpy as np
-import pyautogui
-import mss
-from PyQt5.QtWidgets import QApplication, QLabel, QWidget, QMenu, QAction, QSystemTrayIcon
+from PyQt5.QtWidgets import QApplication, QLabel, QWidget
 from PyQt5.QtCore import QTimer, Qt, pyqtSignal
-from PyQt5.QtGui import QImage, QPixmap, QIcon
-import threading
+from PyQt5.QtGui import QImage, QPixmap
+import time
 import os
-import keyboard
 import ctypes
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from settings.settings import SettingsManager
+from capture.backends import create_capture_backend
+from magnifier.frame_pipeline import FramePipeline
+from magnifier.capture_worker import CaptureWorker, idle_render
+from magnifier.frame_stats import FrameStats
+from magnifier.viewport import centered_region
+from magnifier.change_detector import TileChangeDetector
+from magnifier.freeze_frame import FreezeFrame
+from magnifier.color_filters import filter_from_settings
+from magnifier.cursor_filter import CursorSmoother, system_cursor_position
+from magnifier.zoom_transition import ZoomTransition
+from magnifier.crop_panner import CropPanner
+from magnifier.zoom_pyramid import ZoomPyramid
+from magnifier.window_mover import WindowMover
+from magnifier.display_geometry import DisplayGeometry
+from magnifier.multi_lens import PinnedLens, LensBatch
+from magnifier.quality_governor import QualityGovernor, Knobs
+from magnifier.painter_view import PainterFrameView
+
+
+def exclude_from_capture(widget):
+    """Excludes a window from screen captures to prevent the "infinity mirror" effect."""
+    try:
+        hwnd = int(widget.winId())
+        ctypes.windll.user32.SetWindowDisplayAffinity(hwnd, 0x00000011) # WDA_EXCLUDEFROMCAPTURE
+    except Exception as e:
+        print("Could not exclude window from capture:", e)
 
 
 class ScreenMagnifier(QWidget):
+    """
+    Hover presentation: a lens window that follows the cursor.
+
+    Tray icon, hotkeys and control commands live in MagnifierEngine, which
+    shares its settings and capture thread with every mode; created without
+    a `worker` the lens runs its own capture thread. `cursor` replaces the OS
+    cursor position, e.g. in tests.
+    """
     exit_signal = pyqtSignal()
 
-    def __init__(self):
+    # Settings render_frame reads each frame, in one snapshot
+    FRAME_SETTINGS = (
+        "magnifier_governor", "magnifier_quality", "magnifier_target_fps", "magnifier_idle_fps",
+        "hover_capture_padding", "hover_crop_panning", "sharp_text_budget_ms", "hover_shape",
+        "magnifier_present", "magnifier_filter", "invert_magnifier", "magnifier_gamma"
+    )
+
+    def __init__(self, settings=None, worker=None, cursor=None):
         super().__init__()
+        # Returns the raw (x, y) cursor position; the OS cursor unless injected
+        self.cursor = cursor or system_cursor_position
 
-        self.settings = SettingsManager()
+        self.settings = settings or SettingsManager()
         self.scale_factor = self.settings.get("default_zoom")
         self.zoom_increment = 0.5 # Fixed step
         self.running = True
 
-        self.capture = mss.mss()
+        self.stats = FrameStats()
+        self.pipeline = FramePipeline(stats=self.stats)
+        self.detector = TileChangeDetector()
+        self.smoother = CursorSmoother.from_settings(self.settings)
+        self.zoom = ZoomTransition(self.scale_factor, self.settings.get("zoom_animation_ms") / 1000)
+        self.freeze = FreezeFrame(check_interval=self.settings.get("freeze_check_ms") / 1000)
+        self.pyramid = ZoomPyramid(budget=self.settings.get("zoom_cache_mb") * 1024 * 1024)
+        self.mover = WindowMover(threshold=self.settings.get("hover_move_threshold"))
+        # Monitor layout is cached and only re-read when Qt reports display changes
+        self.geometry = DisplayGeometry(parent=self)
+        self.panner = CropPanner(
+            padding=self.settings.get("hover_capture_padding"),
+            refresh=self.settings.get("hover_refresh_ms") / 1000
+        )
+        # Steps padding, quality, filter and frame rate down while frames run over budget
+        self.governor = QualityGovernor()
 
         self.setWindowFlags(self.windowFlags() | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.WindowTransparentForInput)
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setWindowOpacity(0.92)
-        
-        # Exclude this window from screen captures to prevent the "infinity mirror" effect
-        try:
-            hwnd = int(self.winId())
-            ctypes.windll.user32.SetWindowDisplayAffinity(hwnd, 0x00000011) # WDA_EXCLUDEFROMCAPTURE
-        except Exception as e:
-            print("Could not exclude window from capture:", e)
+        exclude_from_capture(self)
 
+        # Lens size in logical pixels; the shape is applied per frame by the pipeline
+        self.lens_size = (self.settings.get("hover_width"), self.settings.get("hover_height"))
         self.label = QLabel(self)
-        self.label.setFixedSize(300, 200)
-
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_magnifier)
-        self.timer.start(16)  # ~60 FPS smoother
-
-        self.create_context_menu()
-
-        self.tray_icon = QSystemTrayIcon(self)
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        icon_path = os.path.join(base_dir, "Images", "Dark themed Logo.jpeg")
-        self.tray_icon.setIcon(QIcon(icon_path) if os.path.exists(icon_path) else QIcon())
-        self.tray_icon.setContextMenu(self.tray_menu)
-        self.tray_icon.show()
-
-        threading.Thread(target=self.listen_commands, daemon=True).start()
-        
-        # Global Hotkeys (Suppressed to prevent passing to underlying apps like Chrome)
-        keyboard.add_hotkey('ctrl+plus', self.zoom_in, suppress=True)
-        keyboard.add_hotkey('ctrl+=', self.zoom_in, suppress=True)
-        keyboard.add_hotkey('ctrl+add', self.zoom_in, suppress=True)
-        keyboard.add_hotkey('ctrl+-', self.zoom_out, suppress=True)
-        keyboard.add_hotkey('ctrl+subtract', self.zoom_out, suppress=True)
-
-    def create_context_menu(self):
-        self.tray_menu = QMenu(self)
-
-        zoom_in = QAction("Zoom In (Ctrl+Up / Ctrl++)", self)
-        zoom_out = QAction("Zoom Out (Ctrl+Down / Ctrl+-)", self)
-        hide = QAction("Hide (Esc)", self)
-        unhide = QAction("Unhide", self)
-        exit_app = QAction("Exit", self)
-
-        zoom_in.triggered.connect(self.zoom_in)
-        zoom_out.triggered.connect(self.zoom_out)
-        hide.triggered.connect(self.hide)
-        unhide.triggered.connect(self.show)
-        exit_app.triggered.connect(self.emit_exit)
-
-        self.tray_menu.addAction(zoom_in)
-        self.tray_menu.addAction(zoom_out)
-        self.tray_menu.addSeparator()
-        self.tray_menu.addAction(hide)
-        self.tray_menu.addAction(unhide)
-        self.tray_menu.addSeparator()
-        self.tray_menu.addAction(exit_app)
-
-    def listen_commands(self):
-        while self.running:
-            try:
-                command = sys.stdin.readline().strip()
-
-                if command == "zoom_in":
-                    self.zoom_in()
-
-                elif command == "zoom_out":
-                    self.zoom_out()
-
-                elif command == "exit":
-                    self.running = False
-                    self.close()
-
-            except Exception:
-                break
-
-    def update_magnifier(self):
-
-        mx, my = pyautogui.position()
-
-        target_w = 300
-        target_h = 200
-
-        capture_w = int(target_w / self.scale_factor)
-        capture_h = int(target_h / self.scale_factor)
-
-        # Capture region centered on cursor
-        left = mx - capture_w // 2
-        top = my - capture_h // 2
-
-        screen_w, screen_h = pyautogui.size()
-
-        left = max(0, min(left, screen_w - capture_w))
-        top = max(0, min(top, screen_h - capture_h))
-
-        monitor = {
-            "left": left,
-            "top": top,
-            "width": capture_w,
-            "height": capture_h
-        }
-
-        frame = np.array(self.capture.grab(monitor))
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
-
-        if self.settings.get("invert_magnifier"):
-            frame = cv2.bitwise_not(frame)
-
-        magnified = cv2.resize(frame, (target_w, target_h), interpolation=cv2.INTER_LINEAR)
-        cv2.rectangle(magnified, (0, 0), (target_w - 1, target_h - 1), (0, 255, 0), 2)
-        magnified = cv2.cvtColor(magnified, cv2.COLOR_BGR2RGB)
-
-        height, width, channel = magnified.shape
-        bytesPerLine = 3 * width
-
-        qImg = QImage(magnified.data, width, height, bytesPerLine, QImage.Format_RGB888)
-        self.label.setPixmap(QPixmap.fromImage(qImg))
-
-        # Window position centered on cursor
-        self.move(mx - target_w // 2, my - target_h // 2)
+        self.label.setFixedSize(*self.lens_size)
+        # Painter path: the small capture is scaled by QPainter while the lens paints
+        self.painter_view = PainterFrameView(self)
+        self.painter_view.setFixedSize(*self.lens_size)
+        self.painter_view.hide()
+
+        # Pinned lenses stay on a screen point while the cursor lens moves on; all
+        # lenses are cut from one bounding capture per frame. The tuple is only
+        # ever replaced, so the capture thread always sees a consistent set
+        self.pinned = ()
+        self.lens_batch = LensBatch()
+        self._lens_ids = 0
+        self._lens_windows = {}
+        self._presented_lenses = {}
+
+        # Capture and processing run on a background thread; the GUI thread only
+        # presents the newest finished frame (full rate while the view changes,
+        # idle rate once cursor and pixels settle)
+        self._last_pos = None
+        self._output = None
+        self._output_smooth = None
+        self._image_seq = 0
+        self._presented_seq = 0
+        self._owns_worker = worker is None
+        if self._owns_worker:
+            worker = CaptureWorker(
+                self.render_frame, self.create_capture,
+                target_fps=self.settings.get("magnifier_target_fps"),
+                idle_fps=self.settings.get("magnifier_idle_fps"),
+                parent=self
+            )
+            worker.frame_ready.connect(self.present_frame)
+            worker.start()
+        self.worker = worker
+
+    def create_capture(self):
+        """Called on the capture thread: picks the configured (or fastest) capture backend."""
+        return create_capture_backend(self.settings.get("capture_backend"))
+
+    def activate(self):
+        """Shows the lens and points the capture thread at it; the first frame is rendered in full."""
+        self.detector.reset()
+        self.mover.reset()
+        self._last_pos = None
+        self._presented_seq = 0
+        self._presented_lenses.clear()
+        self.worker.set_render(self.render_frame)
+        if not self.worker.isRunning():
+            self.worker.start()
+        self.show()
+        for window, _ in self._lens_windows.values():
+            window.show()
+
+    def deactivate(self):
+        """Hides the lens (and pinned lenses) and stops rendering for it."""
+        self.worker.set_render(idle_render)
+        # Pixmaps may share the frame slots' memory, which the next mode reallocates
+        self.label.clear()
+        self.painter_view.clear()
+        self.hide()
+        for window, _ in self._lens_windows.values():
+            window.clear()
+            window.hide()
+
+    def render_frame(self, capture, slot):
+        """Runs on the capture thread: grabs and processes one frame into `slot`."""
+        frame_start = time.perf_counter()
+        # Smoothed (tremor-free, slightly predicted) cursor drives the viewport
+        mx, my = self.smoother.update(*self.cursor())
+        self.stats.record("cursor", frame_start)
+
+        # The lens size is in logical pixels; render (and capture for) exactly the
+        # physical pixels it covers on the monitor under the cursor, clamped to it
+        monitor = self.geometry.monitor_at(mx, my)
+        target_w, target_h = monitor.physical_size(self.lens_size)
+        bounds = monitor.physical
+
+        # One settings read per frame: every get() checks the file on disk
+        config = self.settings.snapshot(self.FRAME_SETTINGS)
+        self.governor.enabled = config["magnifier_governor"]
+        crop_panning = config["hover_crop_panning"]
+        padding = config["hover_capture_padding"] if crop_panning else 1.0
+        knobs = self.governor.apply(Knobs(
+            config["magnifier_quality"], padding, True, config["magnifier_target_fps"]
+        ))
+        self.worker.pacer.set_rates(knobs.fps, config["magnifier_idle_fps"])
+        self.panner.padding = max(1.0, float(knobs.padding))
+        color_filter = filter_from_settings(config, curves=knobs.curves)
+        quality = knobs.quality
+        self.pipeline.color_filter = color_filter
+        self.pipeline.interpolation = SettingsManager.QUALITY_TIERS.get(quality, "linear")
+        self.pipeline.sharpener.budget_ms = config["sharp_text_budget_ms"]
+        shape = config["hover_shape"]
+        self.pipeline.shape = shape
+        present = config["magnifier_present"]
+        settings_key = (color_filter, quality, shape, present)
+
+        # Zoom changes animate from cached pixels; the capture resumes at the final scale
+        scale = self.zoom.follow(self.scale_factor)
+        if self.zoom.active and not self.freeze.active:
+            self.render_pinned(capture, scale, settings_key)
+            self._output = self.zoom.render(capture, self.pipeline, mx, my, (target_w, target_h), bounds)
+            self._output_smooth = None
+            self._image_seq += 1
+            # The animation draws into the live path's buffer, which must re-render in full
+            self.detector.reset()
+            self.publish(slot, mx, my)
+            return self.finish_frame(frame_start, True)
+
+        capture_w = int(target_w / scale)
+        capture_h = int(target_h / scale)
+
+        # Capture region centered on cursor, kept on screen
+        region = centered_region(mx, my, capture_w, capture_h, bounds)
+        left, top = region["left"], region["top"]
+
+        # Pinned lenses follow the live screen; while the cursor lens is live too it
+        # is cut from the same bounding capture
+        started = time.perf_counter()
+        shared = region if self.pinned and not self.freeze.active else None
+        cursor_frame, pinned_changed = self.render_pinned(capture, scale, settings_key, shared)
+        if self.pinned:
+            self.stats.record("pinned", started)
+
+        # While frozen, zoom steps and pans are blitted from cached pre-scaled levels
+        # (in-between animation scales are resized directly rather than cached)
+        if self.freeze.active and not self.zoom.active:
+            started = time.perf_counter()
+            source, origin, version = self.freeze.snapshot(capture, region, bounds)
+            self.stats.record("capture", started)
+            cached = self.pyramid.render(source, origin, version, region, scale, (target_w, target_h),
+                                         self.pipeline, settings_key)
+            if cached is not None:
+                output, changed = cached
+                if changed:
+                    self._output = output
+                    self._output_smooth = None
+                    self._image_seq += 1
+                    # The live path must re-render everything once unfrozen
+                    self.detector.reset()
+                moved = (mx, my) != self._last_pos
+                if moved or changed or pinned_changed:
+                    self.publish(slot, mx, my)
+                return self.finish_frame(frame_start, moved or changed or pinned_changed)
+
+        # Small cursor moves are cropped out of a padded capture instead of re-grabbed
+        started = time.perf_counter()
+        if cursor_frame is not None:
+            frame = cursor_frame
+        elif self.freeze.active:
+            frame = self.freeze.frame_for(capture, region, bounds)
+        elif crop_panning:
+            frame = self.panner.frame_for(capture, region, bounds)
+        else:
+            shot = capture.grab(region)
+            frame = self.pipeline.wrap(shot.raw, shot.width, shot.height)
+        if cursor_frame is None:
+            self.stats.record("capture", started)
+
+        # Skip resize/convert when the captured pixels are unchanged
+        started = time.perf_counter()
+        dirty = self.detector.compare(frame, (left, top, capture_w, capture_h) + settings_key)
+        self.stats.record("detect", started)
+        if dirty is None and self.pipeline.sharpener.refine_due():
+            # Sharpening was skipped during the last move; render the settled view sharp
+            dirty = (0, 0, frame.shape[1], frame.shape[0])
+        if dirty is not None:
+            smooth = None
+            if present == "painter":
+                smooth = self.pipeline.painter_scaling((frame.shape[1], frame.shape[0]), (target_w, target_h))
+            if smooth is None:
+                self._output = self.pipeline.render_region(frame, (target_w, target_h), dirty)
+            else:
+                self._output = self.pipeline.render_source(frame)
+            self._output_smooth = smooth
+            self._image_seq += 1
+
+        moved = (mx, my) != self._last_pos
+        changed = moved or dirty is not None or pinned_changed
+        if changed:
+            self.publish(slot, mx, my)
+        return self.finish_frame(frame_start, changed)
+
+    def finish_frame(self, frame_start, published):
+        """Closes the frame's timing; published frames also feed the quality governor."""
+        elapsed = self.stats.frame_done(frame_start, self.worker.pacer.target_interval / 1000)
+        if published:
+            self.governor.observe(elapsed)
+        return published
+
+    def render_pinned(self, capture, scale, settings_key, cursor_region=None):
+        """
+        Runs on the capture thread: renders every pinned lens from one batched
+        capture. With `cursor_region` the cursor lens's region joins the batch
+        and its frame is returned; the second value is True if any pinned lens
+        changed.
+        """
+        lenses = self.pinned
+        if not lenses:
+            return None, False
+
+        regions, targets = [], []
+        for lens in lenses:
+            monitor = self.geometry.monitor_at(*lens.anchor)
+            targets.append(monitor.physical_size(self.lens_size))
+            regions.append(lens.region(scale, targets[-1], monitor.physical))
+        shared = [cursor_region] if cursor_region is not None else []
+        frames = self.lens_batch.grab(capture, shared + regions)
+        cursor_frame = frames.pop(0) if cursor_region is not None else None
+
+        changed = False
+        for lens, frame, region, target in zip(lenses, frames, regions, targets):
+            lens.pipeline.color_filter = self.pipeline.color_filter
+            lens.pipeline.interpolation = self.pipeline.interpolation
+            lens.pipeline.shape = self.pipeline.shape
+            lens.pipeline.sharpener.budget_ms = self.pipeline.sharpener.budget_ms
+            changed = lens.render(frame, region, target, settings_key) or changed
+        return cursor_frame, changed
+
+    def publish(self, slot, mx, my):
+        """Stores the cursor lens and every pinned lens; slots rotate, so all are stored each time."""
+        self._last_pos = (mx, my)
+        slot.store(self._output, self._image_seq, (mx, my), self._output_smooth)
+        slot.store_lenses({lens.id: (lens.output, lens.image_seq) for lens in self.pinned
+                           if lens.output is not None})
+
+    def present_frame(self):
+        """Runs on the GUI thread: shows the newest finished frame, stale ones are dropped."""
+        slot = self.worker.frames.take()
+        if slot is None:
+            return
+
+        started = time.perf_counter()
+        mx, my = slot.pos
+        monitor = self.geometry.monitor_at(mx, my)
+
+        # Window position centered on cursor (Qt places windows in logical coordinates);
+        # moves of a pixel or two are skipped, they only cost a desktop recomposition
+        lx, ly = monitor.to_logical(mx, my)
+        target_w, target_h = self.lens_size
+        position = self.mover.update(lx - target_w // 2, ly - target_h // 2)
+        new_image = slot.image_seq != self._presented_seq
+        self.present_pinned(slot)
+        if position is None and not new_image:
+            return
+
+        # No setUpdatesEnabled batching: re-enabling repaints the whole lens even on
+        # move-only frames, and Qt already paints both changes in the same event loop pass
+        if position is not None:
+            self.move(*position)
+        if new_image:
+            self._presented_seq = slot.image_seq
+            if slot.smooth is None:
+                # Physical-pixel frame tagged with the screen's ratio: drawn 1:1, no second scale.
+                # Shaped lenses are transparent outside the mask, so keep the alpha channel
+                self.label.setPixmap(self.pipeline.to_pixmap(slot.image, monitor.pixel_ratio, alpha=True))
+            else:
+                # Capture-sized frame: scaled (and given its border) while the lens paints
+                border = (self.pipeline.border_color, self.pipeline.border_thickness)
+                self.painter_view.set_frame(slot.image, slot.smooth, border)
+            self.show_present_path(slot.smooth is not None)
+        self.governor.presented(self.stats.record("present", started))
+
+    def show_present_path(self, painter):
+        """Shows the widget of the path the newest frame took; the other one drops its image."""
+        if self.painter_view.isHidden() != painter:
+            return
+        if painter:
+            self.label.clear()
+        else:
+            self.painter_view.clear()
+        self.painter_view.setVisible(painter)
+        self.label.setVisible(not painter)
+
+    def present_pinned(self, slot):
+        """Runs on the GUI thread: updates the pinned lens windows whose image changed."""
+        for lens_id, (image, image_seq) in slot.lenses.items():
+            entry = self._lens_windows.get(lens_id)
+            if entry is None or self._presented_lenses.get(lens_id) == image_seq:
+                continue
+            window, pixel_ratio = entry
+            self._presented_lenses[lens_id] = image_seq
+            window.setPixmap(self.pipeline.to_pixmap(image, pixel_ratio, alpha=True))
+
+    def pin_lens(self):
+        """Pins a lens over the current cursor position; it stays there while the cursor lens moves on."""
+        x, y = self.cursor()
+        monitor = self.geometry.monitor_at(x, y)
+        self._lens_ids += 1
+        lens = PinnedLens(self._lens_ids, x, y, stats=self.stats)
+
+        window = QLabel()
+        window.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint
+                              | Qt.WindowTransparentForInput | Qt.Tool)
+        window.setAttribute(Qt.WA_TranslucentBackground)
+        window.setWindowOpacity(0.92)
+        window.setFixedSize(*self.lens_size)
+        exclude_from_capture(window)
+        lx, ly = monitor.to_logical(x, y)
+        window.move(lx - self.lens_size[0] // 2, ly - self.lens_size[1] // 2)
+        window.show()
+
+        self._lens_windows[lens.id] = (window, monitor.pixel_ratio)
+        self.pinned = self.pinned + (lens,)
+        self.worker.wake()
+
+    def unpin_lenses(self):
+        """Removes every pinned lens."""
+        self.pinned = ()
+        for window, _ in self._lens_windows.values():
+            window.close()
+        self._lens_windows.clear()
+        self._presented_lenses.clear()
+        self.worker.wake()
+
+    def frame_stats(self):
+        """Per-stage timings plus drop and change-detection counters for the `stats` command."""
+        stats = self.stats.snapshot()
+        stats["dropped"] = self.worker.frames.dropped
+        stats["idle"] = self.worker.pacer.idle
+        stats["change_detection"] = self.detector.stats()
+        stats["freeze"] = self.freeze.stats()
+        stats["crop_panning"] = self.panner.stats()
+        stats["zoom_animation"] = self.zoom.stats()
+        stats["zoom_cache"] = self.pyramid.stats()
+        stats["sharp_text"] = self.pipeline.sharpener.stats()
+        stats["governor"] = self.governor.stats()
+        stats["present"] = {"path": self.settings.get("magnifier_present"), "painter_frames": self.painter_view.frames}
+        stats["window"] = self.mover.stats()
+        stats["display"] = self.geometry.stats()
+        stats["multi_lens"] = {"pinned": len(self.pinned), **self.lens_batch.stats()}
+        return stats
 
     def zoom_in(self):
         self.scale_factor = min(self.scale_factor + self.zoom_increment, 10)
+        self.worker.wake()
         self.update()
 
     def zoom_out(self):
         self.scale_factor = max(2.0, self.scale_factor - self.zoom_increment)
+        self.worker.wake()
         self.update()
 
+    def toggle_freeze(self):
+        """Serves the lens from a still snapshot (or goes back to live capture)."""
+        self.freeze.toggle()
+        self.worker.wake()
+
     def keyPressEvent(self, event):
 
         if event.modifiers() == Qt.ControlModifier:
@@ -176,14 +457,13 @@ class ScreenMagnifier(QWidget):
         self.exit_signal.emit()
         self.close()
 
+    def closeEvent(self, event):
+        if self._owns_worker:
+            self.worker.stop()
+        self.unpin_lenses()
+        super().closeEvent(event)
 
-if __name__ == "__main__":
-
-    app = QApplication(sys.argv)
-
-    magnifier = ScreenMagnifier()
-    magnifier.show()
 
-    magnifier.exit_signal.connect(app.quit)
-
-    sys.exit(app.exec_())
\ No newline at end of file
+if __name__ == "__main__":
+    from magnifier.magnifier_engine import main
+    sys.exit(main(["--mode", "hover"]))
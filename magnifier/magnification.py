@@ -0,0 +1,258 @@
+"""
+OS layer of the full-window magnifier.
+
+FullWindowMagnifier only talks to a MagnificationBackend: the real one
+wraps the Windows Magnification API and a low-level mouse hook through
+ctypes, FakeMagnification records every call so the viewport logic can be
+tested and benchmarked on any platform. FullscreenView sits on top and
+pushes the transform to the OS only when it actually changes.
+"""
+import ctypes
+from ctypes import c_float, c_int
+
+import numpy as np
+
+from magnifier.viewport import fullscreen_offset
+
+
+class MagnificationBackend:
+    """Interface FullWindowMagnifier needs from the OS."""
+
+    name = None
+
+    def initialize(self):
+        return True
+
+    def screen_size(self):
+        raise NotImplementedError
+
+    def cursor_pos(self):
+        raise NotImplementedError
+
+    def set_transform(self, scale, offset_x, offset_y):
+        raise NotImplementedError
+
+    def set_color_effect(self, matrix):
+        """`matrix` is a 5x5 MAGCOLOREFFECT-style array (see ColorFilter.color_effect)."""
+        raise NotImplementedError
+
+    def watch_cursor(self, callback):
+        """
+        Calls `callback(x, y)` whenever the cursor moves, replacing any earlier
+        watch. Returns False if the backend can't deliver move notifications, in
+        which case the caller polls.
+        """
+        return False
+
+    def unwatch_cursor(self):
+        pass
+
+    def uninitialize(self):
+        pass
+
+
+class POINT(ctypes.Structure):
+    _fields_ = [("x", ctypes.c_long), ("y", ctypes.c_long)]
+
+
+class MAGCOLOREFFECT(ctypes.Structure):
+    _fields_ = [("transform", c_float * 25)]
+
+
+class MSLLHOOKSTRUCT(ctypes.Structure):
+    _fields_ = [("pt", POINT), ("mouseData", ctypes.c_ulong), ("flags", ctypes.c_ulong),
+                ("time", ctypes.c_ulong), ("dwExtraInfo", ctypes.c_size_t)]
+
+
+class WindowsMagnification(MagnificationBackend):
+    """Magnification.dll full-screen transform plus a WH_MOUSE_LL hook for cursor moves."""
+
+    name = "windows"
+    WH_MOUSE_LL = 14
+    WM_MOUSEMOVE = 0x0200
+
+    def __init__(self):
+        from ctypes import wintypes
+
+        self.mag = ctypes.windll.Magnification
+        self.user32 = ctypes.windll.user32
+        self.kernel32 = ctypes.windll.kernel32
+
+        self.mag.MagSetFullscreenTransform.argtypes = [c_float, c_int, c_int]
+        self.mag.MagSetFullscreenColorEffect.argtypes = [ctypes.POINTER(MAGCOLOREFFECT)]
+
+        self._hook_type = ctypes.WINFUNCTYPE(wintypes.LPARAM, c_int, wintypes.WPARAM, wintypes.LPARAM)
+        self.user32.SetWindowsHookExW.argtypes = [c_int, self._hook_type, wintypes.HINSTANCE, wintypes.DWORD]
+        self.user32.SetWindowsHookExW.restype = wintypes.HHOOK
+        self.user32.CallNextHookEx.argtypes = [wintypes.HHOOK, c_int, wintypes.WPARAM, wintypes.LPARAM]
+        self.user32.CallNextHookEx.restype = wintypes.LPARAM
+        self.user32.UnhookWindowsHookEx.argtypes = [wintypes.HHOOK]
+        self.kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+
+        self._hook = None
+        self._hook_proc = None   # must stay referenced while the hook is installed
+
+    def initialize(self):
+        return bool(self.mag.MagInitialize())
+
+    def screen_size(self):
+        return self.user32.GetSystemMetrics(0), self.user32.GetSystemMetrics(1)
+
+    def cursor_pos(self):
+        pt = POINT()
+        self.user32.GetCursorPos(ctypes.byref(pt))
+        return pt.x, pt.y
+
+    def set_transform(self, scale, offset_x, offset_y):
+        return bool(self.mag.MagSetFullscreenTransform(scale, offset_x, offset_y))
+
+    def set_color_effect(self, matrix):
+        effect = MAGCOLOREFFECT()
+        effect.transform[:] = [float(v) for v in matrix.flatten()]
+        return bool(self.mag.MagSetFullscreenColorEffect(ctypes.byref(effect)))
+
+    def watch_cursor(self, callback):
+        # A hook left installed would keep calling into its thunk once _hook_proc is replaced
+        self.unwatch_cursor()
+
+        # Low-level hooks run on the installing thread's message loop (the Qt GUI thread)
+        def proc(n_code, w_param, l_param):
+            if n_code == 0 and w_param == self.WM_MOUSEMOVE:
+                info = ctypes.cast(l_param, ctypes.POINTER(MSLLHOOKSTRUCT)).contents
+                callback(info.pt.x, info.pt.y)
+            return self.user32.CallNextHookEx(None, n_code, w_param, l_param)
+
+        self._hook_proc = self._hook_type(proc)
+        self._hook = self.user32.SetWindowsHookExW(
+            self.WH_MOUSE_LL, self._hook_proc, self.kernel32.GetModuleHandleW(None), 0)
+        if not self._hook:
+            print("Could not install the mouse hook, falling back to polling")
+            self._hook_proc = None
+            return False
+        return True
+
+    def unwatch_cursor(self):
+        if self._hook:
+            self.user32.UnhookWindowsHookEx(self._hook)
+            self._hook = None
+            self._hook_proc = None
+
+    def uninitialize(self):
+        self.unwatch_cursor()
+        self.mag.MagUninitialize()
+
+
+class FakeMagnification(MagnificationBackend):
+    """Records OS calls instead of making them; move_cursor() simulates mouse movement."""
+
+    name = "fake"
+
+    def __init__(self, width=1920, height=1080, notify=True):
+        self.width, self.height = width, height
+        self.notify = notify
+        self.cursor = (width // 2, height // 2)
+        self.calls = []
+        self.watches = 0     # watch_cursor() calls that installed a watch
+        self._callback = None
+
+    def screen_size(self):
+        return self.width, self.height
+
+    def cursor_pos(self):
+        return self.cursor
+
+    def set_transform(self, scale, offset_x, offset_y):
+        self.calls.append(("transform", scale, offset_x, offset_y))
+        return True
+
+    def set_color_effect(self, matrix):
+        self.calls.append(("color_effect", matrix))
+        return True
+
+    def watch_cursor(self, callback):
+        self.unwatch_cursor()
+        if not self.notify:
+            return False
+        self._callback = callback
+        self.watches += 1
+        return True
+
+    def unwatch_cursor(self):
+        self._callback = None
+
+    @property
+    def watching(self):
+        return self._callback is not None
+
+    def move_cursor(self, x, y):
+        self.cursor = (x, y)
+        if self._callback:
+            self._callback(x, y)
+
+    def transforms(self):
+        return [call for call in self.calls if call[0] == "transform"]
+
+
+class FullscreenView:
+    """
+    Maps cursor and zoom onto the OS full-screen transform, pushing it (and
+    the colour effect) only when the computed value differs from what the
+    OS already has.
+
+    With a `geometry` (DisplayGeometry or ScreenLayout) the viewport pans
+    across the monitor under the cursor; without one, across the backend's
+    primary screen.
+    """
+
+    IDENTITY_EFFECT = np.eye(5, dtype=np.float32)
+
+    def __init__(self, backend, geometry=None):
+        self.backend = backend
+        self.geometry = geometry
+        self.screen_w, self.screen_h = backend.screen_size()
+        self.view = None
+        self.color_filter = None
+        self.pushed = 0
+        self.skipped = 0
+
+    def view_for(self, scale, mx, my):
+        if scale <= 1.0:
+            # At 1x the offset must be zero to avoid visual glitches
+            return (1.0, 0, 0)
+        if self.geometry is not None:
+            left, top, width, height = self.geometry.bounds_at(mx, my)
+        else:
+            left, top, width, height = 0, 0, self.screen_w, self.screen_h
+        offset_x, offset_y = fullscreen_offset(mx, my, width, height, scale, left, top)
+        return (scale, offset_x, offset_y)
+
+    def update(self, scale, mx, my):
+        """Returns True if a new transform was pushed."""
+        view = self.view_for(scale, mx, my)
+        if view == self.view:
+            self.skipped += 1
+            return False
+        self.backend.set_transform(*view)
+        self.view = view
+        self.pushed += 1
+        return True
+
+    def set_color_filter(self, color_filter):
+        """Pushes a ColorFilter's colour effect if it differs from the current one."""
+        if color_filter is self.color_filter:
+            return False
+        effect = color_filter.color_effect()
+        if effect is None:
+            print(f"Colour filter {color_filter.name!r} can't be applied full-screen")
+            return False
+        self.backend.set_color_effect(effect)
+        self.color_filter = color_filter
+        return True
+
+    def reset(self):
+        """Forgets the pushed state so the next update always reaches the OS."""
+        self.view = None
+        self.color_filter = None
+
+    def stats(self):
+        return {"transforms_pushed": self.pushed, "transforms_skipped": self.skipped}
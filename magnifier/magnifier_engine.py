@@ -0,0 +1,258 @@
+import sys
+import os
+import threading
+import json
+import time
+import argparse
+
+from PyQt5.QtWidgets import QApplication, QMenu, QAction, QActionGroup, QSystemTrayIcon
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QIcon
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from settings.settings import SettingsManager
+from capture.backends import create_capture_backend
+from magnifier.capture_worker import CaptureWorker, idle_render
+from magnifier.display_geometry import enable_high_dpi
+from magnifier.hover_magnifier import ScreenMagnifier
+from magnifier.upper_window_magnifier import UpperWindowMagnifier
+from magnifier.full_window_magnifier import FullWindowMagnifier
+
+MODES = ("hover", "docked", "fullscreen")
+MODE_LABELS = {"hover": "Hover Lens", "docked": "Docked Window", "fullscreen": "Fullscreen"}
+
+# Control commands forwarded to the active mode (command -> method name)
+VIEW_COMMANDS = {
+    "zoom_in": "zoom_in",
+    "zoom_out": "zoom_out",
+    "freeze": "toggle_freeze",
+    "reset": "reset_zoom",
+    "pin": "pin_lens",
+    "unpin": "unpin_lenses",
+    "hide": "hide",
+    "show": "show",
+}
+
+
+class MagnifierEngine(QObject):
+    """
+    One magnifier process for every presentation mode.
+
+    The engine owns what the modes have in common: settings, the tray icon,
+    the stdin control channel, global hotkeys and the capture thread. The
+    hover, docked and fullscreen modes are presentation strategies with
+    activate()/deactivate(); switching (`mode <name>` on stdin, Ctrl+Alt+M
+    or the tray menu) hides one and shows the other in the same process,
+    so nothing is re-imported or re-initialised. Modes are created on first
+    use and kept, with their zoom level, for the next switch.
+
+    `capture_factory` (called on the capture thread), `cursor` and
+    `fullscreen_backend` replace the real screen capture, cursor position and
+    OS magnifier, e.g. in tests.
+    """
+    exit_signal = pyqtSignal()
+    # Hotkeys and stdin arrive on other threads; commands run on the GUI thread
+    command_received = pyqtSignal(str)
+
+    def __init__(self, mode="hover", fullscreen_backend=None, capture_factory=None, cursor=None):
+        super().__init__()
+        self.settings = SettingsManager()
+        self.fullscreen_backend = fullscreen_backend
+        self.capture_factory = capture_factory
+        self.cursor = cursor
+        self.running = True
+
+        self.views = {}
+        self.view = None
+        self.mode = None
+        self.switches = 0
+        self.switch_ms = 0.0
+
+        # Shared by the hover and docked modes; only started once one of them is shown
+        self.worker = CaptureWorker(
+            idle_render, self.create_capture,
+            target_fps=self.settings.get("magnifier_target_fps"),
+            idle_fps=self.settings.get("magnifier_idle_fps"),
+            parent=self
+        )
+        self.worker.frame_ready.connect(self.present_frame)
+        self.command_received.connect(self.handle_command)
+
+        self.create_tray_icon()
+        if not self.switch_mode(mode):
+            self.switch_mode("hover")
+
+        threading.Thread(target=self.listen_commands, daemon=True).start()
+        self.register_hotkeys()
+
+    def register_hotkeys(self):
+        """Global hotkeys (suppressed to prevent passing to underlying apps like Chrome)."""
+        hotkeys = {
+            'ctrl+plus': "zoom_in", 'ctrl+=': "zoom_in", 'ctrl+add': "zoom_in",
+            'ctrl+-': "zoom_out", 'ctrl+subtract': "zoom_out",
+            'ctrl+alt+f': "freeze", 'ctrl+alt+p': "pin", 'ctrl+alt+u': "unpin",
+            'ctrl+alt+m': "next_mode",
+        }
+        try:
+            import keyboard
+            for hotkey, command in hotkeys.items():
+                keyboard.add_hotkey(hotkey, self.command_received.emit, args=(command,), suppress=True)
+        except Exception as e:
+            # Missing module, or no permission to hook the keyboard: the tray and stdin still work
+            print("Global hotkeys unavailable:", e)
+
+    def create_capture(self):
+        """Called on the capture thread: picks the configured (or fastest) capture backend."""
+        if self.capture_factory is not None:
+            return self.capture_factory()
+        return create_capture_backend(self.settings.get("capture_backend"))
+
+    def create_tray_icon(self):
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        icon_path = os.path.join(base_dir, "Images", "Dark themed Logo.jpeg")
+        self.tray_icon = QSystemTrayIcon(QIcon(icon_path) if os.path.exists(icon_path) else QIcon(), self)
+        self.tray_menu = QMenu()
+
+        for label, command in (("Zoom In (Ctrl+Up / Ctrl++)", "zoom_in"),
+                               ("Zoom Out (Ctrl+Down / Ctrl+-)", "zoom_out"),
+                               ("Freeze Frame (Ctrl+Alt+F)", "freeze")):
+            self.add_tray_action(label, command)
+        self.tray_menu.addSeparator()
+
+        self.mode_actions = {}
+        group = QActionGroup(self)
+        for mode in MODES:
+            action = self.add_tray_action(MODE_LABELS[mode], f"mode {mode}")
+            action.setCheckable(True)
+            group.addAction(action)
+            self.mode_actions[mode] = action
+        self.tray_menu.addSeparator()
+
+        for label, command in (("Pin Lens Here (Ctrl+Alt+P)", "pin"),
+                               ("Remove Pinned Lenses (Ctrl+Alt+U)", "unpin")):
+            self.add_tray_action(label, command)
+        self.tray_menu.addSeparator()
+        for label, command in (("Hide (Esc)", "hide"), ("Unhide", "show")):
+            self.add_tray_action(label, command)
+        self.tray_menu.addSeparator()
+        self.add_tray_action("Exit", "exit")
+
+        self.tray_icon.setContextMenu(self.tray_menu)
+        self.tray_icon.show()
+
+    def add_tray_action(self, label, command):
+        action = QAction(label, self)
+        action.triggered.connect(lambda: self.handle_command(command))
+        self.tray_menu.addAction(action)
+        return action
+
+    def listen_commands(self):
+        """Reads control commands from standard input (one per line)."""
+        while self.running:
+            try:
+                line = sys.stdin.readline()
+                if not line:
+                    break
+                command = line.strip()
+                if command:
+                    self.command_received.emit(command)
+            except Exception:
+                break
+
+    def handle_command(self, command):
+        """Runs a control command on the GUI thread."""
+        name, _, argument = command.partition(" ")
+        if name == "mode":
+            self.switch_mode(argument.strip())
+        elif name == "next_mode":
+            self.switch_mode(MODES[(MODES.index(self.mode) + 1) % len(MODES)])
+        elif name == "stats":
+            print(json.dumps(self.frame_stats()), flush=True)
+        elif name == "exit":
+            self.exit()
+        else:
+            action = getattr(self.view, VIEW_COMMANDS.get(name, ""), None)
+            if action is None:
+                print(f"Command {command!r} is not available in {self.mode} mode")
+                return
+            action()
+
+    def create_view(self, mode):
+        if mode == "fullscreen":
+            view = FullWindowMagnifier(self.fullscreen_backend, settings=self.settings)
+        elif mode == "docked":
+            view = UpperWindowMagnifier(settings=self.settings, worker=self.worker, cursor=self.cursor)
+        else:
+            view = ScreenMagnifier(settings=self.settings, worker=self.worker, cursor=self.cursor)
+        view.exit_signal.connect(self.exit)
+        return view
+
+    def switch_mode(self, mode):
+        """Switches the presentation mode in-process; returns False if it could not be started."""
+        if mode not in MODES:
+            print(f"Unknown magnifier mode {mode!r}, expected one of {', '.join(MODES)}")
+            return False
+        if mode == self.mode:
+            return True
+
+        started = time.perf_counter()
+        view = self.views.get(mode)
+        if view is None:
+            try:
+                view = self.views[mode] = self.create_view(mode)
+            except Exception as e:
+                print(f"Could not start the {mode} magnifier:", e)
+                if self.mode:
+                    self.mode_actions[self.mode].setChecked(True)
+                return False
+
+        if self.view is not None:
+            self.view.deactivate()
+        view.activate()
+        self.view, self.mode = view, mode
+        self.mode_actions[mode].setChecked(True)
+
+        self.switches += 1
+        self.switch_ms = round((time.perf_counter() - started) * 1000, 3)
+        return True
+
+    def present_frame(self):
+        """GUI thread: hands the newest captured frame to the active mode."""
+        present = getattr(self.view, "present_frame", None)
+        if present:
+            present()
+
+    def frame_stats(self):
+        """The active mode's frame statistics plus mode-switch timings for the `stats` command."""
+        stats = self.view.frame_stats()
+        stats["mode"] = self.mode
+        stats["mode_switches"] = self.switches
+        stats["mode_switch_ms"] = self.switch_ms
+        return stats
+
+    def exit(self):
+        if not self.running:
+            return
+        self.running = False
+        for view in self.views.values():
+            view.deactivate()
+            view.close()
+        self.worker.stop()
+        self.tray_icon.hide()
+        self.exit_signal.emit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen magnifier")
+    parser.add_argument("--mode", choices=MODES, default="hover", help="presentation mode to start in")
+    args = parser.parse_args(argv)
+
+    enable_high_dpi()
+    app = QApplication(sys.argv[:1])
+    engine = MagnifierEngine(args.mode)
+    engine.exit_signal.connect(app.quit)
+    return app.exec_()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import numpy as np
+
+from magnifier.frame_pipeline import FramePipeline
+from magnifier.change_detector import TileChangeDetector
+from magnifier.viewport import centered_region
+
+
+def bounding_region(regions):
+    """Smallest capture rectangle containing every region."""
+    left = min(r["left"] for r in regions)
+    top = min(r["top"] for r in regions)
+    right = max(r["left"] + r["width"] for r in regions)
+    bottom = max(r["top"] + r["height"] for r in regions)
+    return {"left": left, "top": top, "width": right - left, "height": bottom - top}
+
+
+class PinnedLens:
+    """
+    A lens fixed on one screen point, shown next to the cursor lens.
+
+    Each pinned lens keeps its own pipeline (output buffers) and change
+    detector, so a lens over a static area costs nothing once rendered.
+    """
+
+    def __init__(self, lens_id, x, y, stats=None):
+        self.id = lens_id
+        self.anchor = (x, y)
+        self.pipeline = FramePipeline(stats=stats)
+        self.detector = TileChangeDetector()
+        self.output = None
+        self.image_seq = 0
+
+    def region(self, scale, target_size, bounds):
+        target_w, target_h = target_size
+        return centered_region(*self.anchor, int(target_w / scale), int(target_h / scale), bounds)
+
+    def render(self, frame, region, target_size, settings_key):
+        """Re-renders the dirty part of the lens; returns True if its image changed."""
+        key = (region["left"], region["top"], region["width"], region["height"], settings_key)
+        dirty = self.detector.compare(frame, key)
+        if dirty is None and self.pipeline.sharpener.refine_due():
+            dirty = (0, 0, frame.shape[1], frame.shape[0])
+        if dirty is None:
+            return False
+        self.output = self.pipeline.render_region(frame, target_size, dirty)
+        self.image_seq += 1
+        return True
+
+
+class LensBatch:
+    """
+    Captures the regions of several lenses with one grab of their bounding
+    rectangle and cuts every lens out of it.
+
+    When the lenses are so far apart that the bounding rectangle would be
+    more than `merge_limit` times their combined area (two lenses in
+    opposite screen corners), the regions are grabbed one by one instead:
+    one huge grab would cost more than several small ones.
+
+    The returned frames are owned copies, so each lens can filter its frame
+    in place even where lens regions overlap.
+    """
+
+    def __init__(self, merge_limit=4.0):
+        self.merge_limit = merge_limit
+        self._crops = []
+
+        self.batches = 0
+        self.grabs = 0
+        self.merged = 0
+
+    def _crop_buffer(self, index, shape):
+        while len(self._crops) <= index:
+            self._crops.append(None)
+        if self._crops[index] is None or self._crops[index].shape != shape:
+            self._crops[index] = np.empty(shape, dtype=np.uint8)
+        return self._crops[index]
+
+    def grab(self, capture, regions):
+        """Returns one BGRA frame per region."""
+        if not regions:
+            return []
+        self.batches += 1
+        bounds = bounding_region(regions)
+        area = sum(r["width"] * r["height"] for r in regions)
+
+        frames = []
+        if len(regions) > 1 and bounds["width"] * bounds["height"] <= area * self.merge_limit:
+            self.grabs += 1
+            self.merged += 1
+            pixels = capture.grab(bounds).array()
+            for index, r in enumerate(regions):
+                x, y = r["left"] - bounds["left"], r["top"] - bounds["top"]
+                crop = pixels[y:y + r["height"], x:x + r["width"]]
+                frame = self._crop_buffer(index, crop.shape)
+                np.copyto(frame, crop)
+                frames.append(frame)
+        else:
+            for index, r in enumerate(regions):
+                self.grabs += 1
+                pixels = capture.grab(r).array()
+                frame = self._crop_buffer(index, pixels.shape)
+                np.copyto(frame, pixels)
+                frames.append(frame)
+        return frames
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "grabs": self.grabs,
+            "merged": self.merged,
+            "grabs_per_batch": round(self.grabs / self.batches, 3) if self.batches else 0.0
+        }
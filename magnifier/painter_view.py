@@ -0,0 +1,76 @@
+"""
+Painter presentation path for the capture-based magnifiers.
+
+The default path scales every frame to the output size with cv2, then
+hands the full-size result to Qt (QImage -> QPixmap -> label), so each
+frame copies the magnified image several times. On this path only the
+small filtered capture is copied, once, into a buffer the view owns and
+wraps as a QImage, and QPainter.drawImage scales it straight into the
+window while painting. At 5-10x zoom that image is 25-100 times smaller
+than the output.
+
+Qt offers nearest-neighbour and bilinear scaling (SmoothPixmapTransform),
+which matches the fast and balanced tiers. Cubic and sharp-text scaling
+and shaped lenses work in output space, so frames that need them, and
+zoom animations and cached zoom levels that are already output-sized,
+are still drawn 1:1 through the same widget
+(FramePipeline.painter_scaling decides).
+"""
+import numpy as np
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, QRectF
+from PyQt5.QtGui import QPainter, QPen, QColor
+
+from magnifier.frame_pipeline import FramePipeline
+
+
+class PainterFrameView(QWidget):
+    """Draws a BGRA frame scaled to the widget, optionally with the lens border on top."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.smooth = True
+        self.border = None
+        # The array backing the QImage (the image does not own its pixels),
+        # reused while the frame size stays the same
+        self._buffer = None
+        self._image = None
+        self.frames = 0
+
+    def set_frame(self, buffer, smooth=True, border=None):
+        """
+        Shows a copy of `buffer`. Frame slots go back to the capture thread
+        while their image may still be repainted (expose, move-only frames),
+        so the view keeps its own pixels. `border` is an optional (BGRA
+        colour, thickness in physical pixels) drawn on top.
+        """
+        if self._buffer is None or self._buffer.shape != buffer.shape:
+            self._buffer = np.empty_like(buffer)
+            self._image = FramePipeline.to_qimage(self._buffer)
+        np.copyto(self._buffer, buffer)
+        self.smooth = smooth
+        self.border = border
+        self.frames += 1
+        self.update()
+
+    def clear(self):
+        self._buffer = None
+        self._image = None
+        self.update()
+
+    def paintEvent(self, event):
+        if self._image is None:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, self.smooth)
+        target = QRectF(self.rect())
+        painter.drawImage(target, self._image, QRectF(self._image.rect()))
+        if self.border:
+            (blue, green, red, alpha), thickness = self.border
+            if thickness:
+                width = thickness / self.devicePixelRatioF()
+                painter.setPen(QPen(QColor(red, green, blue, alpha), width))
+                painter.setBrush(Qt.NoBrush)
+                painter.drawRect(target.adjusted(width / 2, width / 2, -width / 2, -width / 2))
+        painter.end()
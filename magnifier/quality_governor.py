@@ -0,0 +1,167 @@
+"""
+Adaptive quality governor for the capture-based magnifiers.
+
+The governor watches what a frame really costs (capture and processing on
+the capture thread plus presenting on the GUI thread) against the frame
+budget, 1000 / frame rate ms (16.7 ms at 60 fps). When OCR, a video call or
+anything else competes for the CPU and frames run over budget, it walks
+down a fixed ladder of cheaper settings, one step per evaluation window:
+
+  capture padding    smaller padded grabs for the hover lens
+  interpolation      text -> sharp -> balanced -> fast tier
+  filter complexity  the gamma curve is left out (the colour filter stays)
+  frame rate         45, 30 and finally 20 fps (the budget grows with it)
+
+Steps that would not change anything for the user's settings are skipped.
+When frames fit comfortably again (the 90th percentile under `headroom`
+times the budget of the level above) and the level has held for `hold`
+seconds, it climbs back one step at a time. Every decision is printed and
+kept in stats() for tuning.
+"""
+import time
+from collections import deque, namedtuple
+
+# What a magnifier frame attempts; the user's settings in, the governed values out
+Knobs = namedtuple("Knobs", "quality padding curves fps")
+
+# Quality tiers from the most to the least expensive (see SettingsManager.QUALITY_TIERS)
+QUALITY_COST = ("text", "sharp", "balanced", "fast")
+
+# Each level adds one cap to the ones before it
+LADDER = (
+    ("padding", 2.0),
+    ("quality", "sharp"),
+    ("quality", "balanced"),
+    ("padding", 1.5),
+    ("curves", False),
+    ("quality", "fast"),
+    ("fps", 45),
+    ("fps", 30),
+    ("fps", 20),
+)
+
+
+def _cheaper_quality(quality, cap):
+    if quality not in QUALITY_COST:
+        return quality
+    return QUALITY_COST[max(QUALITY_COST.index(quality), QUALITY_COST.index(cap))]
+
+
+class QualityGovernor:
+
+    def __init__(self, window=30, headroom=0.6, hold=2.0, enabled=True):
+        self.window = window
+        self.headroom = headroom
+        self.hold = hold
+        self.enabled = enabled
+        self.level = 0
+        self._base = None
+        self._samples = []
+        self._present = 0.0
+        self._changed_at = time.monotonic()
+
+        self.steps_down = 0
+        self.steps_up = 0
+        self.decisions = deque(maxlen=20)
+
+    def knobs_at(self, level, base):
+        """The settings `base` turns into with the first `level` ladder steps applied."""
+        quality, padding, curves, fps = base
+        for knob, cap in LADDER[:level]:
+            if knob == "padding":
+                padding = min(padding, cap)
+            elif knob == "quality":
+                quality = _cheaper_quality(quality, cap)
+            elif knob == "curves":
+                curves = curves and cap
+            else:
+                fps = min(fps, cap)
+        return Knobs(quality, padding, curves, fps)
+
+    def apply(self, base):
+        """Returns the governed Knobs for the user's settings `base` (a Knobs)."""
+        self._base = Knobs(*base)
+        if not self.enabled:
+            return self._base
+        return self.knobs_at(self.level, self._base)
+
+    def presented(self, seconds):
+        """GUI thread: the cost of presenting the latest frame, added to the frames that follow."""
+        self._present = seconds
+
+    def observe(self, seconds, now=None):
+        """
+        Feeds in one rendered frame's capture + processing time (idle frames
+        that rendered nothing say nothing about load). Returns True when the
+        level changed.
+        """
+        if not self.enabled or self._base is None:
+            return False
+        self._samples.append((seconds + self._present) * 1000)
+        if len(self._samples) < self.window:
+            return False
+
+        ordered = sorted(self._samples)
+        self._samples = []
+        p90 = ordered[int(0.9 * (len(ordered) - 1))]
+        now = time.monotonic() if now is None else now
+
+        current = self.knobs_at(self.level, self._base)
+        budget = 1000 / current.fps
+        if p90 > budget:
+            step = self._next_step(+1, current)
+            if step is not None:
+                return self._change(*step, "down", p90, budget, now)
+        elif self.level and now - self._changed_at >= self.hold:
+            level, removed = self._next_step(-1, current)
+            upper_budget = 1000 / self.knobs_at(level, self._base).fps
+            if p90 < self.headroom * upper_budget:
+                return self._change(level, removed, "up", p90, upper_budget, now)
+        return False
+
+    def _next_step(self, direction, current):
+        """
+        The nearest level in `direction` that renders differently and the
+        ladder step that makes the difference, or None at the bottom. Going up,
+        the steps below it that change nothing are dropped too, down to level 0.
+        """
+        level = self.level + direction
+        while 0 <= level <= len(LADDER) and self.knobs_at(level, self._base) == current:
+            level += direction
+        if level > len(LADDER):
+            return None
+        if direction > 0:
+            return level, LADDER[level - 1]
+        if level < 0:
+            return 0, LADDER[self.level - 1]
+        removed = LADDER[level]
+        knobs = self.knobs_at(level, self._base)
+        while level and self.knobs_at(level - 1, self._base) == knobs:
+            level -= 1
+        return level, removed
+
+    def _change(self, level, step, direction, p90, budget, now):
+        knob, cap = step
+        self.level = level
+        self._changed_at = now
+        if direction == "down":
+            self.steps_down += 1
+        else:
+            self.steps_up += 1
+        decision = {"direction": direction, "level": level, "knob": knob, "cap": cap,
+                    "p90_ms": round(p90, 3), "budget_ms": round(budget, 3)}
+        self.decisions.append(decision)
+        print(f"Quality governor: {direction} to level {level} ({knob} {cap}), "
+              f"p90 frame {p90:.1f} ms against {budget:.1f} ms")
+        return True
+
+    def stats(self):
+        knobs = self.knobs_at(self.level, self._base) if self._base else None
+        return {
+            "enabled": self.enabled,
+            "level": self.level,
+            "knobs": knobs._asdict() if knobs else {},
+            "steps_down": self.steps_down,
+            "steps_up": self.steps_up,
+            "decisions": list(self.decisions)
+        }
@@ -0,0 +1,60 @@
+import time
+import numpy as np
+from magnifier.capture_worker import TripleBuffer, CaptureWorker
+
+
+def publish(frames, value):
+    frames.back().store(np.full((2, 2, 4), value, dtype=np.uint8), value, (value, value))
+    frames.publish()
+
+def test_take_returns_newest_frame():
+    frames = TripleBuffer()
+    publish(frames, 1)
+    slot = frames.take()
+    assert slot.image_seq == 1
+    assert frames.take() is None
+
+def test_stale_frames_are_dropped():
+    """Only the newest of several unconsumed frames is presented."""
+    frames = TripleBuffer()
+    publish(frames, 1)
+    publish(frames, 2)
+    publish(frames, 3)
+    assert frames.take().image_seq == 3
+    assert frames.dropped == 2
+
+def test_producer_never_writes_front_slot():
+    frames = TripleBuffer()
+    publish(frames, 1)
+    front = frames.take()
+    for value in range(2, 6):
+        assert frames.back() is not front
+        publish(frames, value)
+    assert front.image_seq == 1
+
+def test_capture_failures_do_not_end_the_thread():
+    """A failing backend (secure desktop, lock screen) is recreated and rendering goes on."""
+    created = []
+    def create_capture():
+        created.append(object())
+        if len(created) == 1:
+            raise RuntimeError("no desktop")
+        return created[-1]
+
+    renders = []
+    def render(capture, slot):
+        renders.append(capture)
+        if len(renders) == 1:
+            raise RuntimeError("grab failed")
+        slot.store(np.zeros((2, 2, 4), dtype=np.uint8), len(renders), (0, 0))
+        return True
+
+    worker = CaptureWorker(render, create_capture, target_fps=200, idle_fps=100)
+    worker.start()
+    deadline = time.monotonic() + 5
+    while not worker.frames.published and time.monotonic() < deadline:
+        time.sleep(0.01)
+    worker.stop()
+    assert worker.frames.published and worker.errors == 2
+    # The backend a grab failed on is replaced by a fresh one
+    assert renders[1] is created[2] and renders[0] is created[1]
@@ -0,0 +1,43 @@
+import numpy as np
+from magnifier.change_detector import TileChangeDetector
+from magnifier.frame_pipeline import FramePipeline
+
+
+def make_frame(width=64, height=48, value=10):
+    return np.full((height, width, 4), value, dtype=np.uint8)
+
+def test_first_frame_is_fully_dirty():
+    detector = TileChangeDetector(tile_size=16)
+    assert detector.compare(make_frame(), key=1) == (0, 0, 64, 48)
+
+def test_identical_frame_is_skipped():
+    detector = TileChangeDetector(tile_size=16)
+    detector.compare(make_frame(), key=1)
+    assert detector.compare(make_frame(), key=1) is None
+    assert detector.hit_rate == 0.5
+
+def test_key_change_forces_full_redraw():
+    detector = TileChangeDetector(tile_size=16)
+    detector.compare(make_frame(), key=1)
+    assert detector.compare(make_frame(), key=2) == (0, 0, 64, 48)
+
+def test_partial_change_reports_dirty_tiles():
+    detector = TileChangeDetector(tile_size=16)
+    detector.compare(make_frame(), key=1)
+    frame = make_frame()
+    frame[20, 40] = 200
+    assert detector.compare(frame, key=1) == (32, 16, 48, 32)
+    assert detector.stats()["partial"] == 1
+
+def test_region_render_matches_full_render():
+    """Redrawing only the dirty area must give (almost) the same output as a full resize."""
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 256, (40, 60, 4), dtype=np.uint8)
+    changed = base.copy()
+    changed[10:18, 20:30] = 255
+
+    pipeline = FramePipeline(border_thickness=0)
+    pipeline.render(base.copy(), (300, 200))
+    partial = pipeline.render_region(changed.copy(), (300, 200), (16, 8, 32, 24)).copy()
+    full = FramePipeline(border_thickness=0).render(changed.copy(), (300, 200))
+    assert np.abs(partial.astype(int) - full.astype(int)).max() <= 1
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from magnifier.color_filters import FILTERS, compile_filter, filter_from_settings
+from magnifier.frame_pipeline import FramePipeline
+from settings.settings import SettingsManager
+
+
+@pytest.fixture
+def frame():
+    return np.random.default_rng(0).integers(0, 256, (20, 30, 4), dtype=np.uint8)
+
+def reference(frame, matrix, offset=(0, 0, 0)):
+    """Straightforward float RGB maths on a BGRA frame."""
+    rgb = frame[..., 2::-1].astype(float)
+    out = np.clip(np.rint(rgb @ np.asarray(matrix, dtype=float).T + offset), 0, 255)
+    return out[..., ::-1].astype(np.uint8)
+
+def test_settings_offer_every_filter():
+    assert set(SettingsManager.COLOR_FILTERS) == set(FILTERS)
+
+def test_invert_is_a_single_bitwise_pass(frame):
+    color_filter = compile_filter("invert")
+    assert color_filter.passes == 1
+    out = color_filter.apply(frame.copy())
+    assert np.array_equal(out[..., :3], 255 - frame[..., :3])
+
+def test_grayscale_matches_luma(frame):
+    out = compile_filter("grayscale").apply(frame.copy())
+    expected = reference(frame, np.tile([0.299, 0.587, 0.114], (3, 1)))
+    assert np.abs(out[..., :3].astype(int) - expected).max() <= 1
+
+def test_filter_and_invert_fuse_into_one_pass(frame):
+    color_filter = compile_filter("deutan_correction", invert=True)
+    assert color_filter.passes == 1
+    plain = compile_filter("deutan_correction").apply(frame.copy())
+    fused = color_filter.apply(frame.copy())
+    # One fused pass skips the intermediate clip, so only clipped pixels may differ
+    assert np.mean(np.abs(fused[..., :3].astype(int) - (255 - plain[..., :3].astype(int))) <= 1) > 0.9
+
+def test_invert_and_gamma_compose_into_one_lut(frame):
+    color_filter = compile_filter("none", invert=True, gamma=2.0)
+    assert color_filter.passes == 1
+    out = color_filter.apply(frame.copy())
+    expected = np.rint(255 * ((255 - frame[..., :3]) / 255) ** 0.5)
+    assert np.abs(out[..., :3] - expected).max() <= 1
+
+def test_yellow_on_black(frame):
+    white = np.full((2, 2, 4), 255, dtype=np.uint8)
+    black = np.zeros((2, 2, 4), dtype=np.uint8)
+    color_filter = compile_filter("yellow_on_black")
+    assert tuple(color_filter.apply(white)[0, 0, :3]) == (0, 0, 0)
+    assert tuple(color_filter.apply(black)[0, 0, :3]) == (0, 255, 255)   # BGR yellow
+
+def test_compiled_filters_are_cached():
+    assert compile_filter("protan_simulation", False, 1.0) is compile_filter("protan_simulation", False, 1.0)
+    assert filter_from_settings({"magnifier_filter": "none"}).passes == 0
+
+def test_color_effect_for_matrix_filters_only():
+    effect = compile_filter("invert").color_effect()
+    assert effect[0, 0] == -1 and effect[4, 0] == 1
+    assert compile_filter("grayscale", gamma=2.2).color_effect() is None
+
+def test_pipeline_filters_before_scaling(frame):
+    pipeline = FramePipeline(border_thickness=0, interpolation="nearest", color_filter=compile_filter("invert"))
+    out = pipeline.render(frame.copy(), (60, 40))
+    assert np.array_equal(out[::2, ::2, :3], 255 - frame[..., :3])
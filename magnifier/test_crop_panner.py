@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from magnifier.crop_panner import CropPanner
+from magnifier.viewport import centered_region
+from capture.synthetic import SyntheticCapture
+
+BOUNDS = (0, 0, 640, 480)
+
+
+@pytest.fixture
+def capture():
+    return SyntheticCapture(640, 480, animate_every=0)
+
+
+def test_small_moves_reuse_the_padded_capture(capture):
+    panner = CropPanner(padding=3.0, refresh=60)
+    for mx in range(300, 340, 4):
+        view = centered_region(mx, 240, 75, 50, BOUNDS)
+        crop = panner.frame_for(capture, view, BOUNDS)
+        expected = SyntheticCapture(640, 480, animate_every=0).grab(view).array()
+        assert np.array_equal(crop, expected)
+    assert capture.grabs == 1
+    assert panner.stats()["grabs_per_frame"] == 0.1
+
+
+def test_leaving_the_padded_area_recaptures(capture):
+    panner = CropPanner(padding=2.0, refresh=60)
+    panner.frame_for(capture, centered_region(100, 100, 75, 50, BOUNDS), BOUNDS)
+    panner.frame_for(capture, centered_region(400, 300, 75, 50, BOUNDS), BOUNDS)
+    assert capture.grabs == 2
+
+
+def test_stale_snapshot_is_refreshed(capture):
+    panner = CropPanner(refresh=0)
+    view = centered_region(320, 240, 75, 50, BOUNDS)
+    panner.frame_for(capture, view, BOUNDS)
+    panner.frame_for(capture, view, BOUNDS)
+    assert capture.grabs == 2
+
+
+def test_static_screen_is_checked_with_lens_sized_grabs(capture):
+    panner = CropPanner(padding=3.0, refresh=0.5)
+    view = centered_region(320, 240, 75, 50, BOUNDS)
+    for frame in range(20):
+        panner.frame_for(capture, view, BOUNDS, now=frame * 0.25)
+    stats = panner.stats()
+    # One padded grab, then a view-sized check every other frame
+    assert stats["grabs"] - stats["checks"] == 1 and stats["checks"] == 9
+    assert stats["pixels_per_frame"] < 75 * 50
+
+
+def test_changes_seen_by_the_check_recapture_the_padded_area(capture):
+    panner = CropPanner(padding=3.0, refresh=0.5)
+    view = centered_region(320, 240, 75, 50, BOUNDS)
+    panner.frame_for(capture, view, BOUNDS, now=0.0)
+    capture.desktop[240:250, 300:340] = (0, 0, 255, 255)
+    assert panner.frame_for(capture, view, BOUNDS, now=0.25)[25, 30, 2] != 255   # not checked yet
+    crop = panner.frame_for(capture, view, BOUNDS, now=0.5)
+    assert np.array_equal(crop, capture.grab(view).array())
+    assert panner.stats()["grabs"] - panner.stats()["checks"] == 2
+
+
+def test_crop_is_safe_to_filter_in_place(capture):
+    panner = CropPanner(refresh=60)
+    view = centered_region(320, 240, 75, 50, BOUNDS)
+    first = panner.frame_for(capture, view, BOUNDS)
+    original = first.copy()
+    first[...] = 0
+    assert np.array_equal(panner.frame_for(capture, view, BOUNDS), original)
@@ -0,0 +1,41 @@
+import numpy as np
+
+from magnifier.cursor_filter import CursorSmoother, OneEuroFilter
+
+FRAME = 1 / 60
+
+
+def run(smoother, positions):
+    return [smoother.update(x, y, t=i * FRAME) for i, (x, y) in enumerate(positions)]
+
+def test_tremor_inside_the_dead_zone_holds_the_view():
+    rng = np.random.default_rng(0)
+    tremor = [(500 + dx, 300 + dy) for dx, dy in rng.integers(-1, 2, (120, 2))]
+    outputs = run(CursorSmoother(), tremor)
+    raw_changes = sum(a != b for a, b in zip(tremor, tremor[1:]))
+    smoothed_changes = sum(a != b for a, b in zip(outputs, outputs[1:]))
+    assert smoothed_changes < raw_changes / 10
+
+def test_still_cursor_settles_on_its_position():
+    smoother = CursorSmoother()
+    outputs = run(smoother, [(100, 100)] * 5 + [(400, 100)] * 120)
+    assert abs(outputs[-1][0] - 400) <= smoother.dead_zone
+    assert smoother.settled
+
+def test_prediction_leads_a_steady_motion():
+    path = [(100 + 10 * i, 200) for i in range(60)]
+    predicted = run(CursorSmoother(prediction=0.05, dead_zone=0), path)
+    plain = run(CursorSmoother(prediction=0.0, dead_zone=0), path)
+    assert predicted[-1][0] > plain[-1][0]
+    assert predicted[-1][0] - plain[-1][0] <= 40     # capped at max_prediction
+
+def test_disabled_smoother_passes_positions_through():
+    smoother = CursorSmoother(enabled=False)
+    assert run(smoother, [(1, 2), (3, 4)]) == [(1, 2), (3, 4)]
+
+def test_one_euro_follows_fast_motion_with_less_lag():
+    slow, fast = OneEuroFilter(beta=0.0), OneEuroFilter(beta=0.05)
+    for i in range(30):
+        slow(20 * i, i * FRAME)
+        fast(20 * i, i * FRAME)
+    assert 580 - fast.value < 580 - slow.value
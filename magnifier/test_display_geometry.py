@@ -0,0 +1,66 @@
+import sys
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+from magnifier.display_geometry import DisplayGeometry, Monitor, ScreenLayout
+from magnifier.magnification import FakeMagnification, FullscreenView
+from magnifier.viewport import centered_region
+
+# Primary 1920x1080 with a 1280x1024 monitor to its left, top-aligned
+DUAL = ScreenLayout([Monitor(0, 0, 1920, 1080, 96.0, 1.0), Monitor(-1280, 0, 1280, 1024, 96.0, 1.0)])
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = QApplication.instance() or QApplication(sys.argv)
+    yield app
+
+def test_virtual_bounds_span_all_monitors():
+    assert DUAL.virtual_bounds == (-1280, 0, 3200, 1080)
+    assert DUAL.primary.left == 0
+
+def test_monitor_lookup():
+    assert DUAL.bounds_at(100, 100) == (0, 0, 1920, 1080)
+    assert DUAL.bounds_at(-1, 500) == (-1280, 0, 1280, 1024)
+    # Below the shorter left monitor: nearest is still the left one
+    assert DUAL.bounds_at(-640, 1060) == (-1280, 0, 1280, 1024)
+    assert DUAL.clamp(-640, 1060) == (-640, 1023)
+
+def test_lens_stays_on_the_monitor_under_the_cursor():
+    """A lens near the shared edge must not straddle both monitors."""
+    region = centered_region(-10, 500, 150, 100, DUAL.bounds_at(-10, 500))
+    assert region["left"] + region["width"] == 0
+    region = centered_region(10, 500, 150, 100, DUAL.bounds_at(10, 500))
+    assert region["left"] == 0
+
+def test_fullscreen_view_pans_secondary_monitor():
+    view = FullscreenView(FakeMagnification(1920, 1080), DUAL)
+    assert view.view_for(2.0, -1280, 0) == (2.0, -1280, 0)
+    assert view.view_for(2.0, 1920, 1080) == (2.0, 960, 540)
+
+def test_empty_layout_falls_back_to_one_screen():
+    assert ScreenLayout([]).bounds_at(5, 5) == (0, 0, 1920, 1080)
+
+def test_geometry_reads_qt_screens_once(app):
+    geometry = DisplayGeometry(app)
+    screen = app.primaryScreen().geometry()
+    assert geometry.layout.primary[:4] == (screen.x(), screen.y(), screen.width(), screen.height())
+    refreshes = geometry.refreshes
+    for x in range(100):
+        geometry.bounds_at(x, x)
+    assert geometry.refreshes == refreshes
+
+def test_unchanged_refresh_does_not_notify(app):
+    geometry = DisplayGeometry(app)
+    notified = []
+    geometry.changed.connect(lambda: notified.append(True))
+    geometry.refresh()
+    assert notified == []
+    assert geometry.stats()["monitors"] == len(app.screens())
+
+def test_scaled_monitor_lookups_are_physical():
+    """At 150% a 2560x1440 panel reports 1707x960 logical pixels; lookups use the physical size."""
+    layout = ScreenLayout([Monitor(0, 0, 1707, 960, 144.0, 1.5)])
+    assert layout.bounds_at(2500, 1400) == (0, 0, 2560, 1440)
+    assert layout.primary.physical_size((300, 200)) == (450, 300)
+    assert layout.to_logical(1500, 900) == (1000, 600)
@@ -0,0 +1,92 @@
+import sys
+import cv2
+import numpy as np
+import pytest
+from PyQt5.QtWidgets import QApplication
+from magnifier.frame_pipeline import FramePipeline
+
+
+def make_raw(width, height, value=10):
+    return bytearray(np.full((height, width, 4), value, dtype=np.uint8).tobytes())
+
+def test_buffer_reused_across_frames():
+    """The same capture/target size pair must hand back the same buffer."""
+    pipeline = FramePipeline()
+    first = pipeline.render(pipeline.wrap(make_raw(150, 100), 150, 100), (300, 200))
+    second = pipeline.render(pipeline.wrap(make_raw(150, 100), 150, 100), (300, 200))
+    assert first is second
+    assert first.shape == (200, 300, 4)
+
+def test_buffer_cache_is_bounded():
+    pipeline = FramePipeline()
+    for width in range(10, 10 + FramePipeline.MAX_BUFFERS + 5):
+        pipeline.buffer_for((width, 10), (300, 200))
+    assert len(pipeline._buffers) == FramePipeline.MAX_BUFFERS
+
+def test_invert_and_border():
+    """Inversion happens on the colour channels and the border is drawn in green."""
+    pipeline = FramePipeline()
+    out = pipeline.render(pipeline.wrap(make_raw(30, 20, 10), 30, 20), (300, 200), invert=True)
+    assert tuple(out[100, 150]) == (245, 245, 245, 255)
+    assert tuple(out[0, 0]) == (0, 255, 0, 255)
+
+def test_read_only_input_is_not_modified():
+    pipeline = FramePipeline()
+    raw = bytes(make_raw(30, 20, 10))
+    out = pipeline.render(pipeline.wrap(raw, 30, 20), (60, 40), invert=True)
+    assert raw[0] == 10
+    assert tuple(out[20, 30]) == (245, 245, 245, 255)
+
+def test_integer_zoom_uses_pixel_replication():
+    pipeline = FramePipeline()
+    assert pipeline.interpolation_for((37, 25), (300, 200)) == cv2.INTER_NEAREST   # 8x, int(300 / 8)
+    assert pipeline.interpolation_for((66, 44), (300, 200)) == cv2.INTER_NEAREST   # 4.5x
+    assert pipeline.interpolation_for((150, 100), (300, 200)) == cv2.INTER_LINEAR  # 2x is still smoothed
+    assert pipeline.interpolation_for((81, 54), (300, 200)) == cv2.INTER_LINEAR    # 3.7x
+    assert FramePipeline(interpolation="cubic").interpolation_for((37, 25), (300, 200)) == cv2.INTER_CUBIC
+    assert FramePipeline(interpolation="nearest").interpolation_for((150, 100), (300, 200)) == cv2.INTER_NEAREST
+
+@pytest.mark.parametrize("interpolation, capture_size", [
+    ("nearest", (60, 40)), ("linear", (37, 25)), ("cubic", (60, 40))
+])
+def test_region_render_matches_full_render_per_tier(interpolation, capture_size):
+    width, height = capture_size
+    rng = np.random.default_rng(1)
+    base = rng.integers(0, 256, (height, width, 4), dtype=np.uint8)
+    changed = base.copy()
+    changed[10:18, 20:30] = 255
+
+    pipeline = FramePipeline(border_thickness=0, interpolation=interpolation)
+    pipeline.render(base.copy(), (300, 200), invert=True)
+    partial = pipeline.render_region(changed.copy(), (300, 200), (16, 8, 32, 24), invert=True).copy()
+    full = FramePipeline(border_thickness=0, interpolation=interpolation).render(changed.copy(), (300, 200), invert=True)
+    assert np.abs(partial.astype(int) - full.astype(int)).max() <= 1
+
+def test_painter_scaling_follows_the_tier():
+    pipeline = FramePipeline()
+    assert pipeline.painter_scaling((150, 100), (300, 200)) is True     # linear
+    assert pipeline.painter_scaling((37, 25), (300, 200)) is False      # 8x replication
+    assert FramePipeline(interpolation="nearest").painter_scaling((150, 100), (300, 200)) is False
+    # Output-space work the painter can't do keeps the resize path
+    assert FramePipeline(interpolation="cubic").painter_scaling((150, 100), (300, 200)) is None
+    assert FramePipeline(interpolation="sharp_text").painter_scaling((150, 100), (300, 200)) is None
+    assert FramePipeline(shape="circle").painter_scaling((150, 100), (300, 200)) is None
+
+def test_render_source_filters_a_copy_at_capture_size():
+    pipeline = FramePipeline()
+    raw = bytes(make_raw(30, 20, 10))
+    source = pipeline.render_source(pipeline.wrap(raw, 30, 20), invert=True)
+    assert source.shape == (20, 30, 4) and raw[0] == 10
+    assert tuple(source[5, 5]) == (245, 245, 245, 255)
+    assert pipeline.render_source(pipeline.wrap(raw, 30, 20)) is source
+
+@pytest.fixture(scope="module")
+def app():
+    app = QApplication.instance() or QApplication(sys.argv)
+    yield app
+
+def test_pixmap_keeps_physical_pixels_at_logical_size(app):
+    buffer = np.zeros((300, 450, 4), dtype=np.uint8)
+    pixmap = FramePipeline.to_pixmap(buffer, 1.5)
+    assert (pixmap.width(), pixmap.height()) == (450, 300)
+    assert pixmap.devicePixelRatio() == 1.5
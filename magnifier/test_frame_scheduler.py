@@ -0,0 +1,41 @@
+import pytest
+from PyQt5.QtWidgets import QApplication
+from magnifier.frame_scheduler import AdaptiveFrameScheduler
+import sys
+
+@pytest.fixture(scope="module")
+def app():
+    app = QApplication.instance() or QApplication(sys.argv)
+    yield app
+
+@pytest.fixture
+def scheduler(app):
+    sched = AdaptiveFrameScheduler(lambda: False, target_fps=50, idle_fps=5, idle_delay=0.0)
+    sched.start()
+    yield sched
+    sched.stop()
+
+def test_starts_at_target_rate(scheduler):
+    assert scheduler.interval == 20
+    assert scheduler.idle is False
+
+def test_drops_to_idle_when_unchanged(scheduler):
+    scheduler.report(False)
+    assert scheduler.idle is True
+    assert scheduler.interval == 200
+
+def test_change_restores_full_rate(scheduler):
+    scheduler.report(False)
+    scheduler.report(True)
+    assert scheduler.idle is False
+    assert scheduler.interval == 20
+
+def test_wake_restores_full_rate(scheduler):
+    scheduler.report(False)
+    scheduler.wake()
+    assert scheduler.idle is False
+    assert scheduler.interval == 20
+
+def test_idle_rate_never_exceeds_target(app):
+    sched = AdaptiveFrameScheduler(lambda: False, target_fps=10, idle_fps=30)
+    assert sched.idle_interval == sched.target_interval
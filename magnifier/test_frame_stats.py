@@ -0,0 +1,28 @@
+import json
+import time
+from magnifier.frame_stats import FrameStats
+
+
+def test_percentiles_in_milliseconds():
+    result = FrameStats.percentiles([i / 1000 for i in range(1, 101)])
+    assert result["p50"] == 51.0
+    assert result["p95"] == 95.0
+    assert result["p99"] == 99.0
+    assert result["count"] == 100
+
+def test_snapshot_is_json_serialisable():
+    stats = FrameStats(window=10)
+    started = time.perf_counter()
+    stats.record("capture", started)
+    stats.frame_done(started, budget=0.0)
+    snapshot = json.loads(json.dumps(stats.snapshot()))
+    assert snapshot["frames"] == 1
+    assert snapshot["late"] == 1
+    assert "capture" in snapshot["stages_ms"]
+    assert "resize" not in snapshot["stages_ms"]
+
+def test_rolling_window_is_bounded():
+    stats = FrameStats(window=5)
+    for _ in range(20):
+        stats.record("resize", time.perf_counter())
+    assert stats.snapshot()["stages_ms"]["resize"]["count"] == 5
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from magnifier.freeze_frame import FreezeFrame
+from magnifier.viewport import centered_region
+from capture.synthetic import SyntheticCapture
+
+BOUNDS = (0, 0, 640, 480)
+
+
+@pytest.fixture
+def capture():
+    return SyntheticCapture(640, 480, animate_every=0)
+
+
+def test_pans_and_zooms_come_from_one_snapshot(capture):
+    freeze = FreezeFrame(check_interval=60)
+    freeze.toggle()
+    for mx, size in ((100, (150, 100)), (320, (75, 50)), (600, (30, 20))):
+        view = centered_region(mx, 240, *size, BOUNDS)
+        crop = freeze.frame_for(capture, view, BOUNDS)
+        assert np.array_equal(crop, SyntheticCapture(640, 480, animate_every=0).grab(view).array())
+    assert capture.grabs == 1
+    assert freeze.stats() == {"active": True, "snapshots": 1, "refreshes": 0}
+
+
+def test_screen_update_retakes_the_snapshot(capture):
+    freeze = FreezeFrame(check_interval=0)
+    freeze.toggle()
+    view = centered_region(320, 240, 75, 50, BOUNDS)
+    freeze.frame_for(capture, view, BOUNDS)
+    freeze.frame_for(capture, view, BOUNDS)
+    assert freeze.refreshes == 0
+
+    capture.desktop[200:280, 280:360] = 0
+    assert not freeze.frame_for(capture, view, BOUNDS).any()
+    assert freeze.refreshes == 1
+
+
+def test_unfreeze_drops_the_snapshot(capture):
+    freeze = FreezeFrame()
+    assert freeze.toggle() is True
+    freeze.frame_for(capture, centered_region(320, 240, 75, 50, BOUNDS), BOUNDS)
+    assert freeze.toggle() is False
+    assert freeze._frame is None
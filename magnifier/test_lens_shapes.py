@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from magnifier.lens_shapes import SHAPES, lens_mask
+from magnifier.frame_pipeline import FramePipeline
+
+SIZE = (300, 200)
+
+
+def frame(value=128):
+    return np.full((SIZE[1], SIZE[0], 4), value, dtype=np.uint8)
+
+@pytest.mark.parametrize("shape", [s for s in SHAPES if s != "rectangle"])
+def test_corners_are_transparent_and_centre_untouched(shape):
+    output = lens_mask(shape, SIZE).composite(frame(), np.empty_like(frame()))
+    assert tuple(output[0, 0]) == (0, 0, 0, 0)
+    assert tuple(output[100, 150]) == (128, 128, 128, 128)
+
+def test_edges_are_antialiased():
+    output = lens_mask("circle", SIZE, border_thickness=0).composite(frame(), np.empty_like(frame()))
+    alpha = output[..., 3]
+    assert np.count_nonzero((alpha > 0) & (alpha < 255)) > 100
+
+def test_output_is_premultiplied():
+    output = lens_mask("ellipse", SIZE, border_thickness=0).composite(frame(200), np.empty_like(frame()))
+    assert np.all(output[..., :3].max(axis=2) <= output[..., 3])
+
+def test_border_ring_uses_border_colour():
+    output = lens_mask("circle", SIZE, border_thickness=3, border_color=(0, 255, 0, 255)).composite(
+        frame(0), np.empty_like(frame()))
+    # Leftmost point of the circle sits on the ring
+    b, g, r, a = output[100, 52]
+    assert g > 200 and b == 0 and r == 0
+
+def test_masks_are_cached_per_shape_and_size():
+    assert lens_mask("circle", SIZE) is lens_mask("circle", SIZE)
+    assert lens_mask("circle", SIZE) is not lens_mask("circle", (200, 200))
+
+def test_partial_renders_keep_the_mask_intact():
+    """The mask is composited into its own buffer, so ROI updates never blend it twice."""
+    pipeline = FramePipeline(shape="circle")
+    source = frame()[:100, :150].copy()
+    full = pipeline.render(source.copy(), SIZE).copy()
+    again = pipeline.render_region(source.copy(), SIZE, (10, 10, 20, 20)).copy()
+    assert np.array_equal(full, again)
+
+def test_rectangle_keeps_the_drawn_border():
+    output = FramePipeline(shape="rectangle").render(frame()[:100, :150].copy(), SIZE)
+    assert tuple(output[0, 0]) == (0, 255, 0, 255)
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from magnifier.magnification import FakeMagnification, FullscreenView
+from magnifier.color_filters import compile_filter
+
+
+@pytest.fixture
+def backend():
+    return FakeMagnification(1920, 1080)
+
+def test_transform_pushed_only_on_change(backend):
+    view = FullscreenView(backend)
+    assert view.update(2.0, 960, 540) is True
+    assert view.update(2.0, 960, 540) is False
+    assert view.update(2.0, 961, 540) is False    # same offset after rounding
+    assert view.update(2.0, 1400, 540) is True
+    assert backend.transforms() == [("transform", 2.0, 480, 270), ("transform", 2.0, 700, 270)]
+    assert view.stats() == {"transforms_pushed": 2, "transforms_skipped": 2}
+
+def test_unzoomed_view_is_pushed_once(backend):
+    view = FullscreenView(backend)
+    for x in range(0, 1920, 100):
+        view.update(1.0, x, 300)
+    assert backend.transforms() == [("transform", 1.0, 0, 0)]
+
+def test_reset_forces_the_next_push(backend):
+    view = FullscreenView(backend)
+    view.update(3.0, 100, 100)
+    view.reset()
+    view.update(3.0, 100, 100)
+    assert len(backend.transforms()) == 2
+
+def test_color_effect_pushed_once_per_filter(backend):
+    view = FullscreenView(backend)
+    invert = compile_filter("invert")
+    assert view.set_color_filter(invert) is True
+    assert view.set_color_filter(invert) is False
+    effects = [call[1] for call in backend.calls if call[0] == "color_effect"]
+    assert len(effects) == 1 and np.allclose(effects[0][0, :3], (-1, 0, 0))
+
+def test_fake_backend_delivers_cursor_moves(backend):
+    moves = []
+    assert backend.watch_cursor(lambda x, y: moves.append((x, y)))
+    backend.move_cursor(10, 20)
+    backend.unwatch_cursor()
+    backend.move_cursor(30, 40)
+    assert moves == [(10, 20)]
+    assert backend.cursor_pos() == (30, 40)
+    assert FakeMagnification(notify=False).watch_cursor(print) is False
+
+def test_second_watch_replaces_the_first(backend):
+    moves = []
+    backend.watch_cursor(lambda x, y: moves.append(("first", x, y)))
+    backend.watch_cursor(lambda x, y: moves.append(("second", x, y)))
+    backend.move_cursor(50, 60)
+    assert moves == [("second", 50, 60)]
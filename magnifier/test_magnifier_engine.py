@@ -0,0 +1,91 @@
+import pytest
+import sys
+import numpy as np
+from types import SimpleNamespace
+from PyQt5.QtWidgets import QApplication
+
+from capture.synthetic import SyntheticCapture
+from magnifier import zoom_transition
+from magnifier.capture_worker import FrameSlot, idle_render
+from magnifier.magnifier_engine import MagnifierEngine
+from magnifier.magnification import FakeMagnification
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = QApplication.instance() or QApplication(sys.argv)
+    yield app
+
+@pytest.fixture
+def engine(app):
+    engine = MagnifierEngine("hover", fullscreen_backend=FakeMagnification(), capture_factory=SyntheticCapture,
+                             cursor=lambda: (500, 400))
+    yield engine
+    engine.exit()
+
+def test_modes_switch_in_process(engine):
+    hover = engine.view
+    assert engine.mode == "hover" and hover.isVisible()
+    engine.handle_command("mode docked")
+    assert engine.mode == "docked" and engine.view.isVisible() and not hover.isVisible()
+    engine.handle_command("mode hover")
+    # The hover mode is kept and reused, on the same capture thread
+    assert engine.view is hover and hover.worker is engine.worker
+    assert engine.switches == 3 and engine.frame_stats()["mode"] == "hover"
+
+def test_leaving_fullscreen_restores_the_desktop(engine):
+    engine.handle_command("mode fullscreen")
+    fullscreen = engine.view
+    fullscreen.zoom_in()
+    fullscreen.update_magnifier()
+    assert fullscreen.backend.transforms()[-1][1] > 1.0
+    engine.handle_command("next_mode")
+    assert engine.mode == "hover"
+    assert fullscreen.backend.transforms()[-1] == ("transform", 1.0, 0, 0)
+    # Cursor moves no longer reach the OS while another mode is shown
+    calls = len(fullscreen.backend.calls)
+    fullscreen.backend.move_cursor(10, 10)
+    assert fullscreen.update_magnifier() is False and len(fullscreen.backend.calls) == calls
+
+def test_fullscreen_mode_installs_one_cursor_watch(engine):
+    backend = engine.fullscreen_backend
+    engine.handle_command("mode fullscreen")
+    assert backend.watching and backend.watches == 1
+    engine.handle_command("mode hover")
+    assert not backend.watching
+    engine.handle_command("mode fullscreen")
+    assert backend.watching and backend.watches == 2
+
+def test_unknown_mode_keeps_the_current_one(engine):
+    assert not engine.switch_mode("sideways")
+    assert engine.mode == "hover"
+
+def test_commands_the_mode_lacks_are_ignored(engine):
+    engine.handle_command("mode fullscreen")
+    engine.handle_command("freeze")
+    assert engine.mode == "fullscreen"
+
+def test_live_frame_replaces_the_last_zoom_animation_frame(engine, monkeypatch):
+    view = engine.view
+    engine.worker.set_render(idle_render)   # frames are rendered by the test only
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(zoom_transition, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    capture, slot = SyntheticCapture(animate_every=0), FrameSlot()
+
+    start = view.scale_factor
+    view.render_frame(capture, slot)
+    live = view._output.copy()
+
+    # e.g. 2.0 -> 2.5 -> 2.0: the in-between frames share the live output buffer
+    view.scale_factor = start + 0.5
+    view.render_frame(capture, slot)
+    clock.now = view.zoom.duration / 2
+    view.render_frame(capture, slot)
+    view.scale_factor = start
+    view.render_frame(capture, slot)
+    assert not np.array_equal(view._output, live)
+
+    clock.now = view.zoom.duration * 2
+    view.render_frame(capture, slot)
+    assert not view.zoom.active
+    assert np.array_equal(view._output, live)
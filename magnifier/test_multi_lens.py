@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from magnifier.multi_lens import LensBatch, PinnedLens, bounding_region
+from magnifier.capture_worker import FrameSlot
+from magnifier.color_filters import compile_filter
+from capture.synthetic import SyntheticCapture
+
+BOUNDS = (0, 0, 1280, 720)
+TARGET = (300, 200)
+
+
+class CountingCapture(SyntheticCapture):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.regions = []
+
+    def grab(self, region):
+        self.regions.append(dict(region))
+        return super().grab(region)
+
+
+@pytest.fixture
+def capture():
+    return CountingCapture(1280, 720, animate_every=0)
+
+def direct(capture, region):
+    return np.array(SyntheticCapture.grab(capture, region).array())
+
+def test_nearby_lenses_share_one_grab(capture):
+    regions = [{"left": 100, "top": 100, "width": 150, "height": 100},
+               {"left": 200, "top": 150, "width": 150, "height": 100},
+               {"left": 120, "top": 220, "width": 150, "height": 100}]
+    frames = LensBatch().grab(capture, regions)
+    assert capture.regions == [bounding_region(regions)]
+    for frame, region in zip(frames, regions):
+        assert np.array_equal(frame, direct(capture, region))
+
+def test_distant_lenses_are_grabbed_separately(capture):
+    regions = [{"left": 0, "top": 0, "width": 150, "height": 100},
+               {"left": 1130, "top": 620, "width": 150, "height": 100}]
+    batch = LensBatch()
+    frames = batch.grab(capture, regions)
+    assert capture.regions == regions
+    assert batch.stats()["merged"] == 0
+    assert np.array_equal(frames[1], direct(capture, regions[1]))
+
+def test_overlapping_lenses_filter_their_own_copy(capture):
+    regions = [{"left": 100, "top": 100, "width": 150, "height": 100},
+               {"left": 150, "top": 120, "width": 150, "height": 100}]
+    first, second = LensBatch().grab(capture, regions)
+    lenses = [PinnedLens(1, 175, 150), PinnedLens(2, 225, 170)]
+    for lens, frame, region in zip(lenses, (first, second), regions):
+        lens.pipeline.color_filter = compile_filter(invert=True)
+        assert lens.render(frame, region, TARGET, "inverted")
+    # Inverting the first lens in place must not touch the pixels it shares with the second
+    alone = PinnedLens(3, 225, 170)
+    alone.pipeline.color_filter = compile_filter(invert=True)
+    alone.render(direct(capture, regions[1]), regions[1], TARGET, "inverted")
+    assert np.array_equal(lenses[1].output, alone.output)
+
+def test_pinned_lens_only_rerenders_on_change(capture):
+    lens = PinnedLens(1, 640, 360)
+    region = lens.region(2.0, TARGET, BOUNDS)
+    assert (region["width"], region["height"]) == (150, 100)
+    assert lens.render(direct(capture, region), region, TARGET, None)
+    assert not lens.render(direct(capture, region), region, TARGET, None)
+    assert lens.output.shape == (200, 300, 4) and lens.image_seq == 1
+
+def test_slot_keeps_only_current_lenses():
+    slot = FrameSlot()
+    image = np.zeros((4, 4, 4), dtype=np.uint8)
+    slot.store_lenses({1: (image, 1), 2: (image, 1)})
+    image[:] = 7
+    slot.store_lenses({2: (image, 2)})
+    assert list(slot.lenses) == [2]
+    assert slot.lenses[2][1] == 2 and slot.lenses[2][0][0, 0, 0] == 7
+    assert slot.lenses[2][0] is not image
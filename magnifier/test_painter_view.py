@@ -0,0 +1,86 @@
+import sys
+import cv2
+import numpy as np
+import pytest
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QImage
+from magnifier.capture_worker import TripleBuffer
+from magnifier.painter_view import PainterFrameView
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = QApplication.instance() or QApplication(sys.argv)
+    yield app
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (40, 60, 4), dtype=np.uint8)
+    frame[..., 3] = 255
+    return frame
+
+def painted(view):
+    """Paints the view into an image of its size and returns the BGRA pixels."""
+    image = QImage(view.width(), view.height(), QImage.Format_RGB32)
+    view.render(image)
+    pixels = np.frombuffer(image.constBits().asstring(image.sizeInBytes()), dtype=np.uint8)
+    return pixels.reshape(view.height(), view.width(), 4)
+
+def test_unsmoothed_scaling_replicates_pixels_like_cv2(app, frame):
+    view = PainterFrameView()
+    view.resize(240, 160)
+    view.set_frame(frame, smooth=False)
+    reference = cv2.resize(frame, (240, 160), interpolation=cv2.INTER_NEAREST)
+    assert np.array_equal(painted(view)[..., :3], reference[..., :3])
+
+def test_smooth_scaling_is_close_to_linear_resize(app, frame):
+    view = PainterFrameView()
+    view.resize(240, 160)
+    view.set_frame(frame, smooth=True)
+    reference = cv2.resize(frame, (240, 160), interpolation=cv2.INTER_LINEAR)
+    difference = np.abs(painted(view)[..., :3].astype(int) - reference[..., :3])
+    assert difference.mean() < 2
+
+def test_border_is_drawn_over_the_scaled_frame(app, frame):
+    view = PainterFrameView()
+    view.resize(240, 160)
+    view.set_frame(frame, smooth=False, border=((0, 255, 0, 255), 2))
+    pixels = painted(view)
+    for y, x in ((0, 100), (1, 100), (159, 100), (80, 0), (80, 239)):
+        assert tuple(pixels[y, x]) == (0, 255, 0, 255)
+    assert np.array_equal(pixels[2:-2, 2:-2, :3],
+                          cv2.resize(frame, (240, 160), interpolation=cv2.INTER_NEAREST)[2:-2, 2:-2, :3])
+
+def test_clear_drops_the_frame(app, frame):
+    view = PainterFrameView()
+    view.set_frame(frame)
+    view.clear()
+    assert view._image is None and view._buffer is None
+
+def test_frame_survives_its_slot_being_reused(app, frame):
+    view = PainterFrameView()
+    view.resize(240, 160)
+    frames = TripleBuffer()
+    frames.back().store(frame, 1, (0, 0), smooth=False)
+    frames.publish()
+    view.set_frame(frames.take().image, smooth=False)
+    expected = painted(view).copy()
+
+    # Move-only frames: the lens presents nothing new while the producer
+    # cycles through the ring, writing into the slot the view was given
+    for pos in ((1, 0), (2, 0), (3, 0)):
+        frames.back().store(np.zeros_like(frame), 1, pos, smooth=False)
+        frames.publish()
+        frames.take()
+    assert np.array_equal(painted(view), expected)
+
+def test_next_frame_replaces_the_pixels_in_place(app, frame):
+    view = PainterFrameView()
+    view.resize(240, 160)
+    view.set_frame(frame, smooth=False)
+    buffer = view._buffer
+    view.set_frame(255 - frame, smooth=False)
+    reference = cv2.resize(255 - frame, (240, 160), interpolation=cv2.INTER_NEAREST)
+    assert view._buffer is buffer
+    assert np.array_equal(painted(view)[..., :3], reference[..., :3])
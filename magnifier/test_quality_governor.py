@@ -0,0 +1,85 @@
+from magnifier.quality_governor import QualityGovernor, Knobs, LADDER
+
+USER = Knobs("text", 3.0, True, 60)
+
+
+def feed(governor, frame_ms, now, frames=None):
+    """Feeds one evaluation window of frames costing `frame_ms`; returns True if the level changed."""
+    changed = False
+    for _ in range(frames or governor.window):
+        changed = governor.observe(frame_ms / 1000, now=now) or changed
+    return changed
+
+
+def test_fast_frames_keep_the_users_settings():
+    governor = QualityGovernor()
+    assert governor.apply(USER) == USER
+    assert not feed(governor, 5, now=0.0)
+    assert governor.level == 0 and not governor.decisions
+
+def test_over_budget_steps_down_one_knob_per_window():
+    governor = QualityGovernor()
+    governor.apply(USER)
+    assert feed(governor, 20, now=0.0)
+    assert governor.apply(USER) == Knobs("text", 2.0, True, 60)
+    assert feed(governor, 20, now=0.5)
+    assert governor.apply(USER) == Knobs("sharp", 2.0, True, 60)
+
+    decision = governor.decisions[-1]
+    assert decision["direction"] == "down" and decision["knob"] == "quality" and decision["cap"] == "sharp"
+    assert decision["p90_ms"] == 20 and round(decision["budget_ms"], 1) == 16.7
+
+def test_steps_that_change_nothing_are_skipped():
+    governor = QualityGovernor()
+    user = Knobs("fast", 1.0, False, 60)    # no padding, no gamma curve, cheapest tier
+    governor.apply(user)
+    feed(governor, 20, now=0.0)
+    assert governor.level == LADDER.index(("fps", 45)) + 1
+    assert governor.apply(user) == Knobs("fast", 1.0, False, 45)
+
+def test_lower_frame_rate_gives_slow_frames_a_larger_budget():
+    governor = QualityGovernor()
+    governor.apply(USER)
+    for window in range(len(LADDER)):
+        feed(governor, 25, now=window * 0.5)
+    # 25 ms frames fit the 33 ms budget at 30 fps, so the governor settles there
+    assert governor.apply(USER) == Knobs("fast", 1.5, False, 30)
+
+def test_steps_up_after_holding_with_headroom():
+    governor = QualityGovernor(hold=2.0)
+    governor.apply(USER)
+    feed(governor, 20, now=0.0)
+    feed(governor, 20, now=0.5)
+
+    # Inside the budget but without headroom, or too soon: stay
+    assert not feed(governor, 12, now=5.0)
+    assert not feed(governor, 5, now=1.0)
+    assert feed(governor, 5, now=5.0)
+    assert governor.apply(USER) == Knobs("text", 2.0, True, 60)
+    assert governor.decisions[-1]["direction"] == "up"
+    assert not feed(governor, 5, now=6.0)
+    assert feed(governor, 5, now=8.0)
+    assert governor.level == 0 and governor.stats()["steps_up"] == 2
+
+def test_present_cost_counts_towards_the_frame():
+    governor = QualityGovernor()
+    governor.apply(USER)
+    governor.presented(0.008)
+    assert feed(governor, 10, now=0.0)
+
+def test_disabled_governor_changes_nothing():
+    governor = QualityGovernor(enabled=False)
+    assert governor.apply(USER) == USER
+    assert not feed(governor, 50, now=0.0)
+    assert governor.stats()["level"] == 0
+
+def test_step_up_skips_steps_that_change_nothing():
+    governor = QualityGovernor(hold=0.0)
+    user = Knobs("balanced", 1.0, True, 60)
+    governor.apply(user)
+    feed(governor, 20, now=0.0)
+    assert governor.decisions[-1]["knob"] == "curves"
+
+    assert feed(governor, 2, now=1.0)
+    assert governor.level == 0 and governor.decisions[-1]["knob"] == "curves"
+    assert not feed(governor, 2, now=2.0)
@@ -0,0 +1,61 @@
+import cv2
+import numpy as np
+
+from magnifier.text_sharpen import TextSharpener
+from magnifier.frame_pipeline import FramePipeline
+
+DARK, LIGHT = 60, 200
+
+
+def upscaled_edge(scale=6):
+    """A vertical dark/light edge, upscaled the way the sharp-text tier does."""
+    frame = np.full((20, 20, 4), DARK, dtype=np.uint8)
+    frame[:, 10:] = LIGHT
+    frame[..., 3] = 255
+    return cv2.resize(frame, (20 * scale, 20 * scale), interpolation=cv2.INTER_LINEAR)
+
+def ramp_width(image):
+    row = image[image.shape[0] // 2, :, 0].astype(int)
+    return int(np.count_nonzero((row > DARK + 10) & (row < LIGHT - 10)))
+
+def test_edges_get_steeper_without_halos():
+    source = upscaled_edge()
+    output = TextSharpener().sharpen(source, np.empty_like(source), 6.0)
+    assert ramp_width(output) < ramp_width(source)
+    # Contrast-limited: nothing darker or lighter than the two sides of the edge
+    assert output[..., :3].min() >= DARK - 2 and output[..., :3].max() <= LIGHT + 2
+    assert (output[..., 3] == 255).all()
+
+def test_partial_sharpen_matches_full_sharpen():
+    source = upscaled_edge()
+    sharpener = TextSharpener()
+    full = sharpener.sharpen(source, np.empty_like(source), 6.0)
+    partial = np.zeros_like(source)
+    sharpener.sharpen(source, partial, 6.0, (40, 30, 90, 70))
+    # Half a window (6 pixels at 6x) around the rectangle is affected too
+    assert np.array_equal(partial[24:76, 34:96], full[24:76, 34:96])
+    assert not partial[:24].any() and not partial[:, :34].any()
+
+def test_kernels_are_precomputed_per_zoom_step():
+    sharpener = TextSharpener()
+    assert sharpener.kernel_for(4.1) is sharpener.kernel_for(3.9)
+    assert sharpener.kernel_for(8.0).window > sharpener.kernel_for(2.0).window
+
+def test_over_budget_burst_falls_back_until_it_settles():
+    sharpener = TextSharpener(budget_ms=1.0, settle=0.15)
+    sharpener.cost_per_pixel = 1e-6                 # 1 ms per 1000 pixels
+    assert sharpener.admit(2000, now=0.0)           # first frame of a burst always runs
+    assert sharpener.admit(500, now=0.02)
+    assert not sharpener.admit(2000, now=0.04)      # would take 2 ms
+    assert not sharpener.admit(10, now=0.06)        # rest of the burst stays on the cheap path
+    assert not sharpener.refine_due(now=0.1)
+    assert sharpener.refine_due(now=0.3)
+    assert sharpener.admit(2000, now=0.3)           # the settled view is sharpened
+    assert sharpener.stats()["fallbacks"] == 1 and sharpener.stats()["skipped"] == 2
+
+def test_pipeline_keeps_the_unsharpened_frame_for_partial_renders():
+    pipeline = FramePipeline(border_thickness=0, interpolation="sharp_text")
+    output = pipeline.render(upscaled_edge(1), (120, 120))
+    base = pipeline.buffer_for((20, 20), (120, 120))
+    assert output is not base
+    assert ramp_width(output) < ramp_width(base)
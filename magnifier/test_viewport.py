@@ -0,0 +1,33 @@
+from magnifier.viewport import centered_region, fullscreen_offset
+from capture.synthetic import SyntheticCapture, cursor_path
+
+BOUNDS = (0, 0, 1920, 1080)
+
+def test_region_centered_on_cursor():
+    assert centered_region(960, 540, 150, 100, BOUNDS) == {"left": 885, "top": 490, "width": 150, "height": 100}
+
+def test_region_shifted_not_shrunk_at_edges():
+    region = centered_region(5, 1079, 150, 100, BOUNDS)
+    assert region == {"left": 0, "top": 980, "width": 150, "height": 100}
+
+def test_region_respects_offset_bounds():
+    """Secondary monitors can start at negative coordinates."""
+    region = centered_region(-1900, 10, 150, 100, (-1920, 0, 1920, 1080))
+    assert region["left"] == -1920
+
+def test_fullscreen_offset_spans_hidden_area():
+    assert fullscreen_offset(0, 0, 1920, 1080, 2.0) == (0, 0)
+    assert fullscreen_offset(1920, 1080, 1920, 1080, 2.0) == (960, 540)
+    assert fullscreen_offset(1920, 1080, 1920, 1080, 1.0) == (0, 0)
+
+def test_synthetic_capture_matches_mss_shape():
+    capture = SyntheticCapture(640, 480)
+    shot = capture.grab({"left": 10, "top": 20, "width": 64, "height": 32})
+    assert (shot.width, shot.height) == (64, 32)
+    assert len(shot.raw) == 64 * 32 * 4
+    assert len(list(cursor_path("reading", 50, 640, 480))) == 50
+
+def test_fullscreen_offset_on_secondary_monitor():
+    """The viewport pans across the monitor under the cursor, not the primary one."""
+    assert fullscreen_offset(-1920, 0, 1920, 1080, 2.0, left=-1920, top=0) == (-1920, 0)
+    assert fullscreen_offset(0, 1080, 1920, 1080, 2.0, left=-1920, top=0) == (-960, 540)
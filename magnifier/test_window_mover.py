@@ -0,0 +1,40 @@
+from magnifier.window_mover import WindowMover
+from capture.synthetic import cursor_path
+
+
+def test_first_position_always_moves():
+    mover = WindowMover(threshold=2)
+    assert mover.update(100, 100) == (100, 100)
+
+def test_small_moves_are_skipped():
+    mover = WindowMover(threshold=2)
+    mover.update(100, 100)
+    assert mover.update(100, 100) is None
+    assert mover.update(102, 99) is None
+    assert mover.update(103, 100) == (103, 100)
+    assert mover.stats() == {"moves": 2, "moves_skipped": 2}
+
+def test_skipped_moves_do_not_drift():
+    """Slow creeping is measured from where the window is, so it still moves eventually."""
+    mover = WindowMover(threshold=2)
+    mover.update(0, 0)
+    moved = [mover.update(x, 0) for x in range(1, 10)]
+    assert [p for p in moved if p] == [(3, 0), (6, 0), (9, 0)]
+
+def test_zero_threshold_only_drops_identical_positions():
+    mover = WindowMover(threshold=0)
+    mover.update(5, 5)
+    assert mover.update(5, 5) is None
+    assert mover.update(6, 5) == (6, 5)
+
+def test_parked_cursor_stops_moving_the_window():
+    mover = WindowMover(threshold=2)
+    for x, y in cursor_path("still", 120):
+        mover.update(x, y)
+    assert mover.moves == 1
+
+def test_reset_forces_a_move():
+    mover = WindowMover()
+    mover.update(5, 5)
+    mover.reset()
+    assert mover.update(5, 5) == (5, 5)
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from magnifier.zoom_pyramid import ZoomPyramid
+from magnifier.frame_pipeline import FramePipeline
+from magnifier.viewport import centered_region
+from capture.synthetic import SyntheticCapture
+
+BOUNDS = (0, 0, 640, 480)
+OUTPUT = (300, 200)
+
+
+@pytest.fixture
+def source():
+    capture = SyntheticCapture(640, 480, animate_every=0)
+    return np.array(capture.grab({"left": 0, "top": 0, "width": 640, "height": 480}).array())
+
+def view_at(mx, my, scale):
+    return centered_region(mx, my, int(OUTPUT[0] / scale), int(OUTPUT[1] / scale), BOUNDS)
+
+def render(pyramid, source, mx, my, scale, version=1, pipeline=None):
+    pipeline = pipeline or FramePipeline(border_thickness=0)
+    return pyramid.render(source, (0, 0), version, view_at(mx, my, scale), scale, OUTPUT, pipeline)
+
+def test_zoom_scrubbing_hits_the_cache(source):
+    pyramid = ZoomPyramid()
+    for scale in (2.0, 2.5, 3.0, 2.5, 2.0, 2.5, 3.0):
+        output, changed = render(pyramid, source, 320, 240, scale)
+        assert output.shape == (200, 300, 4)
+        assert changed
+    stats = pyramid.stats()
+    assert (stats["misses"], stats["hits"], stats["levels"]) == (3, 4, 3)
+    assert stats["hit_rate"] == round(4 / 7, 3)
+
+def test_cached_level_matches_a_direct_resize(source):
+    pyramid = ZoomPyramid()
+    output, _ = render(pyramid, source, 320, 240, 2.0)
+    view = view_at(320, 240, 2.0)
+    crop = source[view["top"]:view["top"] + view["height"], view["left"]:view["left"] + view["width"]]
+    expected = FramePipeline(border_thickness=0).render(np.array(crop), OUTPUT)
+    assert np.mean(np.abs(output.astype(int) - expected.astype(int))) < 4
+
+def test_small_pans_are_crops_of_the_same_level(source):
+    pyramid = ZoomPyramid()
+    render(pyramid, source, 320, 240, 2.0)
+    render(pyramid, source, 330, 245, 2.0)
+    assert pyramid.stats()["misses"] == 1
+    _, changed = render(pyramid, source, 330, 245, 2.0)
+    assert not changed
+
+def test_new_content_evicts_every_level(source):
+    pyramid = ZoomPyramid()
+    render(pyramid, source, 320, 240, 2.0)
+    render(pyramid, source, 320, 240, 3.0)
+    render(pyramid, source, 320, 240, 2.0, version=2)
+    stats = pyramid.stats()
+    assert stats["levels"] == 1 and stats["misses"] == 3 and stats["evictions"] == 2
+
+def test_budget_bounds_memory(source):
+    pyramid = ZoomPyramid(budget=3 * 1024 * 1024)
+    for scale in (2.0, 3.0, 4.0, 5.0):
+        render(pyramid, source, 320, 240, scale)
+    assert 0 < pyramid.stats()["bytes"] <= 3 * 1024 * 1024
+
+def test_level_over_budget_is_not_cached(source):
+    pyramid = ZoomPyramid(budget=1024)
+    assert render(pyramid, source, 320, 240, 2.0) is None
+    assert pyramid.stats()["levels"] == 0
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from magnifier.zoom_transition import ZoomTransition
+from magnifier.frame_pipeline import FramePipeline
+from capture.synthetic import SyntheticCapture
+
+BOUNDS = (0, 0, 640, 480)
+
+
+@pytest.fixture
+def capture():
+    return SyntheticCapture(640, 480, animate_every=0)
+
+def test_scale_eases_towards_the_target():
+    zoom = ZoomTransition(2.0, duration=0.2)
+    assert zoom.follow(2.0, now=0.0) == 2.0
+    scales = [zoom.follow(3.0, now=t) for t in (1.0, 1.05, 1.1, 1.15)]
+    assert scales[0] == 2.0
+    assert all(a < b < 3.0 for a, b in zip(scales, scales[1:]))
+    assert zoom.follow(3.0, now=1.2) == 3.0
+    assert not zoom.active
+
+def test_zero_duration_jumps():
+    zoom = ZoomTransition(2.0, duration=0)
+    assert zoom.follow(4.0, now=0.0) == 4.0
+
+def test_animation_frames_reuse_one_capture(capture):
+    zoom = ZoomTransition(2.0, duration=0.2)
+    pipeline = FramePipeline()
+    zoom.follow(2.0, now=0.0)
+    frames = []
+    for step in range(4):
+        zoom.follow(4.0, now=1.0 + 0.04 * step)
+        output = zoom.render(capture, pipeline, 320, 240, (300, 200), BOUNDS)
+        frames.append(output.copy())
+    assert capture.grabs == 1
+    assert all(frame.shape == (200, 300, 4) for frame in frames)
+    assert not np.array_equal(frames[0], frames[-1])
+    assert zoom.stats() == {"animations": 1, "animated_frames": 4}
+
+    zoom.follow(4.0, now=2.0)
+    assert zoom.render(capture, pipeline, 320, 240, (300, 200), BOUNDS) is None
+
+def test_first_animation_frame_matches_the_start_scale(capture):
+    """Zooming out starts from the wider capture, but must still look like the old scale at first."""
+    zoom = ZoomTransition(4.0, duration=0.2)
+    pipeline = FramePipeline(border_thickness=0, interpolation="nearest")
+    zoom.follow(4.0, now=0.0)
+    zoom.follow(2.0, now=1.0)
+    # Odd view sizes, so the direct region is centred on the cursor pixel too
+    animated = zoom.render(capture, pipeline, 320, 240, (300, 204), BOUNDS).copy()
+
+    direct = capture.grab({"left": 320 - 37, "top": 240 - 25, "width": 75, "height": 51}).array()
+    expected = FramePipeline(border_thickness=0).render(np.array(direct), (300, 204))
+    assert np.mean(np.abs(animated.astype(int) - expected.astype(int))) < 2
@@ -0,0 +1,137 @@
+"""
+Sharp-text upscaling for the "text" quality tier.
+
+Interpolated upscaling spreads every glyph edge over about `zoom` output
+pixels, which is what makes text look soft at 4-10x. The frame is upscaled
+linearly (no cubic overshoot, so every ramp stays inside the range of the
+pixels around it). Then every output pixel's distance from its local mean
+is amplified, which steepens those ramps back towards a step. The result
+is clamped to the local minimum/maximum (contrast limiting), so edges get
+sharper without the halos a plain unsharp mask or a cubic upscale leaves
+around text. Windows span about two zoom steps, so they always see both
+sides of an edge. They are box-shaped (O(1) per pixel whatever the zoom),
+and their size and strength are precomputed per zoom step.
+
+The sharpening runs in output space, so its cost grows with the output
+size: about 1-2 ms for a 450x300 lens but 25-35 ms for a 1080p docked
+window (benchmarks/run_benchmarks.py, "text" tier). A cost
+estimate per pixel is measured as frames go by; a frame that would exceed
+the budget keeps the plain linear result, and so does the rest of that
+motion burst. Once the view has settled, `refine_due()` asks for one more
+full render, which is sharpened whatever it costs.
+"""
+import time
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+SharpenKernel = namedtuple("SharpenKernel", "window amount element")
+
+
+class TextSharpener:
+
+    MAX_SCRATCH = 4
+
+    def __init__(self, budget_ms=4.0, settle=0.15):
+        self.budget_ms = budget_ms
+        self.settle = settle
+        self._kernels = {}
+        # Area shape -> (mean, low, high) scratch buffers
+        self._scratch = {}
+        self.cost_per_pixel = None    # seconds, exponential moving average
+        self.fallback = False
+        self._last_frame = None
+
+        self.sharpened = 0
+        self.skipped = 0
+        self.fallbacks = 0
+
+    def kernel_for(self, scale):
+        """Window (two zoom steps of output pixels) and strength for a zoom, cached per half step."""
+        key = max(1.0, round(scale * 2) / 2)
+        kernel = self._kernels.get(key)
+        if kernel is None:
+            window = 2 * int(round(key)) + 1
+            amount = min(3.0, 0.5 * key)
+            element = cv2.getStructuringElement(cv2.MORPH_RECT, (window, window))
+            kernel = self._kernels[key] = SharpenKernel(window, amount, element)
+        return kernel
+
+    def admit(self, pixels, now=None):
+        """
+        Decides whether a frame sharpening `pixels` output pixels fits the
+        budget. The first frame after a pause is always admitted (it also
+        refreshes the cost estimate); within a burst, one frame over budget
+        switches the rest of the burst to the plain path.
+        """
+        now = time.monotonic() if now is None else now
+        if self._last_frame is None or now - self._last_frame > self.settle:
+            self.fallback = False
+            self._last_frame = now
+            return True
+        self._last_frame = now
+        if not self.fallback and self.cost_per_pixel is not None:
+            if self.cost_per_pixel * pixels * 1000 > self.budget_ms:
+                self.fallback = True
+                self.fallbacks += 1
+        if self.fallback:
+            self.skipped += 1
+            return False
+        return True
+
+    def refine_due(self, now=None):
+        """True once a burst that fell back has settled: the still view should be rendered sharp."""
+        now = time.monotonic() if now is None else now
+        return self.fallback and now - self._last_frame > self.settle
+
+    def _scratch_for(self, shape):
+        buffers = self._scratch.get(shape)
+        if buffers is None:
+            if len(self._scratch) >= self.MAX_SCRATCH:
+                self._scratch.pop(next(iter(self._scratch)))
+            buffers = self._scratch[shape] = tuple(np.empty(shape, dtype=np.uint8) for _ in range(3))
+        return buffers
+
+    def sharpen(self, source, output, scale, rect=None):
+        """
+        Sharpens an upscaled BGRA `source` into `output`. With `rect` (x0, y0,
+        x1, y1) only the part of `output` that pixels changed inside it can
+        affect is rewritten: the rectangle grown by half a window. The
+        surroundings are read from `source`, so it must hold unsharpened pixels.
+        """
+        started = time.perf_counter()
+        kernel = self.kernel_for(scale)
+        height, width = source.shape[:2]
+        x0, y0, x1, y1 = rect or (0, 0, width, height)
+        pad = kernel.window // 2
+        x0, y0 = max(0, x0 - pad), max(0, y0 - pad)
+        x1, y1 = min(width, x1 + pad), min(height, y1 + pad)
+        px0, py0 = max(0, x0 - pad), max(0, y0 - pad)
+        px1, py1 = min(width, x1 + pad), min(height, y1 + pad)
+        area = source[py0:py1, px0:px1]
+
+        mean, low, high = self._scratch_for(area.shape)
+        size = (kernel.window, kernel.window)
+        cv2.blur(area, size, dst=mean, borderType=cv2.BORDER_REPLICATE)
+        cv2.erode(area, kernel.element, dst=low, borderType=cv2.BORDER_REPLICATE)
+        cv2.dilate(area, kernel.element, dst=high, borderType=cv2.BORDER_REPLICATE)
+        # mean + (1 + amount) * (area - mean), saturated, then kept inside the local range
+        cv2.addWeighted(area, 1 + kernel.amount, mean, -kernel.amount, 0, dst=mean)
+        cv2.min(mean, high, dst=mean)
+        cv2.max(mean, low, dst=mean)
+        np.copyto(output[y0:y1, x0:x1], mean[y0 - py0:y1 - py0, x0 - px0:x1 - px0])
+
+        elapsed = time.perf_counter() - started
+        cost = elapsed / max(1, area.shape[0] * area.shape[1])
+        self.cost_per_pixel = cost if self.cost_per_pixel is None else 0.8 * self.cost_per_pixel + 0.2 * cost
+        self.sharpened += 1
+        return output
+
+    def stats(self):
+        return {
+            "sharpened": self.sharpened,
+            "skipped": self.skipped,
+            "fallbacks": self.fallbacks,
+            "ms_per_megapixel": round(self.cost_per_pixel * 1e9, 3) if self.cost_per_pixel else 0.0
+        }
@@ -1,24 +1,53 @@
 import sys
 import numpy as np
-import pyautogui
-from PyQt5.QtWidgets import QApplication, QLabel, QWidget, QMenu, QAction, QSystemTrayIcon
+from PyQt5.QtWidgets import QApplication, QLabel, QWidget
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QPoint
-from PyQt5.QtGui import QPixmap, QImage, QIcon
+from PyQt5.QtGui import QPixmap, QImage
 import cv2
-import threading
+import time
 import sys
 import os
 import ctypes
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from settings.settings import SettingsManager
+from capture.backends import create_capture_backend
+from magnifier.frame_pipeline import FramePipeline
+from magnifier.capture_worker import CaptureWorker, idle_render
+from magnifier.frame_stats import FrameStats
+from magnifier.viewport import centered_region
+from magnifier.change_detector import TileChangeDetector
+from magnifier.freeze_frame import FreezeFrame
+from magnifier.color_filters import filter_from_settings
+from magnifier.cursor_filter import CursorSmoother, system_cursor_position
+from magnifier.zoom_transition import ZoomTransition
+from magnifier.zoom_pyramid import ZoomPyramid
+from magnifier.display_geometry import DisplayGeometry
+from magnifier.quality_governor import QualityGovernor, Knobs
+from magnifier.painter_view import PainterFrameView
 
 class UpperWindowMagnifier(QWidget):
+    """
+    Docked presentation: a fixed overlay showing the area around the cursor.
+
+    Tray icon, hotkeys and control commands live in MagnifierEngine; created
+    without a `worker` the overlay runs its own capture thread. `cursor`
+    replaces the OS cursor position, e.g. in tests.
+    """
     exit_signal = pyqtSignal()
 
-    def __init__(self):
+    # Settings render_frame reads each frame, in one snapshot
+    FRAME_SETTINGS = (
+        "magnifier_governor", "magnifier_quality", "magnifier_target_fps", "magnifier_idle_fps",
+        "sharp_text_budget_ms", "magnifier_present", "magnifier_filter", "invert_magnifier",
+        "magnifier_gamma"
+    )
+
+    def __init__(self, settings=None, worker=None, cursor=None):
         super().__init__()
-        self.settings = SettingsManager()
+        # Returns the raw (x, y) cursor position; the OS cursor unless injected
+        self.cursor = cursor or system_cursor_position
+        self.settings = settings or SettingsManager()
         self.scale_factor = self.settings.get("default_zoom")
         self.zoom_increment = self.settings.get("zoom_step")
         
@@ -36,6 +65,26 @@ class UpperWindowMagnifier(QWidget):
         self.height_size = screen_height // 2
         self.setGeometry(screen_width - self.width_size, 0, self.width_size, self.height_size)
 
+        # Capture bounds come from the cached monitor layout, re-read only when Qt
+        # reports display changes; the capture object itself lives on the capture thread
+        self.geometry = DisplayGeometry(parent=self)
+
+        # The overlay is laid out in logical pixels but rendered at the physical
+        # resolution of the screen it sits on (see update_pixel_ratio)
+        self._pixel_ratio = 1.0
+        self._output_size = (self.width_size, self.height_size)
+
+        # Output buffers reused across ticks (BGRA, matches QImage.Format_RGB32 byte order)
+        self.stats = FrameStats()
+        self.pipeline = FramePipeline(border_thickness=0, stats=self.stats)
+        self.detector = TileChangeDetector()
+        self.smoother = CursorSmoother.from_settings(self.settings)
+        self.zoom = ZoomTransition(self.scale_factor, self.settings.get("zoom_animation_ms") / 1000)
+        self.freeze = FreezeFrame(check_interval=self.settings.get("freeze_check_ms") / 1000)
+        self.pyramid = ZoomPyramid(budget=self.settings.get("zoom_cache_mb") * 1024 * 1024)
+        # Steps quality, filter and frame rate down while frames run over budget
+        self.governor = QualityGovernor()
+
         # Always on top, frameless
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
         self.setAttribute(Qt.WA_TranslucentBackground)
@@ -50,87 +99,222 @@ class UpperWindowMagnifier(QWidget):
         # Label to show magnified region
         self.label = QLabel(self)
         self.label.resize(self.width_size, self.height_size)
+        # Painter path: the small capture is scaled by QPainter while the overlay paints
+        self.painter_view = PainterFrameView(self)
+        self.painter_view.resize(self.width_size, self.height_size)
+        self.painter_view.hide()
+
+        # Capture thread updates the magnifier (drops to the idle rate when nothing
+        # changes); the GUI thread only presents the newest finished frame
+        self._output = None
+        self._image_seq = 0
+        self._owns_worker = worker is None
+        if self._owns_worker:
+            worker = CaptureWorker(
+                self.render_frame, self.create_capture,
+                target_fps=self.settings.get("magnifier_target_fps"),
+                idle_fps=self.settings.get("magnifier_idle_fps"),
+                parent=self
+            )
+            worker.frame_ready.connect(self.present_frame)
+        self.worker = worker
+        self.geometry.changed.connect(self.update_pixel_ratio)
+        self.update_pixel_ratio()
+        if self._owns_worker:
+            self.worker.start()
+
+    def activate(self):
+        """Shows the overlay and points the capture thread at it; the first frame is rendered in full."""
+        self.detector.reset()
+        self.worker.set_render(self.render_frame)
+        if not self.worker.isRunning():
+            self.worker.start()
+        self.show()
+
+    def deactivate(self):
+        """Hides the overlay and stops rendering for it."""
+        self.worker.set_render(idle_render)
+        # Pixmaps may share the frame slots' memory, which the next mode reallocates
+        self.label.clear()
+        self.painter_view.clear()
+        self.hide()
+
+    def capture_region(self, mx, my, scale=None):
+        """Returns the capture rectangle around the cursor, shifted to stay on screen."""
+        scale = scale or self.scale_factor
+        output_w, output_h = self._output_size
+        half_w = max(1, int(output_w / (2 * scale)))
+        half_h = max(1, int(output_h / (2 * scale)))
+        return centered_region(mx, my, 2 * half_w, 2 * half_h, self.geometry.bounds_at(mx, my))
+
+    def create_capture(self):
+        """Called on the capture thread: picks the configured (or fastest) capture backend."""
+        return create_capture_backend(self.settings.get("capture_backend"))
+
+    def render_frame(self, capture, slot):
+        """Runs on the capture thread: grabs and processes one frame into `slot`."""
+        frame_start = time.perf_counter()
+        # Smoothed (tremor-free, slightly predicted) cursor drives the viewport
+        mx, my = self.smoother.update(*self.cursor())
+        self.stats.record("cursor", frame_start)
+        bounds = self.geometry.bounds_at(mx, my)
+
+        # The overlay captures no padding, so only quality, filter and frame rate are governed
+        # One settings read per frame: every get() checks the file on disk
+        config = self.settings.snapshot(self.FRAME_SETTINGS)
+        self.governor.enabled = config["magnifier_governor"]
+        knobs = self.governor.apply(Knobs(
+            config["magnifier_quality"], 1.0, True, config["magnifier_target_fps"]
+        ))
+        self.worker.pacer.set_rates(knobs.fps, config["magnifier_idle_fps"])
+        color_filter = filter_from_settings(config, curves=knobs.curves)
+        quality = knobs.quality
+        self.pipeline.color_filter = color_filter
+        self.pipeline.interpolation = SettingsManager.QUALITY_TIERS.get(quality, "linear")
+        self.pipeline.sharpener.budget_ms = config["sharp_text_budget_ms"]
 
-        # Timer to update magnifier
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_magnifier)
-        self.timer.start(30)
-
-        # Tray icon
-        self.create_tray_icon()
-
-        # Listen for commands from standard input
-        threading.Thread(target=self.listen_commands, daemon=True).start()
-
-    def listen_commands(self):
-        while self.running:
-            try:
-                command = sys.stdin.readline().strip()
-                if command == "zoom_in":
-                    self.zoom_in()
-                elif command == "zoom_out":
-                    self.zoom_out()
-                elif command == "exit":
-                    self.running = False
-                    self.exit_magnifier()
-            except Exception:
-                break
-
-    def create_tray_icon(self):
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        icon_path = os.path.join(base_dir, "Images", "Dark themed Logo.jpeg")
-        self.tray_icon = QSystemTrayIcon(QIcon(icon_path) if os.path.exists(icon_path) else QIcon(), self)
-        self.tray_menu = QMenu()
-
-        zoom_in_action = QAction("Zoom In", self)
-        zoom_out_action = QAction("Zoom Out", self)
-        exit_action = QAction("Exit", self)
-
-        zoom_in_action.triggered.connect(self.zoom_in)
-        zoom_out_action.triggered.connect(self.zoom_out)
-        exit_action.triggered.connect(self.exit_magnifier)
-
-        self.tray_menu.addAction(zoom_in_action)
-        self.tray_menu.addAction(zoom_out_action)
-        self.tray_menu.addSeparator()
-        self.tray_menu.addAction(exit_action)
-
-        self.tray_icon.setContextMenu(self.tray_menu)
-        self.tray_icon.show()
-
-    def update_magnifier(self):
-        mx, my = pyautogui.position()
-        screen = pyautogui.screenshot()
-        frame = np.array(screen)
-
-        # Calculate region around mouse with correct aspect ratio
-        half_w = int(self.width_size / (2 * self.scale_factor))
-        half_h = int(self.height_size / (2 * self.scale_factor))
-        x1, y1 = max(0, mx - half_w), max(0, my - half_h)
-        x2, y2 = min(frame.shape[1], mx + half_w), min(frame.shape[0], my + half_h)
-
-        magnified = frame[y1:y2, x1:x2]
-
-        # Resize to overlay window size
-        magnified = cv2.resize(magnified, (self.width_size, self.height_size))
-
-        # Apply inversion if toggled
-        if self.settings.get("invert_magnifier"):
-            magnified = cv2.bitwise_not(magnified)
-            
-        h, w, _ = magnified.shape
-        image = QImage(magnified.data, w, h, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(image)
-        self.label.setPixmap(pixmap)
+        # Zoom changes animate from cached pixels; the capture resumes at the final scale
+        scale = self.zoom.follow(self.scale_factor)
+        output_size = self._output_size
+        if self.zoom.active and not self.freeze.active:
+            self._output = self.zoom.render(capture, self.pipeline, mx, my,
+                                            output_size, bounds)
+            self._image_seq += 1
+            # The animation draws into the live path's buffer, which must re-render in full
+            self.detector.reset()
+            slot.store(self._output, self._image_seq, (mx, my))
+            return self.finish_frame(frame_start, True)
+        region = self.capture_region(mx, my, scale)
+
+        # While frozen, zoom steps and pans are blitted from cached pre-scaled levels
+        # (in-between animation scales are resized directly rather than cached)
+        if self.freeze.active and not self.zoom.active:
+            started = time.perf_counter()
+            source, origin, version = self.freeze.snapshot(capture, region, bounds)
+            self.stats.record("capture", started)
+            cached = self.pyramid.render(source, origin, version, region, scale, output_size,
+                                         self.pipeline, (color_filter, quality))
+            if cached is not None:
+                output, changed = cached
+                if changed:
+                    self._output = output
+                    self._image_seq += 1
+                    # The live path must re-render everything once unfrozen
+                    self.detector.reset()
+                    slot.store(self._output, self._image_seq, (mx, my))
+                return self.finish_frame(frame_start, changed)
+
+        # Grab only the region we need and view the raw BGRA bytes without copying
+        # (or crop it out of the in-memory snapshot while frozen)
+        started = time.perf_counter()
+        if self.freeze.active:
+            frame = self.freeze.frame_for(capture, region, bounds)
+        else:
+            shot = capture.grab(region)
+            frame = self.pipeline.wrap(shot.raw, shot.width, shot.height)
+        self.stats.record("capture", started)
+
+        # Nothing to resize or present if the region and its pixels are unchanged
+        present = config["magnifier_present"]
+        key = (region["left"], region["top"], region["width"], region["height"], color_filter, quality, present)
+        started = time.perf_counter()
+        dirty = self.detector.compare(frame, key)
+        self.stats.record("detect", started)
+        if dirty is None and self.pipeline.sharpener.refine_due():
+            # Sharpening was skipped during the last move; render the settled view sharp
+            dirty = (0, 0, frame.shape[1], frame.shape[0])
+        if dirty is None:
+            return self.finish_frame(frame_start, False)
+
+        # Resize (only the dirty part when possible) into the persistent overlay-sized buffer,
+        # or on the painter path only filter the capture and let QPainter scale it
+        smooth = None
+        if present == "painter":
+            smooth = self.pipeline.painter_scaling((frame.shape[1], frame.shape[0]), output_size)
+        if smooth is None:
+            self._output = self.pipeline.render_region(frame, output_size, dirty)
+        else:
+            self._output = self.pipeline.render_source(frame)
+        self._image_seq += 1
+        slot.store(self._output, self._image_seq, (mx, my), smooth)
+        return self.finish_frame(frame_start, True)
+
+    def finish_frame(self, frame_start, published):
+        """Closes the frame's timing; published frames also feed the quality governor."""
+        elapsed = self.stats.frame_done(frame_start, self.worker.pacer.target_interval / 1000)
+        if published:
+            self.governor.observe(elapsed)
+        return published
+
+    def present_frame(self):
+        """Runs on the GUI thread: shows the newest finished frame, stale ones are dropped."""
+        slot = self.worker.frames.take()
+        if slot is not None:
+            started = time.perf_counter()
+            if slot.smooth is None:
+                # Physical-pixel frame tagged with its ratio, so the label draws it 1:1
+                pixel_ratio = slot.image.shape[1] / self.width_size
+                self.label.setPixmap(self.pipeline.to_pixmap(slot.image, pixel_ratio))
+            else:
+                self.painter_view.set_frame(slot.image, slot.smooth)
+            self.show_present_path(slot.smooth is not None)
+            self.governor.presented(self.stats.record("present", started))
+
+    def show_present_path(self, painter):
+        """Shows the widget of the path the newest frame took; the other one drops its image."""
+        if self.painter_view.isHidden() != painter:
+            return
+        if painter:
+            self.label.clear()
+        else:
+            self.painter_view.clear()
+        self.painter_view.setVisible(painter)
+        self.label.setVisible(not painter)
+
+    def update_pixel_ratio(self, *_):
+        """GUI thread: re-reads the overlay screen's pixel ratio after a move or display change."""
+        ratio = self.devicePixelRatioF()
+        if ratio != self._pixel_ratio:
+            self._pixel_ratio = ratio
+            self._output_size = (int(round(self.width_size * ratio)), int(round(self.height_size * ratio)))
+            self.worker.wake()
+
+    def moveEvent(self, event):
+        self.update_pixel_ratio()
+        super().moveEvent(event)
+
+    def frame_stats(self):
+        """Per-stage timings plus drop and change-detection counters for the `stats` command."""
+        stats = self.stats.snapshot()
+        stats["dropped"] = self.worker.frames.dropped
+        stats["idle"] = self.worker.pacer.idle
+        stats["change_detection"] = self.detector.stats()
+        stats["zoom_animation"] = self.zoom.stats()
+        stats["freeze"] = self.freeze.stats()
+        stats["zoom_cache"] = self.pyramid.stats()
+        stats["sharp_text"] = self.pipeline.sharpener.stats()
+        stats["governor"] = self.governor.stats()
+        stats["present"] = {"path": self.settings.get("magnifier_present"), "painter_frames": self.painter_view.frames}
+        stats["display"] = self.geometry.stats()
+        return stats
 
     def zoom_in(self):
         self.scale_factor = min(self.scale_factor + self.zoom_increment, 10.0)
+        self.worker.wake()
 
     def zoom_out(self):
         self.scale_factor = max(1.0, self.scale_factor - self.zoom_increment)
+        self.worker.wake()
+
+    def toggle_freeze(self):
+        """Serves the overlay from a still snapshot (or goes back to live capture)."""
+        self.freeze.toggle()
+        self.worker.wake()
 
     def keyPressEvent(self, event):
-        if event.modifiers() == Qt.ControlModifier:
+        if event.modifiers() == (Qt.ControlModifier | Qt.AltModifier) and event.key() == Qt.Key_F:
+            self.toggle_freeze()
+        elif event.modifiers() == Qt.ControlModifier:
             if event.key() in (Qt.Key_Up, Qt.Key_Plus, Qt.Key_Equal):
                 self.zoom_in()
             elif event.key() in (Qt.Key_Down, Qt.Key_Minus):
@@ -156,9 +340,11 @@ class UpperWindowMagnifier(QWidget):
         self.close()
         self.exit_signal.emit()
 
+    def closeEvent(self, event):
+        if self._owns_worker:
+            self.worker.stop()
+        super().closeEvent(event)
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    magnifier = UpperWindowMagnifier()
-    magnifier.show()
-    magnifier.exit_signal.connect(app.quit)
-    sys.exit(app.exec_())
+    from magnifier.magnifier_engine import main
+    sys.exit(main(["--mode", "docked"]))
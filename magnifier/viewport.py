@@ -0,0 +1,40 @@
+"""
+Cursor -> viewport arithmetic shared by the magnifiers.
+
+Kept free of Qt, capture and Windows imports so the same maths can be
+driven by the headless benchmarks and tests.
+"""
+
+
+def centered_region(mx, my, capture_w, capture_h, bounds):
+    """
+    Returns the capture rectangle of the given size centred on the cursor,
+    shifted (not shrunk) so it stays inside `bounds` = (left, top, width, height).
+    """
+    bound_left, bound_top, bound_w, bound_h = bounds
+    capture_w = max(1, min(int(capture_w), bound_w))
+    capture_h = max(1, min(int(capture_h), bound_h))
+
+    left = max(bound_left, min(mx - capture_w // 2, bound_left + bound_w - capture_w))
+    top = max(bound_top, min(my - capture_h // 2, bound_top + bound_h - capture_h))
+
+    return {"left": left, "top": top, "width": capture_w, "height": capture_h}
+
+
+def fullscreen_offset(mx, my, screen_w, screen_h, scale, left=0, top=0):
+    """
+    Maps the cursor position to the top-left offset of a full-screen zoom
+    viewport over the monitor at (left, top) - the primary one by default.
+    """
+    view_w = screen_w / scale
+    view_h = screen_h / scale
+
+    offset_x = left
+    if screen_w > view_w:
+        offset_x = left + int(((mx - left) / screen_w) * (screen_w - view_w))
+
+    offset_y = top
+    if screen_h > view_h:
+        offset_y = top + int(((my - top) / screen_h) * (screen_h - view_h))
+
+    return offset_x, offset_y
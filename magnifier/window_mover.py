@@ -0,0 +1,32 @@
+class WindowMover:
+    """
+    Decides when the hover lens window actually needs to move.
+
+    Every QWidget.move() makes the compositor recompose the desktop, so
+    positions within `threshold` pixels of where the window already is are
+    dropped; the lens then trails the cursor by at most that much. update()
+    returns the position to move to, or None when the move can be skipped.
+    """
+
+    def __init__(self, threshold=2):
+        self.threshold = threshold
+        self.position = None
+        self.moves = 0
+        self.skipped = 0
+
+    def update(self, x, y):
+        if self.position is not None:
+            dx, dy = x - self.position[0], y - self.position[1]
+            if max(abs(dx), abs(dy)) <= self.threshold:
+                self.skipped += 1
+                return None
+        self.position = (x, y)
+        self.moves += 1
+        return self.position
+
+    def reset(self):
+        """Forces the next update to move (e.g. after the window was hidden or resized)."""
+        self.position = None
+
+    def stats(self):
+        return {"moves": self.moves, "moves_skipped": self.skipped}
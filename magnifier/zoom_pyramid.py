@@ -0,0 +1,132 @@
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from magnifier.viewport import centered_region
+
+
+class ZoomPyramid:
+    """
+    Cache of pre-scaled levels of a still source (the freeze-frame snapshot).
+
+    Each level is the area around the cursor, `padding` times the view in
+    each direction, filtered once and scaled to one zoom step. While the
+    content stays the same, scrubbing back to a zoom step that was already
+    visited - or panning within the cached area - is just a crop-and-blit
+    out of that level instead of a fresh resize.
+
+    Levels are built lazily on first use, dropped when the source content,
+    colour filter or quality changes, and evicted least recently used once
+    their total size exceeds `budget` bytes. A level that would not fit the
+    budget on its own is not cached; render() then returns None and the
+    caller scales the frame directly.
+    """
+
+    def __init__(self, budget=64 * 1024 * 1024, padding=2.0):
+        self.budget = budget
+        self.padding = max(1.0, float(padding))
+        self._levels = OrderedDict()    # (scale, output size) -> (pixels, source window)
+        self._bytes = 0
+        self._content = None
+        self._served = None
+        self._output = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def invalidate(self):
+        self.evictions += len(self._levels)
+        self._levels.clear()
+        self._bytes = 0
+        self._served = None
+
+    def _build(self, source, origin, view, scale, output_size, pipeline):
+        """Filters and scales the padded area around `view` into a new level."""
+        height, width = source.shape[:2]
+        cx = view["left"] - origin[0] + view["width"] // 2
+        cy = view["top"] - origin[1] + view["height"] // 2
+        window = centered_region(cx, cy, int(view["width"] * self.padding), int(view["height"] * self.padding),
+                                 (0, 0, width, height))
+        left, top, w, h = window["left"], window["top"], window["width"], window["height"]
+
+        level_size = (max(output_size[0], int(round(w * scale))), max(output_size[1], int(round(h * scale))))
+        if level_size[0] * level_size[1] * 4 > self.budget:
+            return None
+
+        pixels = pipeline.prepare(np.array(source[top:top + h, left:left + w]))
+        level = cv2.resize(pixels, level_size, interpolation=pipeline.interpolation_for((w, h), level_size))
+        # Levels are built once per snapshot, so the sharp-text tier always sharpens them
+        level = pipeline.sharpen_image(level, scale)
+        return level, (origin[0] + left, origin[1] + top, w, h)
+
+    def _offset(self, level, window, view, scale, output_size):
+        """Top-left of the view inside a level, or None if the level doesn't cover it."""
+        win_left, win_top, win_w, win_h = window
+        if (view["left"] < win_left or view["top"] < win_top
+                or view["left"] + view["width"] > win_left + win_w
+                or view["top"] + view["height"] > win_top + win_h):
+            return None
+        level_h, level_w = level.shape[:2]
+        x = min(int(round((view["left"] - win_left) * scale)), level_w - output_size[0])
+        y = min(int(round((view["top"] - win_top) * scale)), level_h - output_size[1])
+        return x, y
+
+    def render(self, source, origin, version, view, scale, output_size, pipeline, settings_key=None):
+        """
+        Renders `view` (screen rectangle inside the source) at `scale` from the
+        cache. Returns (output, changed) - `changed` is False when the same
+        picture was already served - or None if the level can't be cached.
+        `version` and `settings_key` identify the content and filter/quality.
+        """
+        content = (version, settings_key)
+        if content != self._content:
+            self.invalidate()
+            self._content = content
+
+        key = (scale, tuple(output_size))
+        entry = self._levels.get(key)
+        offset = self._offset(*entry, view, scale, output_size) if entry else None
+        if offset is None:
+            # Never built, or the cursor left the cached area around it
+            if entry:
+                self._drop(key)
+            entry = self._build(source, origin, view, scale, output_size, pipeline)
+            if entry is None:
+                return None
+            self.misses += 1
+            self._store(key, entry)
+            offset = self._offset(*entry, view, scale, output_size)
+        else:
+            self.hits += 1
+            self._levels.move_to_end(key)
+
+        served = (key, entry[1], offset)
+        if served == self._served:
+            return self._output, False
+        self._served = served
+        self._output = pipeline.render_crop(entry[0], output_size, offset)
+        return self._output, True
+
+    def _store(self, key, entry):
+        self._levels[key] = entry
+        self._bytes += entry[0].nbytes
+        while self._bytes > self.budget and len(self._levels) > 1:
+            self._drop(next(iter(self._levels)))
+
+    def _drop(self, key):
+        level, _ = self._levels.pop(key)
+        self._bytes -= level.nbytes
+        self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "levels": len(self._levels),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
@@ -0,0 +1,77 @@
+import time
+import numpy as np
+
+from magnifier.viewport import centered_region
+
+
+class ZoomTransition:
+    """
+    Animated zoom between scale factors.
+
+    follow(target) is called once per frame with the magnifier's scale
+    factor; when that target changes, the returned scale eases from the
+    current value to the new one over `duration` seconds instead of jumping.
+
+    For the capture-based magnifiers render() produces the in-between
+    frames without recapturing: the first animation frame grabs one region
+    wide enough for the lower of the two scales, filters it once, and every
+    following frame is just a warp of those cached pixels. Once the
+    animation ends render() returns None and the normal capture path takes
+    over at the final scale.
+    """
+
+    def __init__(self, scale, duration=0.15):
+        self.duration = duration
+        self.scale = scale
+        self.target = scale
+        self._start_scale = scale
+        self._started = 0.0
+        self._source = None     # (prepared frame, screen region) for the running animation
+
+        self.animations = 0
+        self.animated_frames = 0
+
+    @property
+    def active(self):
+        return self.scale != self.target
+
+    def follow(self, target, now=None):
+        """Returns the scale to show this frame while heading for `target`."""
+        now = time.monotonic() if now is None else now
+        if target != self.target:
+            self._start_scale = self.scale
+            self.target = target
+            self._started = now
+            self._source = None
+            self.animations += 1
+
+        if self.duration <= 0 or now - self._started >= self.duration:
+            self.scale = self.target
+        else:
+            progress = (now - self._started) / self.duration
+            eased = 1 - (1 - progress) ** 3     # ease-out cubic
+            self.scale = self._start_scale + (self.target - self._start_scale) * eased
+        return self.scale
+
+    def render(self, capture, pipeline, mx, my, target_size, bounds, invert=False):
+        """
+        Renders one in-between frame from cached pixels; returns None when no
+        animation is running (the caller then captures normally).
+        """
+        if not self.active:
+            self._source = None
+            return None
+
+        if self._source is None:
+            target_w, target_h = target_size
+            widest = min(self._start_scale, self.target)
+            region = centered_region(mx, my, int(target_w / widest), int(target_h / widest), bounds)
+            frame = np.array(capture.grab(region).array())
+            self._source = (pipeline.prepare(frame, invert), region)
+
+        frame, region = self._source
+        self.animated_frames += 1
+        return pipeline.render_zoomed(frame, target_size, self.scale, (mx - region["left"], my - region["top"]))
+
+    def stats(self):
+        return {"animations": self.animations, "animated_frames": self.animated_frames}
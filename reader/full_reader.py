@@ -14,6 +14,7 @@ import threading
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from settings.settings import SettingsManager
+from capture.backends import create_capture_backend
 
 class TTSWorker(threading.Thread):
     def __init__(self, rate, volume):
@@ -52,10 +53,12 @@ class FullReaderThread(QThread):
         self.tts_worker.start()
 
     def run(self):
+        # Created on this thread: capture backends are tied to the grabbing thread
+        capture = create_capture_backend(self.settings.get("capture_backend"))
         while self.running:
             # Capture full screen
-            screenshot = pyautogui.screenshot()
-            frame = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+            screenshot = capture.grab(capture.monitors[1])
+            frame = cv2.cvtColor(screenshot.array(), cv2.COLOR_BGRA2BGR)
 
             # OCR text extraction
             lang = self.settings.get("ocr_language")
@@ -66,6 +69,7 @@ class FullReaderThread(QThread):
                 self.tts_worker.q.put(text)
 
             time.sleep(5)  # Pause before next scan
+        capture.close()
 
     def start_reading(self):
         self.running = True
@@ -17,6 +17,7 @@ import pyperclip
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from settings.settings import SettingsManager
+from capture.backends import create_capture_backend
 
 pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
@@ -50,6 +51,8 @@ class HoverReaderThread(QThread):
         self.interval = 0.5  # Faster scanning since we only read one word
 
     def run(self):
+        # Created on this thread: capture backends are tied to the grabbing thread
+        capture = create_capture_backend(self.settings.get("capture_backend"))
         while self.running:
             mx, my = pyautogui.position()
             
@@ -57,10 +60,10 @@ class HoverReaderThread(QThread):
             w, h = 400, 100
             left, top = mx - w // 2, my - h // 2
             
-            region = (left, top, w, h)
+            region = {"left": left, "top": top, "width": w, "height": h}
             try:
-                screenshot = pyautogui.screenshot(region=region)
-                frame = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+                screenshot = capture.grab(region)
+                frame = cv2.cvtColor(screenshot.array(), cv2.COLOR_BGRA2BGR)
 
                 # Get bounding boxes of every word in the image
                 lang = self.settings.get("ocr_language")
@@ -110,6 +113,7 @@ class HoverReaderThread(QThread):
                 pass
 
             time.sleep(self.interval)
+        capture.close()
 
     def stop(self):
         self.running = False
@@ -6,7 +6,6 @@ import edge_tts
 import pygame
 import tempfile
 import os
-import mss
 import numpy as np
 import pytesseract
 import cv2
@@ -20,6 +19,7 @@ import os
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from settings.settings import SettingsManager
+from capture.backends import create_capture_backend
 
 pygame.mixer.init()
 
@@ -120,8 +120,8 @@ class OCROverlay(QWidget):
         import time
         time.sleep(0.15)
         
-        with mss.mss() as sct:
-            img = np.array(sct.grab(region))
+        with create_capture_backend(self.settings.get("capture_backend")) as capture:
+            img = capture.grab(region).array()
             gray = cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY)
             # Thresholding for better OCR
             gray = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
@@ -19,6 +19,27 @@ SETTINGS_FILE = os.path.join(SETTINGS_DIR, "user_settings.json")
 # -------------------------
 class SettingsManager:
 
+    # Magnifier quality tier -> interpolation used to scale the captured region
+    QUALITY_TIERS = {
+        "fast": "nearest",
+        "balanced": "linear",
+        "sharp": "cubic",
+        "text": "sharp_text"
+    }
+
+    # Colour filters offered for the magnifiers (see magnifier/color_filters.py)
+    COLOR_FILTERS = (
+        "none", "invert", "grayscale", "yellow_on_black",
+        "protan_simulation", "deutan_simulation", "tritan_simulation",
+        "protan_correction", "deutan_correction", "tritan_correction"
+    )
+
+    # Hover lens outlines (see magnifier/lens_shapes.py)
+    LENS_SHAPES = ("rectangle", "rounded", "circle", "ellipse")
+
+    # How magnified frames reach the screen (see magnifier/painter_view.py)
+    PRESENT_PATHS = ("resize", "painter")
+
     DEFAULTS = {
         "speech_rate": 160,
         "speech_volume": 1.0,
@@ -32,7 +53,29 @@ class SettingsManager:
         "ocr_language": "eng",
         "startup_magnifier": "None",
         "startup_reader": "None",
-        "default_hands_free": False
+        "default_hands_free": False,
+        "magnifier_target_fps": 60,
+        "magnifier_idle_fps": 10,
+        "capture_backend": "auto",
+        "hover_crop_panning": True,
+        "hover_capture_padding": 3.0,
+        "hover_refresh_ms": 100,
+        "freeze_check_ms": 1000,
+        "magnifier_quality": "balanced",
+        "magnifier_filter": "none",
+        "magnifier_gamma": 1.0,
+        "cursor_smoothing": True,
+        "cursor_min_cutoff": 1.0,
+        "cursor_beta": 0.007,
+        "cursor_dead_zone": 1.5,
+        "cursor_prediction_ms": 16,
+        "zoom_animation_ms": 150,
+        "zoom_cache_mb": 64,
+        "hover_move_threshold": 2,
+        "hover_shape": "rectangle",
+        "sharp_text_budget_ms": 4,
+        "magnifier_governor": True,
+        "magnifier_present": "resize"
     }
 
     def __init__(self):
@@ -70,14 +113,22 @@ class SettingsManager:
             json.dump(self.settings, f, indent=4)
         self._last_mtime = os.path.getmtime(SETTINGS_FILE)
 
-    def get(self, key):
+    def refresh(self):
         # Auto-refresh if file changed on disk
         if os.path.exists(SETTINGS_FILE):
             current_mtime = os.path.getmtime(SETTINGS_FILE)
             if current_mtime > self._last_mtime:
                 self.load()
+
+    def get(self, key):
+        self.refresh()
         return self.settings.get(key, self.DEFAULTS.get(key))
 
+    def snapshot(self, keys):
+        # Several values behind a single on-disk check, for per-frame readers
+        self.refresh()
+        return {key: self.settings.get(key, self.DEFAULTS.get(key)) for key in keys}
+
     def set(self, key, value):
         self.settings[key] = value
         self.save()
@@ -127,6 +178,132 @@ class SettingsWindow(QWidget):
         )
         layout.addWidget(self.zoom_slider)
 
+        # ---- MAGNIFIER FRAME RATES ----
+        layout.addWidget(QLabel("Magnifier Frame Rate (FPS)"))
+        self.fps_slider = QSlider(Qt.Horizontal)
+        self.fps_slider.setRange(15, 120)
+        self.fps_slider.setValue(int(self.manager.get("magnifier_target_fps")))
+        self.fps_slider.valueChanged.connect(
+            lambda v: self.manager.set("magnifier_target_fps", v)
+        )
+        layout.addWidget(self.fps_slider)
+
+        layout.addWidget(QLabel("Magnifier Idle Frame Rate (FPS)"))
+        self.idle_fps_slider = QSlider(Qt.Horizontal)
+        self.idle_fps_slider.setRange(1, 30)
+        self.idle_fps_slider.setValue(int(self.manager.get("magnifier_idle_fps")))
+        self.idle_fps_slider.valueChanged.connect(
+            lambda v: self.manager.set("magnifier_idle_fps", v)
+        )
+        layout.addWidget(self.idle_fps_slider)
+
+        # ---- HOVER CROP-PANNING ----
+        self.crop_panning_cb = QCheckBox("Pan Hover Lens Inside an Oversized Capture")
+        self.crop_panning_cb.setChecked(self.manager.get("hover_crop_panning"))
+        self.crop_panning_cb.stateChanged.connect(
+            lambda v: self.manager.set("hover_crop_panning", bool(v))
+        )
+        layout.addWidget(self.crop_panning_cb)
+
+        # ---- ZOOM ANIMATION ----
+        layout.addWidget(QLabel("Zoom Animation (ms, 0 = off)"))
+        self.zoom_animation_slider = QSlider(Qt.Horizontal)
+        self.zoom_animation_slider.setRange(0, 500)
+        self.zoom_animation_slider.setValue(int(self.manager.get("zoom_animation_ms")))
+        self.zoom_animation_slider.valueChanged.connect(
+            lambda v: self.manager.set("zoom_animation_ms", v)
+        )
+        layout.addWidget(self.zoom_animation_slider)
+
+        # ---- CURSOR SMOOTHING ----
+        self.smoothing_cb = QCheckBox("Smooth Magnifier Cursor Tracking")
+        self.smoothing_cb.setChecked(self.manager.get("cursor_smoothing"))
+        self.smoothing_cb.stateChanged.connect(
+            lambda v: self.manager.set("cursor_smoothing", bool(v))
+        )
+        layout.addWidget(self.smoothing_cb)
+
+        layout.addWidget(QLabel("Cursor Dead Zone (px)"))
+        self.dead_zone_slider = QSlider(Qt.Horizontal)
+        self.dead_zone_slider.setRange(0, 10)
+        self.dead_zone_slider.setValue(int(self.manager.get("cursor_dead_zone")))
+        self.dead_zone_slider.valueChanged.connect(
+            lambda v: self.manager.set("cursor_dead_zone", v)
+        )
+        layout.addWidget(self.dead_zone_slider)
+
+        layout.addWidget(QLabel("Cursor Prediction (ms)"))
+        self.prediction_slider = QSlider(Qt.Horizontal)
+        self.prediction_slider.setRange(0, 50)
+        self.prediction_slider.setValue(int(self.manager.get("cursor_prediction_ms")))
+        self.prediction_slider.valueChanged.connect(
+            lambda v: self.manager.set("cursor_prediction_ms", v)
+        )
+        layout.addWidget(self.prediction_slider)
+
+        # ---- MAGNIFIER QUALITY ----
+        layout.addWidget(QLabel("Magnifier Quality"))
+        self.quality = QComboBox()
+        self.quality.addItems(list(SettingsManager.QUALITY_TIERS))
+        self.quality.setCurrentText(self.manager.get("magnifier_quality"))
+        self.quality.currentTextChanged.connect(
+            lambda v: self.manager.set("magnifier_quality", v)
+        )
+        layout.addWidget(self.quality)
+
+        layout.addWidget(QLabel("Sharp Text Budget per Frame (ms)"))
+        self.sharp_text_budget_slider = QSlider(Qt.Horizontal)
+        self.sharp_text_budget_slider.setRange(1, 16)
+        self.sharp_text_budget_slider.setValue(int(self.manager.get("sharp_text_budget_ms")))
+        self.sharp_text_budget_slider.valueChanged.connect(
+            lambda v: self.manager.set("sharp_text_budget_ms", v)
+        )
+        layout.addWidget(self.sharp_text_budget_slider)
+
+        self.governor_cb = QCheckBox("Lower Magnifier Quality Under Heavy Load")
+        self.governor_cb.setChecked(self.manager.get("magnifier_governor"))
+        self.governor_cb.stateChanged.connect(
+            lambda v: self.manager.set("magnifier_governor", bool(v))
+        )
+        layout.addWidget(self.governor_cb)
+
+        layout.addWidget(QLabel("Magnifier Scaling (painter: Qt scales the small capture)"))
+        self.present_path = QComboBox()
+        self.present_path.addItems(list(SettingsManager.PRESENT_PATHS))
+        self.present_path.setCurrentText(self.manager.get("magnifier_present"))
+        self.present_path.currentTextChanged.connect(
+            lambda v: self.manager.set("magnifier_present", v)
+        )
+        layout.addWidget(self.present_path)
+
+        # ---- HOVER LENS ----
+        layout.addWidget(QLabel("Hover Lens Shape"))
+        self.lens_shape = QComboBox()
+        self.lens_shape.addItems(list(SettingsManager.LENS_SHAPES))
+        self.lens_shape.setCurrentText(self.manager.get("hover_shape"))
+        self.lens_shape.currentTextChanged.connect(
+            lambda v: self.manager.set("hover_shape", v)
+        )
+        layout.addWidget(self.lens_shape)
+
+        layout.addWidget(QLabel("Hover Lens Width (px)"))
+        self.lens_width_slider = QSlider(Qt.Horizontal)
+        self.lens_width_slider.setRange(150, 800)
+        self.lens_width_slider.setValue(self.manager.get("hover_width"))
+        self.lens_width_slider.valueChanged.connect(
+            lambda v: self.manager.set("hover_width", v)
+        )
+        layout.addWidget(self.lens_width_slider)
+
+        layout.addWidget(QLabel("Hover Lens Height (px)"))
+        self.lens_height_slider = QSlider(Qt.Horizontal)
+        self.lens_height_slider.setRange(100, 600)
+        self.lens_height_slider.setValue(self.manager.get("hover_height"))
+        self.lens_height_slider.valueChanged.connect(
+            lambda v: self.manager.set("hover_height", v)
+        )
+        layout.addWidget(self.lens_height_slider)
+
         # ---- HIGH CONTRAST ----
         self.high_contrast = QCheckBox("Enable High Contrast Mode")
         self.high_contrast.setChecked(self.manager.get("high_contrast"))
@@ -151,6 +328,25 @@ class SettingsWindow(QWidget):
         )
         layout.addWidget(self.invert)
 
+        # ---- MAGNIFIER COLOUR FILTER ----
+        layout.addWidget(QLabel("Magnifier Colour Filter"))
+        self.color_filter = QComboBox()
+        self.color_filter.addItems(list(SettingsManager.COLOR_FILTERS))
+        self.color_filter.setCurrentText(self.manager.get("magnifier_filter"))
+        self.color_filter.currentTextChanged.connect(
+            lambda v: self.manager.set("magnifier_filter", v)
+        )
+        layout.addWidget(self.color_filter)
+
+        layout.addWidget(QLabel("Magnifier Gamma"))
+        self.gamma_slider = QSlider(Qt.Horizontal)
+        self.gamma_slider.setRange(5, 30)
+        self.gamma_slider.setValue(int(self.manager.get("magnifier_gamma") * 10))
+        self.gamma_slider.valueChanged.connect(
+            lambda v: self.manager.set("magnifier_gamma", v / 10)
+        )
+        layout.addWidget(self.gamma_slider)
+
         # ---- STARTUP OPTION ----
         layout.addWidget(QLabel("Default Magnifier on Startup"))
         self.startup_mag = QComboBox()